@@ -0,0 +1,6 @@
+"""Offline benchmarks of dataset file transfers
+
+Commands run against a local stand-in of the dataset API and of an S3-compatible object store
+(see ``benchmarks.server``), so results don't depend on the network or on real credentials.
+Run ``python -m benchmarks --help`` for options.
+"""
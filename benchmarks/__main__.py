@@ -0,0 +1,65 @@
+import sys
+
+import click
+
+from . import report, runner
+from .scenarios import SCENARIOS
+from .server import StandInServer
+
+
+@click.command(help="Benchmark dataset file commands against a local stand-in of the API and S3")
+@click.option(
+    "--scenario",
+    "scenarios",
+    type=click.Choice(list(SCENARIOS)),
+    multiple=True,
+    help="Scenario to run. Can be used multiple times. All scenarios are run by default",
+)
+@click.option(
+    "--operation",
+    "operations",
+    type=click.Choice(runner.OPERATIONS),
+    multiple=True,
+    help="Operation to run. Can be used multiple times. put is always run first, "
+         "as other operations need uploaded files",
+)
+@click.option("--latency", type=float, default=20.0, show_default=True, help="Latency added to every request [ms]")
+@click.option("--bandwidth", type=float, help="Bandwidth shared by all connections [MB/s]. No limit by default")
+@click.option("--scale", type=float, default=1.0, show_default=True,
+              help="Multiplier of the number or size of files in scenarios")
+@click.option("--no-isolate", "isolated", flag_value=False, default=True,
+              help="Run commands in this process. Faster to start, but peak RSS is not measured")
+@click.option("--json", "json_path", type=click.Path(dir_okay=False, writable=True),
+              help="Save results to a JSON file, e.g. to use as a --baseline later")
+@click.option("--baseline", "baseline_path", type=click.Path(exists=True, dir_okay=False),
+              help="Fail if results are worse than in a JSON file saved with --json")
+@click.option("--tolerance", type=float, default=0.2, show_default=True,
+              help="Allowed relative slowdown or memory growth compared to --baseline")
+def main(scenarios, operations, latency, bandwidth, scale, isolated, json_path, baseline_path, tolerance):
+    operations = [operation for operation in runner.OPERATIONS if not operations or operation in operations
+                  or operation == "put"]
+
+    bandwidth = int(bandwidth * report.MB) if bandwidth else None
+
+    results = []
+    with StandInServer(latency=latency / 1000.0, bandwidth=bandwidth) as server:
+        for scenario in scenarios or SCENARIOS:
+            click.echo("Running {}: {} (scale {})".format(scenario, SCENARIOS[scenario].description, scale), err=True)
+            results.extend(runner.run_scenario(server, scenario, operations, scale=scale, isolated=isolated))
+
+    click.echo(report.make_table(results))
+
+    if json_path:
+        report.dump(results, json_path)
+
+    failed = [result for result in results if result.error]
+    regressions = report.find_regressions(results, baseline_path, tolerance) if baseline_path else []
+    for regression in regressions:
+        click.secho("Regression: " + regression, fg="red", err=True)
+
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+
+import terminaltables
+
+MB = 1000 * 1000
+
+
+def _format_seconds(value):
+    return "-" if value is None else "{:.1f}".format(value * 1000)
+
+
+def _format_mb(value):
+    return "-" if value is None else "{:.1f}".format(float(value) / MB)
+
+
+def throughput(result):
+    """Bytes per second of objects data sent and received
+
+    :rtype: float|None
+    """
+    if not result.elapsed:
+        return None
+    return result.bytes / result.elapsed
+
+
+def make_table(results):
+    data = [("Scenario", "Operation", "Objects", "Time [s]", "MB/s", "Objects/s", "Requests",
+             "p50 [ms]", "p99 [ms]", "Peak RSS [MB]", "Status")]
+    for result in results:
+        elapsed = result.elapsed or None
+        data.append((
+            result.scenario,
+            result.operation,
+            result.objects,
+            "{:.2f}".format(result.elapsed),
+            _format_mb(throughput(result)),
+            "{:.1f}".format(result.objects / elapsed) if elapsed else "-",
+            result.requests,
+            _format_seconds(result.latency_p50),
+            _format_seconds(result.latency_p99),
+            _format_mb(result.peak_rss),
+            result.error or "OK",
+        ))
+
+    return terminaltables.AsciiTable(data).table
+
+
+def dump(results, path):
+    with open(path, "w") as f:
+        json.dump([result._asdict() for result in results], f, indent=2)
+
+
+def find_regressions(results, baseline_path, tolerance):
+    """Compare results with results saved with dump()
+
+    :param list[Result] results:
+    :param str baseline_path:
+    :param float tolerance: allowed relative slowdown or memory growth, e.g. 0.2 for 20%
+    :returns: descriptions of regressions
+    :rtype: list[str]
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["scenario"], r["operation"]): r for r in json.load(f)}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get((result.scenario, result.operation))
+        if not previous or result.error or previous["error"]:
+            continue
+
+        name = "{} {}".format(result.scenario, result.operation)
+        if previous["elapsed"] and result.elapsed > previous["elapsed"] * (1 + tolerance):
+            regressions.append("{}: time {:.2f}s, was {:.2f}s".format(name, result.elapsed, previous["elapsed"]))
+        if previous["peak_rss"] and result.peak_rss and result.peak_rss > previous["peak_rss"] * (1 + tolerance):
+            regressions.append("{}: peak RSS {}MB, was {}MB".format(
+                name, _format_mb(result.peak_rss), _format_mb(previous["peak_rss"])))
+
+    return regressions
@@ -0,0 +1,229 @@
+import collections
+import contextlib
+import math
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from . import server as stand_in
+from .scenarios import SCENARIOS
+
+OPERATIONS = ("put", "list", "get", "delete")
+
+Result = collections.namedtuple("Result", (
+    "scenario",
+    "operation",
+    "objects",
+    "bytes",
+    "elapsed",
+    "requests",
+    "latency_p50",
+    "latency_p99",
+    "peak_rss",
+    "error",
+))
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile
+
+    :param list[float] values:
+    :param float percent: 0-100
+    :rtype: float|None
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = max(1, int(math.ceil(percent / 100.0 * len(values))))
+    return values[rank - 1]
+
+
+def _get_peak_rss():
+    """Peak resident set size of the current process in bytes
+
+    :rtype: int|None
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _execute_operation(operation, server_url, remote_path, fixture_dir, download_dir):
+    """Run a dataset files command against the stand-in server
+
+    :returns: number of objects listed. None for other operations
+    :rtype: int|None
+    """
+    from gradient.commands import datasets as commands
+    from gradient.api_sdk.config import config
+    from gradient.api_sdk.logger import MuteLogger
+
+    config.CONFIG_HOST = server_url
+    config.HTTP_CACHE = False
+    version_id = stand_in.DATASET_VERSION_ID
+    logger = MuteLogger()
+
+    if operation == "put":
+        command = commands.PutDatasetFilesCommand(api_key="benchmark", logger=logger)
+        command.execute(version_id, [fixture_dir + os.path.sep], remote_path)
+    elif operation == "list":
+        command = commands.ListDatasetFilesCommand(api_key="benchmark", logger=logger)
+        pages = command._get_instances(dict(dataset_version_id=version_id, path=remote_path, recursive=True))
+        return sum(len(results) for results, _ in pages)
+    elif operation == "get":
+        command = commands.GetDatasetFilesCommand(api_key="benchmark", logger=logger)
+        command.execute(version_id, [remote_path + "/"], download_dir)
+    elif operation == "delete":
+        command = commands.DeleteDatasetFilesCommand(api_key="benchmark", logger=logger)
+        command.execute(version_id, [remote_path + "/"])
+    else:
+        raise ValueError("Unknown operation: {}".format(operation))
+
+
+def _run_isolated(queue, *args):
+    # halo spinners and progress messages of commands would garble the report
+    sys.stdout = open(os.devnull, "w")
+    try:
+        started = time.time()
+        listed = _execute_operation(*args)
+        queue.put((time.time() - started, listed, _get_peak_rss(), None))
+    except BaseException as e:
+        queue.put((0.0, None, _get_peak_rss(), "{}: {}".format(type(e).__name__, e)))
+
+
+def _run(operation, server_url, remote_path, fixture_dir, download_dir, isolated):
+    """
+    :returns: elapsed time, number of listed objects, peak RSS and error message
+    :rtype: tuple
+    """
+    args = (operation, server_url, remote_path, fixture_dir, download_dir)
+    if not isolated:
+        started = time.time()
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                listed = _execute_operation(*args)
+        except Exception as e:
+            return 0.0, None, None, "{}: {}".format(type(e).__name__, e)
+        return time.time() - started, listed, None, None
+
+    # a fresh process for every operation so peak RSS of one doesn't hide another
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_isolated, args=(queue,) + args)
+    process.start()
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except Empty:
+            if not process.is_alive():
+                return 0.0, None, None, "process exited with code {}".format(process.exitcode)
+    process.join()
+    return result
+
+
+def _count_files(path):
+    count = 0
+    size = 0
+    for dir_path, _, names in os.walk(path):
+        for name in names:
+            count += 1
+            size += os.path.getsize(os.path.join(dir_path, name))
+    return count, size
+
+
+def _check(server, operation, remote_path, expected_count, expected_size, listed, download_dir):
+    """Make sure the operation did its job. A fast transfer that lost files is not an improvement
+
+    :returns: error message or None
+    :rtype: str|None
+    """
+    keys = server.object_keys(remote_path.lstrip("/") + "/")
+    if operation == "put":
+        stored_size = sum(server.store.size(key) for key in keys)
+        if (len(keys), stored_size) != (expected_count, expected_size):
+            return "stored {} objects ({} B), expected {} ({} B)".format(
+                len(keys), stored_size, expected_count, expected_size)
+    elif operation == "list":
+        if listed != expected_count:
+            return "listed {} objects, expected {}".format(listed, expected_count)
+    elif operation == "get":
+        downloaded = _count_files(download_dir)
+        if downloaded != (expected_count, expected_size):
+            return "downloaded {} files ({} B), expected {} ({} B)".format(
+                downloaded[0], downloaded[1], expected_count, expected_size)
+    elif operation == "delete":
+        if keys:
+            return "{} objects left after delete".format(len(keys))
+
+
+@contextlib.contextmanager
+def _temporary_directory(prefix):
+    path = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def run_scenario(server, scenario_name, operations=OPERATIONS, scale=1.0, isolated=True):
+    """Build scenario files and run operations on them against the stand-in server, in order
+
+    put has to come before the other operations, since it uploads files they work on.
+
+    :param stand_in.StandInServer server:
+    :param str scenario_name: one of scenarios.SCENARIOS
+    :param Iterable[str] operations:
+    :param float scale: multiplier of the number or size of files in the scenario
+    :param bool isolated: run every operation in a separate process. Required for peak RSS
+    :rtype: list[Result]
+    """
+    scenario = SCENARIOS[scenario_name]
+    remote_path = "/" + scenario.name
+    results = []
+
+    with _temporary_directory("gradient-bench-fixture-") as fixture_dir, \
+            _temporary_directory("gradient-bench-download-") as download_dir:
+        expected_count, expected_size = scenario.build(fixture_dir, scale)
+
+        for operation in operations:
+            server.pop_stats()
+            elapsed, listed, peak_rss, error = _run(
+                operation, server.url, remote_path, fixture_dir, download_dir, isolated)
+            stats = server.pop_stats()
+
+            if not error:
+                error = _check(server, operation, remote_path, expected_count, expected_size, listed, download_dir)
+
+            latencies = [s.elapsed for s in stats]
+            results.append(Result(
+                scenario=scenario.name,
+                operation=operation,
+                objects=expected_count,
+                bytes=sum(s.bytes_sent + s.bytes_received for s in stats if s.kind == "s3"),
+                elapsed=elapsed,
+                requests=len(stats),
+                latency_p50=percentile(latencies, 50),
+                latency_p99=percentile(latencies, 99),
+                peak_rss=peak_rss,
+                error=error,
+            ))
+
+    return results
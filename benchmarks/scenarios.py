@@ -0,0 +1,82 @@
+import collections
+import os
+
+KiB = 1024
+MiB = 1024 * KiB
+
+Scenario = collections.namedtuple("Scenario", ("name", "description", "build"))
+
+
+def _write_file(path, size):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining:
+            chunk = os.urandom(min(remaining, MiB))
+            f.write(chunk)
+            remaining -= len(chunk)
+
+
+def _scaled(value, scale):
+    return max(1, int(value * scale))
+
+
+def build_small_files(path, scale=1.0):
+    """Many small files spread over a few directories
+
+    :returns: number of files and their total size
+    :rtype: tuple[int,int]
+    """
+    count = _scaled(2000, scale)
+    size = 4 * KiB
+    for i in range(count):
+        _write_file(os.path.join(path, "dir-{:02d}".format(i % 20), "file-{:05d}.bin".format(i)), size)
+
+    return count, count * size
+
+
+def build_huge_files(path, scale=1.0):
+    """A few files large enough to be uploaded in multiple parts
+
+    :returns: number of files and their total size
+    :rtype: tuple[int,int]
+    """
+    count = 3
+    size = _scaled(64 * MiB, scale)
+    for i in range(count):
+        _write_file(os.path.join(path, "huge-{}.bin".format(i)), size)
+
+    return count, count * size
+
+
+def build_deep_tree(path, scale=1.0):
+    """Several long chains of nested directories with a few files on every level
+
+    :returns: number of files and their total size
+    :rtype: tuple[int,int]
+    """
+    branches = 8
+    depth = _scaled(16, scale)
+    files_per_dir = 3
+    size = 16 * KiB
+
+    count = 0
+    for branch in range(branches):
+        dir_path = os.path.join(path, "branch-{}".format(branch))
+        for level in range(depth):
+            dir_path = os.path.join(dir_path, "level-{:02d}".format(level))
+            for i in range(files_per_dir):
+                _write_file(os.path.join(dir_path, "file-{}.txt".format(i)), size)
+                count += 1
+
+    return count, count * size
+
+
+SCENARIOS = collections.OrderedDict((scenario.name, scenario) for scenario in (
+    Scenario("small_files", "2000 files of 4KiB in 20 directories", build_small_files),
+    Scenario("huge_files", "3 files of 64MiB, uploaded in multiple parts", build_huge_files),
+    Scenario("deep_tree", "8 chains of 16 nested directories, 3 files of 16KiB in each", build_deep_tree),
+))
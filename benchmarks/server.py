@@ -0,0 +1,649 @@
+import base64
+import collections
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from http import server
+from urllib.parse import parse_qs, quote, unquote, urlparse
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+S3_XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+CHUNK_SIZE = 64 * 1024
+
+DATASET_ID = "dsbench00000001"
+DATASET_VERSION = "bench01"
+DATASET_VERSION_ID = "{}:{}".format(DATASET_ID, DATASET_VERSION)
+
+RequestStats = collections.namedtuple("RequestStats", ("method", "kind", "elapsed", "bytes_sent", "bytes_received"))
+
+
+class Throttle(object):
+    def __init__(self, bandwidth=None):
+        """Bandwidth shared by all connections, like a single network link
+
+        :param int|None bandwidth: bytes per second. None for no limit
+        """
+        self.bandwidth = bandwidth
+        self._lock = threading.Lock()
+        self._next_free = 0.0
+
+    def consume(self, size):
+        if not self.bandwidth or not size:
+            return
+
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next_free)
+            self._next_free = start + float(size) / self.bandwidth
+            delay = self._next_free - now
+
+        time.sleep(delay)
+
+
+class ObjectStore(object):
+    def __init__(self, root):
+        """Objects kept in files under root, so huge objects don't take memory
+
+        :param str root:
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        self._objects = {}
+        self._etags = {}
+        self._uploads = {}
+
+    def _write(self, stream):
+        path = os.path.join(self.root, uuid.uuid4().hex)
+        md5 = hashlib.md5()
+        with open(path, "wb") as f:
+            for chunk in stream:
+                md5.update(chunk)
+                f.write(chunk)
+
+        return path, md5.hexdigest()
+
+    def put(self, key, stream, etag=None):
+        """
+        :param str key:
+        :param Iterable[bytes] stream:
+        :param str etag: ETag of the object instead of MD5 of its content, e.g. of a multipart upload
+        :returns: ETag
+        :rtype: str
+        """
+        path, md5 = self._write(stream)
+        etag = etag or md5
+        with self._lock:
+            old_path = self._objects.get(key)
+            self._objects[key] = path
+            self._etags[key] = etag
+
+        if old_path:
+            os.remove(old_path)
+        return etag
+
+    def open(self, key):
+        with self._lock:
+            path = self._objects.get(key)
+
+        try:
+            return open(path, "rb") if path else None
+        except (IOError, OSError):
+            return None
+
+    def size(self, key):
+        with self._lock:
+            path = self._objects.get(key)
+
+        try:
+            return os.path.getsize(path) if path else None
+        except OSError:
+            return None
+
+    def copy(self, source_key, key):
+        """
+        :returns: ETag or None if there is no source object
+        :rtype: str|None
+        """
+        f = self.open(source_key)
+        if f is None:
+            return None
+
+        with f:
+            return self.put(key, iter(lambda: f.read(CHUNK_SIZE), b""))
+
+    def etag(self, key):
+        with self._lock:
+            return self._etags.get(key)
+
+    def delete(self, key):
+        with self._lock:
+            path = self._objects.pop(key, None)
+            self._etags.pop(key, None)
+
+        if path:
+            os.remove(path)
+
+    def keys(self, prefix=""):
+        with self._lock:
+            return sorted(key for key in self._objects if key.startswith(prefix))
+
+    def create_multipart_upload(self, key):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = {"key": key, "parts": {}, "etags": {}}
+        return upload_id
+
+    def put_part(self, upload_id, part_number, stream):
+        path, etag = self._write(stream)
+        with self._lock:
+            upload = self._uploads[upload_id]
+            old_path = upload["parts"].get(part_number)
+            upload["parts"][part_number] = path
+            upload["etags"][part_number] = etag
+
+        if old_path:
+            os.remove(old_path)
+        return etag
+
+    def copy_part(self, upload_id, part_number, source_key, first, last):
+        """Copy bytes first to last (inclusive) of an object into a part of an upload
+
+        :returns: ETag or None if there is no source object
+        :rtype: str|None
+        """
+        f = self.open(source_key)
+        if f is None:
+            return None
+
+        def read_range():
+            f.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        with f:
+            return self.put_part(upload_id, part_number, read_range())
+
+    def complete_multipart_upload(self, upload_id, part_numbers):
+        with self._lock:
+            upload = self._uploads.pop(upload_id)
+
+        def read_parts():
+            for number in part_numbers:
+                with open(upload["parts"][number], "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        yield chunk
+
+        # like in S3, ETag of a multipart upload is MD5 of MD5s of its parts with the number of parts
+        md5s = b"".join(bytes.fromhex(upload["etags"][number]) for number in part_numbers)
+        etag = "{}-{}".format(hashlib.md5(md5s).hexdigest(), len(part_numbers))
+        etag = self.put(upload["key"], read_parts(), etag=etag)
+        for path in upload["parts"].values():
+            os.remove(path)
+        return etag
+
+    def abort_multipart_upload(self, upload_id):
+        """
+        :returns: False if there is no such upload
+        :rtype: bool
+        """
+        with self._lock:
+            upload = self._uploads.pop(upload_id, None)
+
+        if upload is None:
+            return False
+
+        for path in upload["parts"].values():
+            os.remove(path)
+        return True
+
+    def upload_ids(self):
+        with self._lock:
+            return sorted(self._uploads)
+
+    def clear(self):
+        with self._lock:
+            paths = list(self._objects.values())
+            for upload in self._uploads.values():
+                paths.extend(upload["parts"].values())
+            self._objects = {}
+            self._etags = {}
+            self._uploads = {}
+
+        for path in paths:
+            os.remove(path)
+
+
+class StandInHandler(server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "GradientStandIn/1.0"
+
+    PRESIGN_PATH_RE = re.compile(r"^/datasets/([^/]+)/versions/([^/]+)/s3/preSignedUrls$")
+    DATASET_REF_PATH_RE = re.compile(r"^/datasets/ref/([^/]+)$")
+    DATASET_PATH_RE = re.compile(r"^/datasets/([^/]+)$")
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_HEAD(self):
+        self._handle("HEAD")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        started = time.time()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+        if url.path.startswith("/s3/"):
+            kind = "s3"
+            self._handle_s3(method, unquote(url.path[len("/s3/"):]), query)
+        else:
+            kind = "api"
+            self._handle_api(method, url.path)
+
+        self.server.record(RequestStats(method, kind, time.time() - started, self.bytes_sent, self.bytes_received))
+
+    # API
+
+    def _handle_api(self, method, path):
+        match = self.PRESIGN_PATH_RE.match(path)
+        if method == "POST" and match:
+            calls = self._read_json().get("calls") or []
+            dataset_id, version = match.groups()
+            return self._send_json([self._presign(dataset_id, version, call) for call in calls])
+
+        match = self.DATASET_REF_PATH_RE.match(path)
+        if method == "GET" and match:
+            dataset_id, _, version = match.group(1).partition(":")
+            if dataset_id != DATASET_ID:
+                return self._send_json({"error": {"message": "Not found"}}, status=404)
+
+            ref = dict(self._dataset_json(), version={"version": version or DATASET_VERSION, "isCommitted": False})
+            return self._send_json(ref)
+
+        match = self.DATASET_PATH_RE.match(path)
+        if method == "GET" and match:
+            if match.group(1) != DATASET_ID:
+                return self._send_json({"error": {"message": "Not found"}}, status=404)
+
+            return self._send_json(self._dataset_json())
+
+        self._read_body_to_void()
+        self._send_json({"error": {"message": "Not found: {} {}".format(method, path)}}, status=404)
+
+    @staticmethod
+    def _dataset_json():
+        return {
+            "id": DATASET_ID,
+            "name": "benchmark",
+            "description": None,
+            "storageProvider": {"id": "spbench0000001", "name": "benchmark", "type": "s3", "config": {}},
+        }
+
+    def _presign(self, dataset_id, version, call):
+        s3_method = call["method"]
+        params = call.get("params") or {}
+        key_prefix = "{}/{}/".format(dataset_id, version)
+
+        if s3_method == "listObjectsV2":
+            query = {"list-type": "2", "prefix": key_prefix + params.get("Prefix", "").lstrip("/"),
+                     "max-keys": params.get("MaxKeys", 1000)}
+            if "Delimiter" in params:
+                query["delimiter"] = params["Delimiter"]
+            if params.get("ContinuationToken"):
+                query["continuation-token"] = params["ContinuationToken"]
+            return self._presigned_url("", query)
+
+        if s3_method == "deleteObjects":
+            # only the API knows where objects of the version are in the bucket, so it builds the body
+            keys = [key_prefix + obj["Key"].lstrip("/") for obj in params["Delete"]["Objects"]]
+            body = "<Delete>{}<Quiet>{}</Quiet></Delete>".format(
+                "".join("<Object><Key>{}</Key></Object>".format(escape(key)) for key in keys),
+                "true" if params["Delete"].get("Quiet") else "false")
+            content_md5 = base64.b64encode(hashlib.md5(body.encode("utf-8")).digest()).decode("ascii")
+            return dict(self._presigned_url("", {"delete": ""}), body=body,
+                        headers={"Content-MD5": content_md5, "Content-Type": "application/xml"})
+
+        key = key_prefix + params["Key"].lstrip("/")
+        if s3_method == "createMultipartUpload":
+            return {"url": {"Key": key, "UploadId": self.server.store.create_multipart_upload(key)}}
+
+        if s3_method == "completeMultipartUpload":
+            parts = params["MultipartUpload"]["Parts"]
+            part_numbers = [part["PartNumber"] for part in sorted(parts, key=lambda p: p["PartNumber"])]
+            etag = self.server.store.complete_multipart_upload(params["UploadId"], part_numbers)
+            return {"url": {"Key": key, "ETag": '"{}"'.format(etag)}}
+
+        if s3_method == "uploadPart":
+            return self._presigned_url(key, {"uploadId": params["UploadId"], "partNumber": params["PartNumber"]})
+
+        if s3_method == "abortMultipartUpload":
+            return self._presigned_url(key, {"uploadId": params["UploadId"]})
+
+        if s3_method == "copyObject":
+            # source is an object of another version of the same dataset, or of another dataset
+            return dict(self._presigned_url(key), headers={
+                "x-amz-copy-source": self._copy_source(dataset_id, params["CopySource"])})
+
+        if s3_method == "uploadPartCopy":
+            return dict(self._presigned_url(key, {"uploadId": params["UploadId"], "partNumber": params["PartNumber"]}),
+                        headers={"x-amz-copy-source": self._copy_source(dataset_id, params["CopySource"]),
+                                 "x-amz-copy-source-range": params["CopySourceRange"]})
+
+        return self._presigned_url(key)
+
+    @staticmethod
+    def _copy_source(dataset_id, source):
+        source_key = "{}/{}/{}".format(source.get("Dataset", dataset_id), source["Version"], source["Key"].lstrip("/"))
+        return quote(source_key)
+
+    def _presigned_url(self, key, query=None):
+        url = "{}/s3/{}".format(self.server.url, quote(key))
+        if query:
+            url += "?" + "&".join("{}={}".format(k, quote(str(v), safe="")) for k, v in query.items())
+        return {"url": url, "expiresIn": 3600}
+
+    # S3
+
+    def _handle_s3(self, method, key, query):
+        store = self.server.store
+
+        if method == "GET" and not key:
+            return self._list_objects(query)
+
+        if method == "POST" and not key and "delete" in query:
+            return self._delete_objects()
+
+        if method == "PUT" and "uploadId" in query and self.headers.get("x-amz-copy-source"):
+            self._read_body_to_void()
+            first, _, last = self.headers["x-amz-copy-source-range"][len("bytes="):].partition("-")
+            etag = store.copy_part(query["uploadId"], int(query["partNumber"]),
+                                   unquote(self.headers["x-amz-copy-source"]), int(first), int(last))
+            if etag is None:
+                return self._send(404, self._s3_error("NoSuchKey"), content_type="application/xml")
+            body = '<CopyPartResult><ETag>"{}"</ETag></CopyPartResult>'.format(etag)
+            return self._send(200, body.encode("utf-8"), content_type="application/xml")
+
+        if method == "PUT" and "uploadId" in query:
+            etag = store.put_part(query["uploadId"], int(query["partNumber"]), self._iter_body())
+            return self._send(200, b"", headers={"ETag": '"{}"'.format(etag)})
+
+        if method == "PUT" and self.headers.get("x-amz-copy-source"):
+            self._read_body_to_void()
+            etag = store.copy(unquote(self.headers["x-amz-copy-source"]), key)
+            if etag is None:
+                return self._send(404, self._s3_error("NoSuchKey"), content_type="application/xml")
+            body = '<CopyObjectResult><ETag>"{}"</ETag></CopyObjectResult>'.format(etag)
+            return self._send(200, body.encode("utf-8"), content_type="application/xml")
+
+        if method == "PUT":
+            etag = store.put(key, self._iter_body())
+            return self._send(200, b"", headers={"ETag": '"{}"'.format(etag)})
+
+        if method == "DELETE" and "uploadId" in query:
+            if not store.abort_multipart_upload(query["uploadId"]):
+                return self._send(404, self._s3_error("NoSuchUpload"), content_type="application/xml")
+            return self._send(204, b"")
+
+        if method == "DELETE":
+            store.delete(key)
+            return self._send(204, b"")
+
+        size = store.size(key)
+        if size is None:
+            return self._send(404, b"" if method == "HEAD" else self._s3_error("NoSuchKey"),
+                              content_type="application/xml")
+
+        if method == "HEAD":
+            self.send_response(200)
+            self.send_header("Content-Length", str(size))
+            self.send_header("ETag", '"{}"'.format(store.etag(key)))
+            self.end_headers()
+            return
+
+        self._send_file(key, size)
+
+    def _list_objects(self, query):
+        prefix = query.get("prefix", "")
+        delimiter = query.get("delimiter", "/")
+        max_keys = int(query.get("max-keys") or 1000)
+        # like in S3, listing continues after the last returned key, so it works while objects are deleted
+        start_after = query.get("continuation-token") or ""
+
+        entries = []
+        for key in self.server.store.keys(prefix):
+            rest = key[len(prefix):]
+            if delimiter and delimiter in rest:
+                common_prefix = prefix + rest[:rest.index(delimiter) + 1]
+                if entries and entries[-1] == ("prefix", common_prefix):
+                    continue
+                entries.append(("prefix", common_prefix))
+            else:
+                entries.append(("key", key))
+
+        entries = [entry for entry in entries if entry[1] > start_after]
+        page = entries[:max_keys]
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<ListBucketResult xmlns="{}">'.format(S3_XMLNS),
+                 "<Prefix>{}</Prefix>".format(escape(prefix)),
+                 "<KeyCount>{}</KeyCount>".format(len(page))]
+        for entry_type, name in page:
+            if entry_type == "key":
+                parts.append("<Contents><Key>{}</Key><Size>{}</Size><ETag>&quot;{}&quot;</ETag></Contents>".format(
+                    escape(name), self.server.store.size(name), self.server.store.etag(name)))
+            else:
+                parts.append("<CommonPrefixes><Prefix>{}</Prefix></CommonPrefixes>".format(escape(name)))
+        if len(entries) > max_keys:
+            parts.append("<NextContinuationToken>{}</NextContinuationToken>".format(escape(page[-1][1])))
+        parts.append("</ListBucketResult>")
+
+        self._send(200, "".join(parts).encode("utf-8"), content_type="application/xml")
+
+    def _delete_objects(self):
+        body = b"".join(self._iter_body())
+        if base64.b64encode(hashlib.md5(body).digest()).decode("ascii") != self.headers.get("Content-MD5"):
+            return self._send(400, self._s3_error("BadDigest"), content_type="application/xml")
+
+        request = ElementTree.fromstring(body)
+        quiet = request.findtext("Quiet") == "true"
+        results = []
+        for obj in request.iter("Object"):
+            key = obj.findtext("Key")
+            if key in self.server.undeletable_keys:
+                results.append("<Error><Key>{}</Key><Code>AccessDenied</Code><Message>Access Denied</Message>"
+                               "</Error>".format(escape(key)))
+                continue
+
+            self.server.store.delete(key)
+            if not quiet:
+                results.append("<Deleted><Key>{}</Key></Deleted>".format(escape(key)))
+
+        body = '<?xml version="1.0" encoding="UTF-8"?><DeleteResult>{}</DeleteResult>'.format("".join(results))
+        self._send(200, body.encode("utf-8"), content_type="application/xml")
+
+    @staticmethod
+    def _s3_error(code):
+        return '<?xml version="1.0" encoding="UTF-8"?><Error><Code>{}</Code></Error>'.format(code).encode("utf-8")
+
+    # helpers
+
+    def _iter_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if not size:
+                    self.rfile.readline()
+                    return
+                chunk = self.rfile.read(size)
+                self.rfile.readline()
+                self._count_received(chunk)
+                yield chunk
+
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining:
+            chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            self._count_received(chunk)
+            yield chunk
+
+    def _count_received(self, chunk):
+        self.bytes_received += len(chunk)
+        self.server.throttle.consume(len(chunk))
+
+    def _read_body_to_void(self):
+        for _ in self._iter_body():
+            pass
+
+    def _read_json(self):
+        body = b"".join(self._iter_body())
+        return json.loads(body.decode("utf-8")) if body else {}
+
+    def _send_json(self, data, status=200):
+        self._send(status, json.dumps(data).encode("utf-8"), content_type="application/json")
+
+    def _send(self, status, body, content_type=None, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self._write(body)
+
+    def _send_file(self, key, size):
+        f = self.server.store.open(key)
+        if f is None:
+            return self._send(404, self._s3_error("NoSuchKey"), content_type="application/xml")
+
+        # only single ranges are supported, like in S3
+        match = re.match(r"^bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        start, end = 0, size - 1
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+
+        with f:
+            self.send_response(206 if match else 200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("ETag", '"{}"'.format(self.server.store.etag(key)))
+            if match:
+                self.send_header("Content-Range", "bytes {}-{}/{}".format(start, end, size))
+            self.end_headers()
+
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                self._write(chunk)
+
+    def _write(self, data):
+        for i in range(0, len(data), CHUNK_SIZE):
+            chunk = data[i:i + CHUNK_SIZE]
+            self.server.throttle.consume(len(chunk))
+            self.wfile.write(chunk)
+            self.bytes_sent += len(chunk)
+
+
+class StandInServer(server.ThreadingHTTPServer):
+    daemon_threads = True
+    # many clients connect at once when worker pools start
+    request_queue_size = 128
+
+    def __init__(self, latency=0.0, bandwidth=None, host="127.0.0.1", port=0, storage_dir=None):
+        """Local stand-in of the dataset API and of an S3-compatible object store
+
+        The API side serves dataset details, dataset refs and the pre-signed URLs endpoint. Pre-signed URLs
+        point back to the object store side, which supports the object, listing and multipart calls used by
+        ``gradient datasets files`` commands. Objects are stored in files under storage_dir.
+
+        :param float latency: seconds added to every request
+        :param int|None bandwidth: bytes per second shared by all connections. None for no limit
+        :param str host:
+        :param int port: 0 to pick a free port
+        :param str storage_dir: directory for stored objects. A temporary directory if not set
+        """
+        server.ThreadingHTTPServer.__init__(self, (host, port), StandInHandler)
+        self.latency = latency
+        self.throttle = Throttle(bandwidth)
+        self._own_storage_dir = storage_dir is None
+        self.store = ObjectStore(storage_dir or tempfile.mkdtemp(prefix="gradient-bench-s3-"))
+        # keys deleteObjects reports AccessDenied for, to exercise per-key errors
+        self.undeletable_keys = set()
+
+        self._stats = []
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def record(self, stats):
+        with self._stats_lock:
+            self._stats.append(stats)
+
+    def pop_stats(self):
+        """Get stats of requests handled since the last call
+
+        :rtype: list[RequestStats]
+        """
+        with self._stats_lock:
+            stats, self._stats = self._stats, []
+        return stats
+
+    def object_keys(self, prefix=""):
+        return self.store.keys("{}/{}/{}".format(DATASET_ID, DATASET_VERSION, prefix))
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="gradient-bench-server")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+        if self._own_storage_dir:
+            shutil.rmtree(self.store.root, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -1,11 +1,11 @@
 from .clusters import ClustersClient
 from .dataset_client import DatasetsClient
 from .dataset_tag_client import DatasetTagsClient
-from .dataset_version_client import DatasetVersionsClient
+from .dataset_version_client import DatasetVersionsClient, AsyncDatasetVersionsClient
 from .machine_types_client import MachineTypesClient
-from .machines_client import MachinesClient
+from .machines_client import MachinesClient, AsyncMachinesClient
 from .model_client import ModelsClient
-from .notebook_client import NotebooksClient
+from .notebook_client import NotebooksClient, AsyncNotebooksClient
 from .project_client import ProjectsClient
 from .secret_client import SecretsClient
 from .storage_provider_client import StorageProvidersClient
@@ -0,0 +1,216 @@
+import asyncio
+import json as json_module
+import time
+import weakref
+
+import requests
+
+from . import http_client
+from .. import logger as sdk_logger, tracing
+from ..config import config
+from ..sdk_exceptions import GradientSdkError
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _check_aiohttp():
+    if aiohttp is None:
+        raise GradientSdkError("Async clients require aiohttp. Install it with: pip install gradient[async]")
+
+
+class AsyncResponse(object):
+    def __init__(self, status_code, headers, content, url, request=None):
+        """Fully read response with the interface of requests.Response used by the SDK
+
+        :param int status_code:
+        :param dict headers:
+        :param bytes content:
+        :param str url:
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.request = request
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json_module.loads(self.content.decode("utf-8"))
+
+
+class AsyncSessionPool(object):
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None):
+        """Keep-alive aiohttp sessions, one for each event loop
+
+        aiohttp sessions can't be shared between event loops, so a session is created on first use in every loop
+
+        :param int pool_size: max number of connections kept open for a single host
+        :param float connect_timeout: connect timeout in seconds
+        :param float read_timeout: read timeout in seconds
+        """
+        _check_aiohttp()
+        self.pool_size = pool_size or config.HTTP_ASYNC_POOL_SIZE
+        self.connect_timeout = connect_timeout or config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or config.HTTP_READ_TIMEOUT
+
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def get_session(self):
+        """Get session for the running event loop, creating it on first use
+
+        :rtype: aiohttp.ClientSession
+        """
+        loop = asyncio.get_event_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[loop] = session
+
+        return session
+
+    async def close(self):
+        """Close session of the running event loop"""
+        session = self._sessions.pop(asyncio.get_event_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def _create_session(self):
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.pool_size)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        # sessions are shared between API keys so nothing should be carried over from one request to another
+        session = aiohttp.ClientSession(connector=connector, timeout=timeout, cookie_jar=aiohttp.DummyCookieJar())
+        return session
+
+
+class AsyncAPI(http_client.API):
+    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger(),
+                 session_pool=None, retry_policy=None):
+        """API client sending requests with aiohttp. HTTP methods are coroutines
+
+        :param str api_url: url you want to connect
+        :param dict headers: headers
+        :param str api_key: your API key
+        :param str ps_client_name: Client name
+        :param sdk_logger.Logger logger:
+        :param AsyncSessionPool session_pool: pool of keep-alive sessions
+        :param RetryPolicy retry_policy: policy used to retry failed requests
+        """
+        session_pool = session_pool or AsyncSessionPool()
+        super(AsyncAPI, self).__init__(api_url, headers=headers, api_key=api_key, ps_client_name=ps_client_name,
+                                       logger=logger, session_pool=session_pool, retry_policy=retry_policy)
+
+    @property
+    def session(self):
+        """
+        :rtype: aiohttp.ClientSession
+        """
+        return self.session_pool.get_session()
+
+    async def post(self, url, json=None, params=None, files=None, data=None, idempotent=None):
+        if files is not None:
+            raise GradientSdkError("Sending files is not supported by async clients")
+
+        path = self.get_path(url)
+        if not self._is_replayable(data):
+            idempotent = False
+
+        response = await self._send("POST", path, idempotent=idempotent, logged_fields=("data",),
+                                    json=json, params=params, headers=self.headers, data=data)
+        return response
+
+    async def put(self, url, json=None, params=None, data=None, idempotent=None):
+        path = self.get_path(url)
+        if not self._is_replayable(data):
+            idempotent = False
+
+        response = await self._send("PUT", path, idempotent=idempotent,
+                                    json=json, params=params, headers=self.headers, data=data)
+        return response
+
+    async def get(self, url, json=None, params=None):
+        path = self.get_path(url)
+        response = await self._send("GET", path, params=params, headers=self.headers, json=json)
+        return response
+
+    async def delete(self, url, json=None, params=None):
+        path = self.get_path(url)
+        response = await self._send("DELETE", path, params=params, headers=self.headers, json=json)
+        return response
+
+    async def _send(self, method, path, idempotent=None, logged_fields=(), **kwargs):
+        debug = self.logger.is_debug_enabled()
+        if debug:
+            self._log_request(method, path, kwargs, logged_fields)
+
+        recorded = http_client.request_recorder.enabled
+        if recorded:
+            started = time.time()
+
+        with tracing.tracer.span("http.request", method=method, url=path) as span:
+            response = await self.retry_policy.call_async(method, self._request, method, path,
+                                                          idempotent=idempotent, **kwargs)
+            if span.enabled:
+                span.set(status_code=response.status_code)
+                span.add_bytes(sent=http_client.request_recorder.get_bytes_sent(response),
+                               received=http_client.request_recorder.get_bytes_received(response))
+
+        if recorded:
+            http_client.request_recorder.record(method, path, response, time.time() - started)
+
+        if debug:
+            self._log_response(response)
+
+        return response
+
+    async def _request(self, method, path, params=None, json=None, headers=None, **kwargs):
+        """Send single request and read whole response
+
+        aiohttp errors are translated to the requests' exceptions so callers and the retry policy handle
+        failures the same way for both kinds of clients
+
+        :rtype: AsyncResponse
+        """
+        if json is not None:
+            kwargs["json"] = json
+
+        # requests skips headers set to None, e.g. missing API key
+        headers = {key: value for key, value in (headers or {}).items() if value is not None}
+
+        try:
+            async with self.session.request(method, path, params=self._prepare_params(params), headers=headers,
+                                            **kwargs) as resp:
+                content = await resp.read()
+                return AsyncResponse(resp.status, resp.headers, content, str(resp.url))
+        except aiohttp.ClientPayloadError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except aiohttp.ClientConnectionError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.Timeout(e)
+
+    @staticmethod
+    def _prepare_params(params):
+        """Encode query params the way requests does: skip None values and repeat keys of lists
+
+        :param dict params:
+        :rtype: list[tuple[str,str]]|None
+        """
+        if not params:
+            return None
+
+        prepared = []
+        for key, value in params.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            prepared.extend((key, str(v)) for v in values if v is not None)
+
+        return prepared
@@ -1,7 +1,10 @@
-import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from .. import logger as sdk_logger
+from .async_http_client import AsyncSessionPool
+from .. import logger as sdk_logger, models
 from ..repositories.common import BaseRepository
+from ..retries import RetryPolicy
 from ..repositories.tags import ListTagRepository, UpdateTagRepository
 
 
@@ -10,7 +13,8 @@ class BaseClient(object):
             self,
             api_key,
             ps_client_name=None,
-            logger=sdk_logger.MuteLogger()
+            logger=sdk_logger.MuteLogger(),
+            retry_policy=None,
     ):
         """
         Base class. All client classes inherit from it.
@@ -18,27 +22,130 @@ class BaseClient(object):
         :param str api_key: your API key
         :param str ps_client_name:
         :param sdk_logger.Logger logger:
+        :param RetryPolicy retry_policy: policy used to retry failed API calls. Every client gets its own
+            policy, and so its own retry budget, by default
         """
+        self._repositories = {}
+        self._repositories_lock = threading.Lock()
+
         self.api_key = api_key
         self.ps_client_name = ps_client_name
         self.logger = logger
+        self.retry_policy = retry_policy or RetryPolicy(logger=logger)
+
+    @property
+    def api_key(self):
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value):
+        self._api_key = value
+        self.clear_repositories()
+
+    @property
+    def ps_client_name(self):
+        return self._ps_client_name
+
+    @ps_client_name.setter
+    def ps_client_name(self, value):
+        self._ps_client_name = value
+        self.clear_repositories()
+
+    @property
+    def logger(self):
+        return self._logger
+
+    @logger.setter
+    def logger(self, value):
+        self._logger = value
+        self.clear_repositories()
 
     def build_repository(self, repository_class, *args, **kwargs):
-        """
+        """Get repository kept for the life of the client, building it on first use
+
         :param type[BaseRepository] repository_class:
         :rtype: BaseRepository
         """
 
         if self.ps_client_name is not None and kwargs.get("ps_client_name") is None:
-            kwargs = copy.deepcopy(kwargs)
             kwargs["ps_client_name"] = self.ps_client_name
 
+        kwargs.setdefault("retry_policy", self.retry_policy)
+
+        try:
+            key = (repository_class, args, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:  # unhashable arguments - repository can't be reused
+            return self._create_repository(repository_class, *args, **kwargs)
+
+        with self._repositories_lock:
+            repository = self._repositories.get(key)
+            if repository is None:
+                repository = self._create_repository(repository_class, *args, **kwargs)
+                self._repositories[key] = repository
+
+        return repository
+
+    def clear_repositories(self):
+        """Drop repositories (and their API clients) built so far"""
+        with self._repositories_lock:
+            self._repositories.clear()
+
+    def _create_repository(self, repository_class, *args, **kwargs):
         repository = repository_class(*args, api_key=self.api_key, logger=self.logger, **kwargs)
         return repository
 
 
+class AsyncBaseClient(BaseClient):
+    def __init__(
+            self,
+            api_key,
+            ps_client_name=None,
+            logger=sdk_logger.MuteLogger(),
+            retry_policy=None,
+            session_pool=None,
+    ):
+        """
+        Base class of asyncio clients. Methods sending requests are coroutines.
+
+        Close the client when it's not needed anymore, or use it as an async context manager:
+
+        .. code-block:: python
+
+            async with AsyncNotebooksClient(api_key) as client:
+                notebooks = await client.list()
+
+        :param str api_key: your API key
+        :param str ps_client_name:
+        :param sdk_logger.Logger logger:
+        :param RetryPolicy retry_policy: policy used to retry failed API calls
+        :param AsyncSessionPool session_pool: pool of aiohttp sessions. Share one pool between clients
+            to share connections
+        """
+        self.session_pool = session_pool or AsyncSessionPool()
+        super(AsyncBaseClient, self).__init__(api_key, ps_client_name=ps_client_name, logger=logger,
+                                              retry_policy=retry_policy)
+
+    def build_repository(self, repository_class, *args, **kwargs):
+        kwargs.setdefault("session_pool", self.session_pool)
+        return super(AsyncBaseClient, self).build_repository(repository_class, *args, **kwargs)
+
+    async def close(self):
+        """Close connections opened in the running event loop"""
+        await self.session_pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
 class TagsSupportMixin(object):
     entity = ""
+    # max number of entities which tags are fetched with a single request
+    TAGS_LIST_CHUNK_SIZE = 100
+    TAGS_UPDATE_WORKERS = 8
 
     @staticmethod
     def merge_tags(entity_id, entity_tags, new_tags):
@@ -103,3 +210,97 @@ class TagsSupportMixin(object):
         list_tag_repository = self.build_repository(ListTagRepository)
         entity_tags = list_tag_repository.list(entity=self.entity, entity_ids=entity_ids)
         return entity_tags
+
+    def add_tags_bulk(self, entity_ids, tags, max_workers=None):
+        """
+        Add tags to many entities. Current tags are fetched in chunks and only entities
+        which tags changed are updated, concurrently.
+
+        :param list[str] entity_ids:
+        :param list[str] tags: list of tags to add to every entity
+        :param int max_workers: max number of concurrent updates
+        :rtype: list[models.TagsUpdateResult]
+        """
+        return self._update_tags_bulk(
+            entity_ids,
+            lambda current_tags: sorted(set(current_tags) | set(tags)),
+            max_workers=max_workers,
+        )
+
+    def remove_tags_bulk(self, entity_ids, tags, max_workers=None):
+        """
+        Remove tags from many entities. Current tags are fetched in chunks and only entities
+        which tags changed are updated, concurrently.
+
+        :param list[str] entity_ids:
+        :param list[str] tags: list of tags to remove from every entity
+        :param int max_workers: max number of concurrent updates
+        :rtype: list[models.TagsUpdateResult]
+        """
+        return self._update_tags_bulk(
+            entity_ids,
+            lambda current_tags: sorted(set(current_tags) - set(tags)),
+            max_workers=max_workers,
+        )
+
+    def _update_tags_bulk(self, entity_ids, get_new_tags, max_workers=None):
+        """
+        :param list[str] entity_ids:
+        :param callable get_new_tags: function returning new tags of entity given its current tags
+        :param int max_workers:
+        :returns: result for every entity, in order of entity_ids
+        :rtype: list[models.TagsUpdateResult]
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        results = {}
+        current_tags = {}
+        for i in range(0, len(entity_ids), self.TAGS_LIST_CHUNK_SIZE):
+            chunk = entity_ids[i:i + self.TAGS_LIST_CHUNK_SIZE]
+            try:
+                current_tags.update(self._list_tags_by_entity(chunk))
+            except Exception as e:
+                results.update((entity_id, models.TagsUpdateResult(entity_id=entity_id, error=e))
+                               for entity_id in chunk)
+
+        updates = []
+        for entity_id in entity_ids:
+            if entity_id in results:
+                continue
+
+            old_tags = sorted(set(current_tags.get(entity_id, [])))
+            new_tags = get_new_tags(old_tags)
+            if new_tags == old_tags:
+                results[entity_id] = models.TagsUpdateResult(entity_id=entity_id, tags=new_tags)
+            else:
+                updates.append((entity_id, new_tags))
+
+        if updates:
+            update_tag_repository = self.build_repository(UpdateTagRepository)
+
+            def update(entity_id, new_tags):
+                try:
+                    update_tag_repository.update(entity=self.entity, entity_id=entity_id, tags=new_tags)
+                except Exception as e:
+                    return models.TagsUpdateResult(entity_id=entity_id, error=e)
+
+                return models.TagsUpdateResult(entity_id=entity_id, tags=new_tags, changed=True)
+
+            with ThreadPoolExecutor(max_workers=max_workers or self.TAGS_UPDATE_WORKERS) as executor:
+                for result in executor.map(lambda args: update(*args), updates):
+                    results[result.entity_id] = result
+
+        return [results[entity_id] for entity_id in entity_ids]
+
+    def _list_tags_by_entity(self, entity_ids):
+        """
+        :param list[str] entity_ids:
+        :returns: tags of entities that have any
+        :rtype: dict[str,list[str]]
+        """
+        list_tag_repository = self.build_repository(ListTagRepository)
+        entity_tags = list_tag_repository.list(entity=self.entity, entity_ids=entity_ids)
+        tags_by_entity = {}
+        for item in entity_tags:
+            tags_by_entity.update(item)
+
+        return tags_by_entity
@@ -1,5 +1,5 @@
-from .base_client import BaseClient
-from .. import models, repositories
+from .base_client import AsyncBaseClient, BaseClient
+from .. import models, repositories, s3_copier
 
 
 class DatasetVersionsClient(BaseClient):
@@ -110,3 +110,109 @@ class DatasetVersionsClient(BaseClient):
 
         repository = self.build_repository(repositories.GenerateDatasetVersionPreSignedS3Urls)
         return repository.generate(dataset_version_id, calls)
+
+    def copy_files(self, source_dataset_version_id, target_dataset_version_id, source_path='/', target_path='/',
+                   part_concurrency=None, progress=None):
+        """Copy a file or a directory between dataset versions on the storage provider, without downloading it
+
+        :param str source_dataset_version_id: Dataset version ID (ex: dataset_id:version) to copy files from
+        :param str target_dataset_version_id: Dataset version ID to copy files to
+        :param str source_path: file or directory to copy
+        :param str target_path: target directory, or path of the target file if source path is a file
+        :param int part_concurrency: number of parts of a file larger than 5GiB copied at once.
+            PAPERSPACE_UPLOAD_PART_CONCURRENCY by default
+        :param s3_copier.CopyProgress progress: counts files and bytes as they are copied
+
+        :returns: number of copied files
+        :rtype: int
+        """
+
+        copier = s3_copier.S3DatasetVersionCopier(self)
+        return copier.copy(source_dataset_version_id, target_dataset_version_id, source_path=source_path,
+                           target_path=target_path, part_concurrency=part_concurrency, progress=progress)
+
+
+class AsyncDatasetVersionsClient(AsyncBaseClient):
+    """Asyncio version of DatasetVersionsClient"""
+
+    async def list(self, dataset_id, is_committed=True, limit=20, offset=0):
+        """Get list of your dataset versions
+
+        :param str dataset_id: Dataset ID [required]
+        :param bool is_committed: Filter versions by commit status
+        :param int limit: Limit results
+        :param int offset: Skip results
+
+        :returns: List of dataset versions
+        :rtype: list[models.DatasetVersion]
+        """
+
+        repository = self.build_repository(repositories.AsyncListDatasetVersions)
+        return await repository.list(id=dataset_id, is_committed=is_committed, limit=limit, offset=offset)
+
+    async def delete(self, dataset_version_id):
+        """Delete a dataset version
+
+        :param str dataset_version_id: Dataset version ID (ex: dataset_id:version) [required]
+        """
+
+        repository = self.build_repository(repositories.AsyncDeleteDatasetVersion)
+        await repository.delete(dataset_version_id)
+
+    async def get(self, dataset_version_id):
+        """Get a dataset version
+
+        :param str dataset_version_id: Dataset version ID (ex: dataset_id:version) [required]
+
+        :returns: dataset
+        :rtype: models.DatasetVersion
+        """
+        repository = self.build_repository(repositories.AsyncGetDatasetVersion)
+        return await repository.get(id=dataset_version_id)
+
+    async def create(self, dataset_id, message=None):
+        """Create a new dataset version
+
+        :param str dataset_id: Dataset ID [required]
+        :param str message: Dataset version message
+
+        :returns: dataset ID
+        :rtype: str
+        """
+
+        dataset_version = models.DatasetVersion(
+            dataset_id=dataset_id,
+            message=message,
+        )
+
+        repository = self.build_repository(repositories.AsyncCreateDatasetVersion)
+        return await repository.create(dataset_version)
+
+    async def update(self, dataset_version_id, message=None, is_committed=None):
+        """Update an existing S3 dataset
+
+        :param str dataset_version_id: Dataset version ID (ex: dataset_id:version)
+        :param str message: Dataset version message
+        :param bool is_committed: Mark dataset version as committed
+        """
+
+        dataset = models.DatasetVersion(
+            message=message,
+            is_committed=is_committed,
+        )
+
+        repository = self.build_repository(repositories.AsyncUpdateDatasetVersion)
+        await repository.update(dataset_version_id, dataset)
+
+    async def generate_pre_signed_s3_urls(self, dataset_version_id, calls):
+        """Generate pre-signed URLs for S3 storage providers
+
+        :param str dataset_version_id: Dataset version ID (ex: dataset_id:version)
+        :param list[dict] calls: List of S3 calls
+
+        :returns:
+        :rtype: list[models.DatasetVersionPreSignedURL]
+        """
+
+        repository = self.build_repository(repositories.AsyncGenerateDatasetVersionPreSignedS3Urls)
+        return await repository.generate(dataset_version_id, calls)
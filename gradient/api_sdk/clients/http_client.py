@@ -1,18 +1,173 @@
-import copy
+import collections
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from gradient import version
-from .. import utils, logger as sdk_logger
+from .. import tracing, utils, logger as sdk_logger
 from ..config import config
+from ..retries import RetryPolicy
 
 default_headers = {"X-API-Key": config.PAPERSPACE_API_KEY,
                    "ps_client_name": "gradient-cli-sdk",
                    "ps_client_version": version.version}
 
 
+class RequestRecord(collections.namedtuple(
+        "RequestRecord", ("method", "url", "status_code", "bytes_sent", "bytes_received", "elapsed"))):
+    """Summary of a single request sent by the API client. Elapsed time is in seconds and includes retries"""
+
+
+class RequestRecorder(object):
+    def __init__(self):
+        """Passes a RequestRecord of every request sent by API clients to registered listeners
+
+        Nothing is measured when there are no listeners
+        """
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self._listeners)
+
+    def add_listener(self, listener):
+        """
+        :param callable listener: function called with a RequestRecord
+        """
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        with self._lock:
+            self._listeners = [registered for registered in self._listeners if registered != listener]
+
+    def record(self, method, url, response, elapsed, streamed=False):
+        record = RequestRecord(
+            method=method,
+            url=url,
+            status_code=response.status_code,
+            bytes_sent=self.get_bytes_sent(response),
+            bytes_received=self.get_bytes_received(response, streamed),
+            elapsed=elapsed,
+        )
+        for listener in self._listeners:
+            listener(record)
+
+    @staticmethod
+    def get_bytes_sent(response):
+        request = getattr(response, "request", None)
+        body = getattr(request, "body", None)
+        if isinstance(body, (bytes, str)):
+            return len(body)
+
+        content_length = getattr(request, "headers", {}).get("Content-Length")
+        return int(content_length) if content_length else 0
+
+    @staticmethod
+    def get_bytes_received(response, streamed=False):
+        content_length = (response.headers or {}).get("Content-Length")
+        if content_length:
+            return int(content_length)
+
+        if streamed:
+            return 0
+
+        return len(response.content or b"")
+
+
+request_recorder = RequestRecorder()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout=None, *args, **kwargs):
+        """HTTP adapter applying a default timeout to requests sent without one
+
+        :param float|tuple[float,float] timeout: (connect, read) timeout in seconds
+        """
+        self.timeout = timeout
+        super(TimeoutHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+
+        return super(TimeoutHTTPAdapter, self).send(request, **kwargs)
+
+
+class SessionPool(object):
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None):
+        """Thread-safe registry of keep-alive sessions, one for each scheme and host
+
+        :param int pool_size: max number of connections kept open for a single host
+        :param float connect_timeout: connect timeout in seconds
+        :param float read_timeout: read timeout in seconds
+        """
+        self.pool_size = pool_size or config.HTTP_POOL_SIZE
+        self.connect_timeout = connect_timeout or config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or config.HTTP_READ_TIMEOUT
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        return self.connect_timeout, self.read_timeout
+
+    def get_session(self, url):
+        """Get session for the host of the url, creating it on first use
+
+        :param str url:
+        :rtype: requests.Session
+        """
+        key = self._get_key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[key] = session
+
+        return session
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    @staticmethod
+    def _get_key(url):
+        parsed_url = urlparse(url or "")
+        return parsed_url.scheme.lower(), parsed_url.netloc.lower()
+
+    def _create_session(self):
+        session = requests.Session()
+        # sessions are shared between API keys so nothing should be carried over from one request to another
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = TimeoutHTTPAdapter(
+            timeout=self.timeout,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+default_session_pool = SessionPool()
+default_retry_policy = RetryPolicy()
+
+
 class API(object):
-    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger()):
+    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger(),
+                 session_pool=None, retry_policy=None):
         """
 
         :param str api_url: url you want to connect
@@ -20,8 +175,13 @@ class API(object):
         :param str api_key: your API key
         :param str ps_client_name: Client name
         :param sdk_logger.Logger logger:
+        :param SessionPool session_pool: pool of keep-alive sessions. Shared module-level pool is used by default
+        :param RetryPolicy retry_policy: policy used to retry failed requests. Shared module-level policy is used
+            by default
         """
         self.api_url = api_url
+        self.session_pool = session_pool or default_session_pool
+        self.retry_policy = retry_policy or default_retry_policy
         headers = headers or default_headers
         self.headers = headers.copy()
 
@@ -49,6 +209,13 @@ class API(object):
     def ps_client_name(self, value):
         self.headers["ps_client_name"] = value
 
+    @property
+    def session(self):
+        """
+        :rtype: requests.Session
+        """
+        return self.session_pool.get_session(self.api_url)
+
     def get_path(self, url):
         if not url:
             return self.api_url
@@ -56,46 +223,97 @@ class API(object):
         full_path = utils.concatenate_urls(self.api_url, url)
         return full_path
 
-    def post(self, url, json=None, params=None, files=None, data=None):
+    @staticmethod
+    def _is_replayable(data=None, files=None):
+        """Check if body of the request can be sent again. Streamed bodies can be read only once"""
+        return files is None and (data is None or isinstance(data, (bytes, str, dict, list, tuple)))
+
+    def post(self, url, json=None, params=None, files=None, data=None, idempotent=None):
         path = self.get_path(url)
-        headers = copy.deepcopy(self.headers)
+        if not self._is_replayable(data, files):
+            idempotent = False
+
+        headers = self.headers
         if data:
-            headers["Content-Type"] = data.content_type
+            headers = dict(headers, **{"Content-Type": data.content_type})
 
-        self.logger.debug("POST request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}\n\tfiles: {}\n\tdata: {}"
-                          .format(path, headers, json, params, files, data))
-        response = requests.post(path, json=json, params=params, headers=headers, files=files, data=data)
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        response = self._send("POST", self.session.post, path, idempotent=idempotent, logged_fields=("files", "data"),
+                              json=json, params=params, headers=headers, files=files, data=data)
         return response
 
-    def put(self, url, json=None, params=None, data=None):
+    def put(self, url, json=None, params=None, data=None, idempotent=None):
         path = self.get_path(url)
-        self.logger.debug("PUT request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
-                          .format(path, self.headers, json, params))
-        response = requests.put(path, json=json, params=params, headers=self.headers, data=data)
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        if not self._is_replayable(data):
+            idempotent = False
+
+        response = self._send("PUT", self.session.put, path, idempotent=idempotent,
+                              json=json, params=params, headers=self.headers, data=data)
         return response
 
-    def get(self, url, json=None, params=None):
+    def get(self, url, json=None, params=None, headers=None, stream=False):
+        """
+        :param bool stream: don't read the body up front. Read it with ``response.iter_content()``
+            and close the response afterwards
+        """
         path = self.get_path(url)
-        self.logger.debug("GET request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
-                          .format(path, self.headers, json, params))
-        response = requests.get(path, params=params, headers=self.headers, json=json)
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        headers = dict(self.headers, **headers) if headers else self.headers
+        kwargs = {"stream": True} if stream else {}
+        response = self._send("GET", self.session.get, path, params=params, headers=headers, json=json, **kwargs)
         return response
 
     def delete(self, url, json=None, params=None):
         path = self.get_path(url)
-        response = requests.delete(path, params=params, headers=self.headers, json=json)
-        self.logger.debug("DELETE request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
-                          .format(response.url, self.headers, json, params))
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        response = self._send("DELETE", self.session.delete, path, params=params, headers=self.headers, json=json)
         return response
 
+    def _send(self, method, send, path, idempotent=None, logged_fields=(), **kwargs):
+        """Send request retrying it if needed. Log and record it only if anyone is listening
+
+        :param str method: HTTP method
+        :param callable send: session's method sending the request
+        :param str path: full url
+        :param bool|None idempotent: see RetryPolicy.call
+        :param tuple[str] logged_fields: names of request's arguments logged besides headers, json and params
+        :rtype: requests.Response
+        """
+        debug = self.logger.is_debug_enabled()
+        if debug:
+            self._log_request(method, path, kwargs, logged_fields)
+
+        recorded = request_recorder.enabled
+        if recorded:
+            started = time.time()
+
+        streamed = kwargs.get("stream", False)
+        with tracing.tracer.span("http.request", method=method, url=path) as span:
+            response = self.retry_policy.call(method, send, path, idempotent=idempotent, **kwargs)
+            if span.enabled:
+                span.set(status_code=response.status_code)
+                span.add_bytes(sent=request_recorder.get_bytes_sent(response),
+                               received=request_recorder.get_bytes_received(response, streamed))
+
+        if recorded:
+            request_recorder.record(method, path, response, time.time() - started, streamed=streamed)
+
+        if debug:
+            self._log_response(response, streamed=streamed)
+
+        return response
+
+    def _log_request(self, method, path, kwargs, logged_fields):
+        msg = "{} request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}".format(
+            method, path, kwargs.get("headers"), kwargs.get("json"), kwargs.get("params"))
+        for field in logged_fields:
+            msg += "\n\t{}: {}".format(field, kwargs.get(field))
+
+        self.logger.debug(msg)
+
+    def _log_response(self, response, streamed=False):
+        self.logger.debug("Response status code: {}".format(response.status_code))
+        # reading content of a streamed response would consume the stream
+        if not streamed:
+            self.logger.debug("Response content: {}".format(response.content))
+
 
 class GradientResponse(object):
     def __init__(self, body, code, headers, data, request=None):
@@ -1,4 +1,4 @@
-from .base_client import BaseClient, TagsSupportMixin
+from .base_client import AsyncBaseClient, BaseClient, TagsSupportMixin
 from .. import repositories, models
 from ..repositories.machines import CheckMachineAvailability, DeleteMachine, ListMachines, WaitForState
 
@@ -292,3 +292,110 @@ class MachinesClient(TagsSupportMixin, BaseClient):
             last_run_timestamp=last_run_timestamp,
         )
         return machines
+
+    def iter(self, **filters):
+        """Iterate over machines as they are received. Unlike list(), the whole list is never held in memory
+
+        :param filters: same filters as in list()
+
+        :rtype: Iterator[models.Machine]
+        """
+        repository = self.build_repository(ListMachines)
+        return repository.iter(**filters)
+
+
+class AsyncMachinesClient(AsyncBaseClient):
+    """Asyncio version of MachinesClient"""
+
+    async def get(self, id):
+        """Get machine instance
+
+        :param str id: ID of a machine [required]
+
+        :return: Machine instance
+        :rtype: models.Machine
+        """
+        repository = self.build_repository(repositories.AsyncGetMachine)
+        instance = await repository.get(id=id)
+        return instance
+
+    async def is_available(self, machine_type, region):
+        """Check if specified machine is available in certain region
+
+        :param str machine_type: Machine type  [required]
+        :param str region: Name of the region  [required]
+
+        :return: If specified machine is available in the region
+        :rtype: bool
+        """
+        repository = self.build_repository(repositories.AsyncCheckMachineAvailability)
+        is_available = await repository.get(machine_type=machine_type, region=region)
+        return is_available
+
+    async def restart(self, id):
+        """Restart machine
+
+        :param str id: ID of a machine [required]
+        """
+        repository = self.build_repository(repositories.AsyncRestartMachine)
+        await repository.restart(id)
+
+    async def start(self, id):
+        """Start machine
+
+        :param str id: ID of a machine [required]
+        """
+        repository = self.build_repository(repositories.AsyncStartMachine)
+        await repository.start(id)
+
+    async def stop(self, id):
+        """Stop machine
+
+        :param str id: ID of a machine [required]
+        """
+        repository = self.build_repository(repositories.AsyncStopMachine)
+        await repository.stop(id)
+
+    async def get_utilization(self, id, billing_month):
+        """
+
+        :param id: ID of the machine
+        :param billing_month: Billing month in "YYYY-MM" format
+
+        :return: Machine utilization info
+        :rtype: models.MachineUtilization
+        """
+        repository = self.build_repository(repositories.AsyncGetMachineUtilization)
+        usage = await repository.get(id=id, billing_month=billing_month)
+        return usage
+
+    async def delete(self, machine_id, release_public_ip=False):
+        """Destroy machine with given ID
+
+        :param str machine_id: ID of the machine
+        :param bool release_public_ip: If the assigned public IP should be released
+        """
+        repository = self.build_repository(repositories.AsyncDeleteMachine)
+        await repository.delete(machine_id, release_public_ip=release_public_ip)
+
+    async def wait_for_state(self, machine_id, state, interval=5):
+        """Wait for defined machine state
+
+        :param str machine_id: ID of the machine
+        :param str state: State of machine to wait for
+        :param int interval: interval between polls
+        """
+        repository = self.build_repository(repositories.AsyncWaitForState)
+        await repository.wait_for_state(machine_id, state, interval)
+
+    async def list(self, **filters):
+        """Get list of machines
+
+        :param filters: same filters as in MachinesClient.list
+
+        :return: List of machines
+        :rtype: list[models.Machine]
+        """
+        repository = self.build_repository(repositories.AsyncListMachines)
+        machines = await repository.list(**filters)
+        return machines
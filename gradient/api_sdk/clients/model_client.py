@@ -20,6 +20,18 @@ class ModelsClient(TagsSupportMixin, BaseClient):
         models_list = repository.list(project_id=project_id, tags=tags)
         return models_list
 
+    def iter(self, project_id=None, tags=None):
+        """Iterate over models as they are received. Unlike list(), the whole list is never held in memory
+
+        :param str project_id: Project ID to filter models
+        :param list[str]|tuple[str] tags: tags to filter models
+
+        :returns: generator of Model instances
+        :rtype: Iterator[models.Model]
+        """
+        repository = self.build_repository(repositories.ListModels)
+        return repository.iter(project_id=project_id, tags=tags)
+
     def delete(self, model_id):
         """Delete a model
 
@@ -1,4 +1,4 @@
-from .base_client import BaseClient, TagsSupportMixin
+from .base_client import AsyncBaseClient, BaseClient, TagsSupportMixin
 from .. import repositories, models
 
 
@@ -161,6 +161,14 @@ class NotebooksClient(TagsSupportMixin, BaseClient):
         notebooks = repository.list(tags=tags, limit=limit, offset=offset, get_meta=get_meta)
         return notebooks
 
+    def iter(self, tags=None, limit=None, offset=None):
+        """Iterate over Notebooks as they are received. Unlike list(), the whole list is never held in memory
+
+        :rtype: Iterator[models.Notebook]
+        """
+        repository = self.build_repository(repositories.ListNotebooks)
+        return repository.iter(tags=tags, limit=limit, offset=offset)
+
     def get_metrics(self, notebook_id, start=None, end=None, interval="30s", built_in_metrics=None):
         """Get notebook metrics
 
@@ -313,3 +321,84 @@ class NotebooksClient(TagsSupportMixin, BaseClient):
         repository = self.build_repository(repositories.ListNotebookLogs)
         logs = repository.yield_logs(job_id=notebook.job_handle, notebook_id=notebook_id, line=line, limit=limit)
         return logs
+
+
+class AsyncNotebooksClient(AsyncBaseClient):
+    """Asyncio version of NotebooksClient"""
+
+    async def start(
+            self,
+            id,
+            machine_type,
+            cluster_id=None,
+            shutdown_timeout=None,
+            is_preemptible=None,
+    ):
+        """Start existing notebook
+        :param str|int id:
+        :param str machine_type:
+        :param str cluster_id:
+        :param int shutdown_timeout:
+        :param bool is_preemptible:
+
+        :return: Notebook ID
+        :rtype str:
+        """
+        notebook = models.NotebookStart(
+            notebook_id=id,
+            machine_type=machine_type,
+            cluster_id=cluster_id,
+            shutdown_timeout=shutdown_timeout,
+            is_preemptible=is_preemptible,
+        )
+
+        repository = self.build_repository(repositories.AsyncStartNotebook)
+        handle = await repository.start(notebook)
+        return handle
+
+    async def fork(self, id, project_id):
+        """Fork an existing notebook
+        :param str|int id:
+        :param str project_id:
+
+        :return: Notebook ID
+        :rtype str:
+        """
+        repository = self.build_repository(repositories.AsyncForkNotebook)
+        handle = await repository.fork(id, project_id)
+        return handle
+
+    async def get(self, id):
+        """Get Notebook
+
+        :param str id: Notebook ID
+        :rtype: models.Notebook
+        """
+        repository = self.build_repository(repositories.AsyncGetNotebook)
+        notebook = await repository.get(id=id)
+        return notebook
+
+    async def delete(self, id):
+        """Delete existing notebook
+
+        :param str id: Notebook ID
+        """
+        repository = self.build_repository(repositories.AsyncDeleteNotebook)
+        await repository.delete(id)
+
+    async def stop(self, id):
+        """Stop existing notebook
+
+        :param str|int id: Notebook ID
+        """
+        repository = self.build_repository(repositories.AsyncStopNotebook)
+        await repository.stop(id)
+
+    async def list(self, tags=None, limit=None, offset=None, get_meta=False):
+        """Get list of Notebooks
+
+        :rtype: list[models.Notebook]
+        """
+        repository = self.build_repository(repositories.AsyncListNotebooks)
+        notebooks = await repository.list(tags=tags, limit=limit, offset=offset, get_meta=get_meta)
+        return notebooks
@@ -1,27 +1,54 @@
 from . import ModelsClient, ProjectsClient, \
     MachinesClient, NotebooksClient, SecretsClient, DatasetsClient, MachineTypesClient, DatasetVersionsClient, \
     DatasetTagsClient, ClustersClient, StorageProvidersClient
+from .base_client import BaseClient
 from .workflow_client import WorkflowsClient
 from .. import logger as sdk_logger
+from ..retries import RetryPolicy
 
 
 class SdkClient(object):
-    def __init__(self, api_key, logger=sdk_logger.MuteLogger()):
+    def __init__(self, api_key, logger=sdk_logger.MuteLogger(), retry_policy=None):
         """
         :param str api_key: API key
         :param sdk_logger.Logger logger:
+        :param RetryPolicy retry_policy: policy shared by all clients, so they share one retry budget
         """
-        self.clusters = ClustersClient(api_key=api_key, logger=logger)
-        self.datasets = DatasetsClient(api_key=api_key, logger=logger)
-        self.dataset_tags = DatasetTagsClient(api_key=api_key, logger=logger)
-        self.dataset_versions = DatasetVersionsClient(
-            api_key=api_key, logger=logger)
-        self.machine_types = MachineTypesClient(api_key=api_key, logger=logger)
-        self.machines = MachinesClient(api_key=api_key, logger=logger)
-        self.models = ModelsClient(api_key=api_key, logger=logger)
-        self.notebooks = NotebooksClient(api_key=api_key, logger=logger)
-        self.projects = ProjectsClient(api_key=api_key, logger=logger)
-        self.secrets = SecretsClient(api_key=api_key, logger=logger)
-        self.storage_providers = StorageProvidersClient(
-            api_key=api_key, logger=logger)
-        self.workflows = WorkflowsClient(api_key=api_key, logger=logger)
+        retry_policy = retry_policy or RetryPolicy(logger=logger)
+        self.clusters = ClustersClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.datasets = DatasetsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.dataset_tags = DatasetTagsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.dataset_versions = DatasetVersionsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.machine_types = MachineTypesClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.machines = MachinesClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.models = ModelsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.notebooks = NotebooksClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.projects = ProjectsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.secrets = SecretsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.storage_providers = StorageProvidersClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+        self.workflows = WorkflowsClient(api_key=api_key, logger=logger, retry_policy=retry_policy)
+
+    @property
+    def clients(self):
+        """
+        :rtype: list[BaseClient]
+        """
+        return [client for client in vars(self).values() if isinstance(client, BaseClient)]
+
+    @property
+    def api_key(self):
+        return self.clusters.api_key
+
+    @api_key.setter
+    def api_key(self, value):
+        for client in self.clients:
+            client.api_key = value
+
+    @property
+    def ps_client_name(self):
+        return self.clusters.ps_client_name
+
+    @ps_client_name.setter
+    def ps_client_name(self, value):
+        for client in self.clients:
+            client.ps_client_name = value
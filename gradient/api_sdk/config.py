@@ -24,6 +24,17 @@ _DEFAULT_CONFIG_FILE_NAME = os.path.expanduser("config.json")
 _DEFAULT_HELP_HEADERS_COLOR = "yellow"
 _DEFAULT_HELP_OPTIONS_COLOR = "green"
 _DEFAULT_USE_CONSOLE_COLORS = True
+_DEFAULT_HTTP_POOL_SIZE = 16
+_DEFAULT_HTTP_CONNECT_TIMEOUT = 10
+_DEFAULT_HTTP_READ_TIMEOUT = 300
+_DEFAULT_HTTP_MAX_RETRIES = 3
+_DEFAULT_HTTP_ASYNC_POOL_SIZE = 100
+_DEFAULT_HTTP_CACHE_MAX_SIZE = 10 * 1024 * 1024
+_DEFAULT_UPLOAD_PART_CONCURRENCY = 4
+_DEFAULT_UPLOAD_MAX_PART_CONCURRENCY = 16
+_DEFAULT_DOWNLOAD_PART_CONCURRENCY = 4
+_DEFAULT_DOWNLOAD_MAX_PART_CONCURRENCY = 16
+_DEFAULT_TRANSFER_MAX_BYTES_IN_FLIGHT = 512 * 1024 * 1024
 
 
 def get_help_colors_dict(use_colors, help_headers_color, help_options_color):
@@ -63,3 +74,32 @@ class config(object):
                                         _DEFAULT_USE_CONSOLE_COLORS) in (True, "true", "1")
     HELP_COLORS_DICT = get_help_colors_dict(
         USE_CONSOLE_COLORS, HELP_HEADERS_COLOR, HELP_OPTIONS_COLOR)
+
+    HTTP_POOL_SIZE = int(os.environ.get(
+        "PAPERSPACE_HTTP_POOL_SIZE", _DEFAULT_HTTP_POOL_SIZE))
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get(
+        "PAPERSPACE_HTTP_CONNECT_TIMEOUT", _DEFAULT_HTTP_CONNECT_TIMEOUT))
+    HTTP_READ_TIMEOUT = float(os.environ.get(
+        "PAPERSPACE_HTTP_READ_TIMEOUT", _DEFAULT_HTTP_READ_TIMEOUT))
+    HTTP_MAX_RETRIES = int(os.environ.get(
+        "PAPERSPACE_HTTP_MAX_RETRIES", _DEFAULT_HTTP_MAX_RETRIES))
+    HTTP_ASYNC_POOL_SIZE = int(os.environ.get(
+        "PAPERSPACE_HTTP_ASYNC_POOL_SIZE", _DEFAULT_HTTP_ASYNC_POOL_SIZE))
+    HTTP_CACHE = os.environ.get("PAPERSPACE_HTTP_CACHE") in ("true", "1")
+    HTTP_CACHE_MAX_SIZE = int(os.environ.get(
+        "PAPERSPACE_HTTP_CACHE_MAX_SIZE", _DEFAULT_HTTP_CACHE_MAX_SIZE))
+    TRACE_FILE = os.environ.get("PAPERSPACE_TRACE_FILE")
+    UPLOAD_PART_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_UPLOAD_PART_CONCURRENCY", _DEFAULT_UPLOAD_PART_CONCURRENCY))
+    UPLOAD_MAX_PART_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_UPLOAD_MAX_PART_CONCURRENCY", _DEFAULT_UPLOAD_MAX_PART_CONCURRENCY))
+    DOWNLOAD_PART_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_DOWNLOAD_PART_CONCURRENCY", _DEFAULT_DOWNLOAD_PART_CONCURRENCY))
+    DOWNLOAD_MAX_PART_CONCURRENCY = int(os.environ.get(
+        "PAPERSPACE_DOWNLOAD_MAX_PART_CONCURRENCY", _DEFAULT_DOWNLOAD_MAX_PART_CONCURRENCY))
+    # bytes per second of dataset transfers, unlimited if not set
+    MAX_BANDWIDTH = float(os.environ.get("PAPERSPACE_MAX_BANDWIDTH") or 0) or None
+    TRANSFER_MAX_BYTES_IN_FLIGHT = int(os.environ.get(
+        "PAPERSPACE_TRANSFER_MAX_BYTES_IN_FLIGHT", _DEFAULT_TRANSFER_MAX_BYTES_IN_FLIGHT))
+    # checks content of dataset transfers against ETags, which are not MD5s of objects encrypted with KMS keys
+    VERIFY_TRANSFERS = os.environ.get("PAPERSPACE_VERIFY_TRANSFERS", "true") in ("true", "1")
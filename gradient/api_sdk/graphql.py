@@ -1,17 +1,37 @@
 from gql import Client
 from gql.transport.requests import RequestsHTTPTransport
-
+from graphql import OperationType
 
 from .config import config
+from .retries import RetryPolicy
+
+default_retry_policy = RetryPolicy()
+
+
+class RetryingRequestsHTTPTransport(RequestsHTTPTransport):
+    def __init__(self, *args, retry_policy=None, **kwargs):
+        """Transport retrying failed queries with the SDK's retry policy
+
+        :param RetryPolicy retry_policy:
+        """
+        super(RetryingRequestsHTTPTransport, self).__init__(*args, **kwargs)
+        self.retry_policy = retry_policy or default_retry_policy
+
+    def execute(self, document, *args, **kwargs):
+        # queries are safe to send again, mutations are not
+        idempotent = all(getattr(definition, "operation", None) == OperationType.QUERY
+                         for definition in document.definitions)
+        execute = super(RetryingRequestsHTTPTransport, self).execute
+        return self.retry_policy.call("POST", execute, document, *args, idempotent=idempotent, **kwargs)
 
 
-def graphql_client(api_key=None):
+def graphql_client(api_key=None, retry_policy=None):
     if api_key is None:
         api_key = config.PAPERSPACE_API_KEY
     headers = {
         'Authorization': f'Bearer {api_key}',
     }
-    transport = RequestsHTTPTransport(
-        headers=headers, url=config.API_HOST, verify=True, retries=3)
+    transport = RetryingRequestsHTTPTransport(
+        headers=headers, url=config.API_HOST, verify=True, retry_policy=retry_policy)
 
     return Client(transport=transport)
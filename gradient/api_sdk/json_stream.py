@@ -0,0 +1,144 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class _Buffer(object):
+    def __init__(self, chunks):
+        """Text read incrementally from an iterable of byte chunks
+
+        :param Iterable[bytes] chunks:
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self):
+        """Append next chunk to the buffer, dropping text that was already consumed
+
+        :returns: False if there is nothing more to read
+        :rtype: bool
+        """
+        if self.eof:
+            return False
+
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def peek(self):
+        """Get next non-whitespace character without consuming it
+
+        :rtype: str|None
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+
+            if not self.read_more():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError("Expected '{}' at position {} of JSON stream".format(char, self.pos))
+
+        self.pos += 1
+
+    def decode_value(self, decoder):
+        """Decode next complete JSON value, reading more chunks until it's complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                if not self.read_more():
+                    raise
+                continue
+
+            # a number at the end of the buffer may continue in the next chunk, e.g. "22." + "5"
+            if not self.eof and self._may_continue(value, end):
+                self.read_more()
+                continue
+
+            self.pos = end
+            return value
+
+    def _may_continue(self, value, end):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+
+        return all(char in _NUMBER_CHARS for char in self.text[end:])
+
+
+def iter_json_items(chunks, items_key=None):
+    """Yield items of a JSON list as soon as each of them was received
+
+    Only one item at a time is held in memory, so very long lists can be processed
+    before the whole response arrives.
+
+    :param Iterable[bytes] chunks: response body, e.g. ``response.iter_content(chunk_size)``
+    :param str items_key: key of the list in the top-level JSON object. None if the top-level value is the list
+    :returns: generator of decoded items
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+
+    first_char = buffer.peek()
+    if first_char is None:
+        return
+
+    if items_key is None:
+        if first_char == "n":  # null
+            buffer.decode_value(decoder)
+            return
+
+        for item in _iter_array(buffer, decoder):
+            yield item
+        return
+
+    buffer.expect("{")
+    while buffer.peek() != "}":
+        key = buffer.decode_value(decoder)
+        buffer.expect(":")
+        if key == items_key and buffer.peek() == "[":
+            for item in _iter_array(buffer, decoder):
+                yield item
+        else:
+            buffer.decode_value(decoder)
+
+        if buffer.peek() == ",":
+            buffer.pos += 1
+        elif buffer.peek() is None:
+            raise ValueError("Unexpected end of JSON stream")
+
+
+def _iter_array(buffer, decoder):
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        buffer.pos += 1
+        return
+
+    while True:
+        yield buffer.decode_value(decoder)
+
+        next_char = buffer.peek()
+        buffer.pos += 1
+        if next_char == "]":
+            return
+
+        if next_char != ",":
+            raise ValueError("Expected ',' or ']' in JSON stream, got {!r}".format(next_char))
@@ -20,6 +20,13 @@ class Logger(object):
     def debug(self, msg, *args, **kwargs):
         pass
 
+    def is_debug_enabled(self):
+        """Check if debug messages are written anywhere so callers can skip building them
+
+        :rtype: bool
+        """
+        return type(self).debug is not Logger.debug
+
 
 class MuteLogger(Logger):
     def log(self, msg, *args, **kwargs):
@@ -30,3 +37,6 @@ class MuteLogger(Logger):
 
     def error(self, msg, *args, **kwargs):
         pass
+
+    def is_debug_enabled(self):
+        return False
@@ -12,6 +12,6 @@ from .pagination import Pagination
 from .project import Project
 from .secret import Secret
 from .storage_provider import StorageProvider
-from .tag import Tag
+from .tag import Tag, TagsUpdateResult
 from .vm_type import VmType, VmTypeGpuModel
 from .workflows import Workflow, WorkflowRun, WorkflowSpec
@@ -36,6 +36,12 @@ class DatasetVersionPreSignedS3Call(object):
 class DatasetVersionPreSignedURL(object):
     """
     Dataset version pre-signed URL class
+
+    For createMultipartUpload and completeMultipartUpload calls url holds the result of the call.
+    headers are signed headers that have to be sent with the request, e.g. of copyObject.
+    body is the body that has to be sent with the request, e.g. of deleteObjects
     """
     url = attr.ib(type=str, default=None)
     expires_in = attr.ib(type=int, default=None)
+    headers = attr.ib(type=dict, factory=dict)
+    body = attr.ib(type=str, default=None)
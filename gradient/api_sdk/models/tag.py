@@ -8,3 +8,18 @@ class Tag(object):
     id = attr.ib(type=str, default=None)
     name = attr.ib(type=str, default=None)
     created = attr.ib(type=datetime.datetime, default=None)
+
+
+@attr.s
+class TagsUpdateResult(object):
+    """
+    Result of updating tags of a single entity in a bulk operation
+    """
+    entity_id = attr.ib(type=str, default=None)
+    tags = attr.ib(type=list, factory=list)
+    changed = attr.ib(type=bool, default=False)
+    error = attr.ib(type=Exception, default=None)
+
+    @property
+    def ok(self):
+        return self.error is None
@@ -14,6 +14,12 @@ from .dataset_tags import (
     DeleteDatasetTag
 )
 from .dataset_versions import (
+    AsyncListDatasetVersions,
+    AsyncCreateDatasetVersion,
+    AsyncDeleteDatasetVersion,
+    AsyncGenerateDatasetVersionPreSignedS3Urls,
+    AsyncGetDatasetVersion,
+    AsyncUpdateDatasetVersion,
     ListDatasetVersions,
     CreateDatasetVersion,
     DeleteDatasetVersion,
@@ -33,6 +39,17 @@ from .gradient_deployments import (
 )
 from .machine_types import ListMachineTypes
 from .machines import (
+    AsyncCheckMachineAvailability,
+    AsyncCreateMachine,
+    AsyncDeleteMachine,
+    AsyncListMachines,
+    AsyncStartMachine,
+    AsyncStopMachine,
+    AsyncRestartMachine,
+    AsyncGetMachine,
+    AsyncUpdateMachine,
+    AsyncGetMachineUtilization,
+    AsyncWaitForState,
     CheckMachineAvailability,
     CreateMachine,
     CreateResource,
@@ -53,6 +70,13 @@ from .models import (
     get_model_usage
 )
 from .notebooks import (
+    AsyncCreateNotebook,
+    AsyncDeleteNotebook,
+    AsyncGetNotebook,
+    AsyncListNotebooks,
+    AsyncStopNotebook,
+    AsyncStartNotebook,
+    AsyncForkNotebook,
     CreateNotebook,
     DeleteNotebook,
     GetNotebook,
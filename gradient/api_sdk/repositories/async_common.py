@@ -0,0 +1,124 @@
+"""Mixins turning repositories into their asyncio counterparts
+
+Async repository is defined by putting a mixin before the regular repository, e.g.::
+
+    class AsyncGetNotebook(AsyncGetResourceMixin, GetNotebook):
+        pass
+
+so urls, request parameters, serializers and response parsing of the regular repository are reused as they are.
+Only the methods sending requests are replaced with coroutines. ``_send_request`` overrides of the regular
+repositories work unchanged since they return whatever the API client returns - a coroutine in this case.
+"""
+from .. import tracing
+from ..clients import http_client
+from ..clients.async_http_client import AsyncAPI
+
+
+class AsyncRepositoryMixin(object):
+    def __init__(self, *args, session_pool=None, **kwargs):
+        """
+        :param AsyncSessionPool session_pool: pool of aiohttp sessions used by the repository
+        """
+        super(AsyncRepositoryMixin, self).__init__(*args, **kwargs)
+        self.session_pool = session_pool
+
+    def _build_client(self, api_url):
+        """
+        :rtype: AsyncAPI
+        """
+        client = AsyncAPI(
+            api_url=api_url,
+            api_key=self.api_key,
+            logger=self.logger,
+            ps_client_name=self.ps_client_name,
+            retry_policy=self.retry_policy,
+            session_pool=self.session_pool,
+        )
+        return client
+
+    async def _get(self, **kwargs):
+        with tracing.tracer.span("repository.get", repository=type(self).__name__):
+            json_ = self._get_request_json(kwargs)
+            params = self._get_request_params(kwargs)
+            url = self.get_request_url(**kwargs)
+            client = self._get_client(**kwargs)
+            response = await self._send_request(client, url, json=json_, params=params)
+            gradient_response = http_client.GradientResponse.interpret_response(response)
+
+        return gradient_response
+
+
+class AsyncListResourcesMixin(AsyncRepositoryMixin):
+    async def list(self, **kwargs):
+        response = await self._get(**kwargs)
+        self._validate_response(response)
+        instances = self._get_instances(response, **kwargs)
+        if kwargs.get("get_meta"):
+            meta_data = self._get_meta_data(response)
+            return instances, meta_data
+        return instances
+
+
+class AsyncGetResourceMixin(AsyncRepositoryMixin):
+    async def get(self, **kwargs):
+        response = await self._get(**kwargs)
+        self._validate_response(response)
+        instance = self._get_instance(response, **kwargs)
+        return instance
+
+
+class AsyncCreateResourceMixin(AsyncRepositoryMixin):
+    async def create(self, instance, data=None, path=None):
+        instance_dict = self._get_instance_dict(instance)
+        response = await self._send_create_request(instance_dict, data=data, path=path)
+        self._validate_response(response)
+        self._clear_cache(self.get_request_url(**instance_dict), **instance_dict)
+        handle = self._process_response(response)
+        return handle
+
+    async def _send_create_request(self, instance_dict, data=None, path=None):
+        with tracing.tracer.span("repository.send", repository=type(self).__name__):
+            url = self.get_request_url(**instance_dict)
+            client = self._get_client(**instance_dict)
+            json_ = self._get_request_json(instance_dict)
+            params = self._get_request_params(instance_dict)
+            files = self._get_request_files(path)
+            response = await client.post(url, params=params, json=json_, data=data, files=files)
+            gradient_response = http_client.GradientResponse.interpret_response(response)
+        return gradient_response
+
+
+class AsyncAlterResourceMixin(AsyncRepositoryMixin):
+    async def update(self, id, instance):
+        instance_dict = self._get_instance_dict(instance)
+        await self._run(id=id, **instance_dict)
+
+    async def _run(self, **kwargs):
+        url = self.get_request_url(**kwargs)
+        response = await self._send(url, **kwargs)
+        self._validate_response(response)
+        self._clear_cache(url, **kwargs)
+        return response
+
+    async def _send(self, url, **kwargs):
+        with tracing.tracer.span("repository.send", repository=type(self).__name__):
+            client = self._get_client(**kwargs)
+            json_data = self._get_request_json(kwargs)
+            response = await self._send_request(client, url, json_data=json_data)
+            gradient_response = http_client.GradientResponse.interpret_response(response)
+        return gradient_response
+
+
+class AsyncDeleteResourceMixin(AsyncAlterResourceMixin):
+    async def delete(self, id_, **kwargs):
+        await self._run(id=id_, **kwargs)
+
+
+class AsyncStartResourceMixin(AsyncAlterResourceMixin):
+    async def start(self, id_):
+        await self._run(id=id_)
+
+
+class AsyncStopResourceMixin(AsyncAlterResourceMixin):
+    async def stop(self, id_):
+        await self._run(id=id_)
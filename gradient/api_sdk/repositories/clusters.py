@@ -34,6 +34,7 @@ class ValidateClusterRepository(GetResource):
 
 class ListClusters(ListResources):
     SERIALIZER_CLS = ClusterSchema
+    CACHE_TTL = 600
 
     def get_request_url(self, **kwargs):
         return "/clusters/getClusters"
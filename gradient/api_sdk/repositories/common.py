@@ -1,13 +1,15 @@
 import abc
 import collections
+import contextlib
 import datetime
 import json
+import re
 
 import dateutil
 import six
 import websocket
 
-from .. import serializers, sdk_exceptions
+from .. import json_stream, response_cache, serializers, sdk_exceptions, tracing
 from ..clients import http_client
 from ..config import config
 from ..sdk_exceptions import ResourceFetchingError, ResourceCreatingDataError, ResourceCreatingError, GradientSdkError
@@ -17,11 +19,16 @@ from ..utils import MessageExtractor, concatenate_urls
 @six.add_metaclass(abc.ABCMeta)
 class BaseRepository(object):
     VALIDATION_ERROR_MESSAGE = "Failed to fetch data"
+    MAX_CACHED_CLIENTS = 32
+    # seconds for which successful GET responses can be reused from the on-disk cache. None disables caching
+    CACHE_TTL = None
 
-    def __init__(self, api_key, logger, ps_client_name=None):
+    def __init__(self, api_key, logger, ps_client_name=None, retry_policy=None):
         self.api_key = api_key
         self.logger = logger
         self.ps_client_name = ps_client_name
+        self.retry_policy = retry_policy
+        self._clients = {}
 
     @abc.abstractmethod
     def get_request_url(self, **kwargs):
@@ -40,25 +47,48 @@ class BaseRepository(object):
         pass
 
     def _get_client(self, **kwargs):
-        """
+        """Get API client for the url, reusing the one built for previous requests
+
         :rtype: http_client.API
         """
         api_url = self._get_api_url(**kwargs)
+        key = (api_url, self.api_key, self.ps_client_name, self.logger, self.retry_policy)
+        client = self._clients.get(key)
+        if client is None:
+            # some api urls, e.g. of metrics, depend on the instance so the cache can't grow forever
+            if len(self._clients) >= self.MAX_CACHED_CLIENTS:
+                self._clients.clear()
+
+            client = self._build_client(api_url)
+            self._clients[key] = client
+
+        return client
+
+    def _build_client(self, api_url):
+        """
+        :rtype: http_client.API
+        """
         client = http_client.API(
             api_url=api_url,
             api_key=self.api_key,
             logger=self.logger,
             ps_client_name=self.ps_client_name,
+            retry_policy=self.retry_policy,
         )
         return client
 
     def _get(self, **kwargs):
-        json_ = self._get_request_json(kwargs)
-        params = self._get_request_params(kwargs)
-        url = self.get_request_url(**kwargs)
-        client = self._get_client(**kwargs)
-        response = self._send_request(client, url, json=json_, params=params)
-        gradient_response = http_client.GradientResponse.interpret_response(response)
+        with tracing.tracer.span("repository.get", repository=type(self).__name__):
+            json_ = self._get_request_json(kwargs)
+            params = self._get_request_params(kwargs)
+            url = self.get_request_url(**kwargs)
+            client = self._get_client(**kwargs)
+            cache = response_cache.get_response_cache() if self.CACHE_TTL else None
+            if cache is not None:
+                response = self._send_cached_request(cache, client, url, json=json_, params=params)
+            else:
+                response = self._send_request(client, url, json=json_, params=params)
+            gradient_response = http_client.GradientResponse.interpret_response(response)
 
         return gradient_response
 
@@ -66,6 +96,39 @@ class BaseRepository(object):
         response = client.get(url, json=json, params=params)
         return response
 
+    def _send_cached_request(self, cache, client, url, json=None, params=None):
+        """Reuse fresh cached response or revalidate stale one with If-None-Match
+
+        :param response_cache.ResponseCache cache:
+        """
+        path = client.get_path(url)
+        entry = cache.get(self.api_key, path, params=params, json_=json)
+        if entry is not None and entry.is_fresh(self.CACHE_TTL):
+            self.logger.debug("Using cached response for {}".format(path))
+            return entry.response
+
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else None
+        response = client.get(url, json=json, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.revalidate(entry)
+            return entry.response
+
+        if response.ok:
+            cache.set(self.api_key, path, response, params=params, json_=json)
+
+        return response
+
+    def _clear_cache(self, url, **kwargs):
+        """Drop responses cached for the resource changed by a request to url so nothing stale is read afterwards
+
+        Requests getting and changing a resource share the first segment of their paths (e.g. /mlModels/getModelList/
+        and /mlModels/deleteModel/), so responses of every path starting with it are dropped
+        """
+        cache = response_cache.get_response_cache()
+        if cache is not None:
+            resource = "/" + re.split(r"[/?]", url.lstrip("/"), 1)[0]
+            cache.clear(self.api_key, prefix=concatenate_urls(self._get_api_url(**kwargs), resource))
+
     def _validate_response(self, response):
         if not response.ok:
             msg = self.VALIDATION_ERROR_MESSAGE
@@ -84,6 +147,11 @@ class BaseRepository(object):
 @six.add_metaclass(abc.ABCMeta)
 class ListResources(BaseRepository):
     SERIALIZER_CLS = None
+    # iter() decodes the response incrementally only if the repository can parse items one by one
+    STREAMING_SUPPORTED = False
+    # key of the list of items in the response object. None if the response is the list itself
+    STREAMED_ITEMS_KEY = None
+    STREAM_CHUNK_SIZE = 64 * 1024
 
     def _parse_objects(self, data, **kwargs):
         instances = []
@@ -125,6 +193,41 @@ class ListResources(BaseRepository):
         objects = self._parse_objects(response.data, **kwargs)
         return objects
 
+    def iter(self, **kwargs):
+        """Yield instances as the response is received and decoded, without holding the whole list in memory
+
+        :returns: generator of model instances
+        """
+        if not self.STREAMING_SUPPORTED:
+            for instance in self.list(**kwargs):
+                yield instance
+            return
+
+        response = self._get_stream(**kwargs)
+        with contextlib.closing(response):
+            if not response.ok:
+                gradient_response = http_client.GradientResponse.interpret_response(response)
+                self._validate_response(gradient_response)
+
+            chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+            try:
+                for instance_dict in json_stream.iter_json_items(chunks, self.STREAMED_ITEMS_KEY):
+                    yield self._parse_streamed_object(instance_dict)
+            except ValueError as e:
+                raise ResourceFetchingError("Error parsing response data: {}".format(e))
+
+    def _get_stream(self, **kwargs):
+        with tracing.tracer.span("repository.get", repository=type(self).__name__, stream=True):
+            json_ = self._get_request_json(kwargs)
+            params = self._get_request_params(kwargs)
+            url = self.get_request_url(**kwargs)
+            client = self._get_client(**kwargs)
+            response = client.get(url, json=json_, params=params, stream=True)
+        return response
+
+    def _parse_streamed_object(self, instance_dict):
+        return self._parse_object(instance_dict)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class GetResource(BaseRepository):
@@ -166,6 +269,7 @@ class CreateResource(BaseRepository):
         instance_dict = self._get_instance_dict(instance)
         response = self._send_create_request(instance_dict, data=data, path=path)
         self._validate_response(response)
+        self._clear_cache(self.get_request_url(**instance_dict), **instance_dict)
         handle = self._process_response(response)
         return handle
 
@@ -184,13 +288,14 @@ class CreateResource(BaseRepository):
         return serializer
 
     def _send_create_request(self, instance_dict, data=None, path=None):
-        url = self.get_request_url(**instance_dict)
-        client = self._get_client(**instance_dict)
-        json_ = self._get_request_json(instance_dict)
-        params = self._get_request_params(instance_dict)
-        files = self._get_request_files(path)
-        response = client.post(url, params=params, json=json_, data=data, files=files)
-        gradient_response = http_client.GradientResponse.interpret_response(response)
+        with tracing.tracer.span("repository.send", repository=type(self).__name__):
+            url = self.get_request_url(**instance_dict)
+            client = self._get_client(**instance_dict)
+            json_ = self._get_request_json(instance_dict)
+            params = self._get_request_params(instance_dict)
+            files = self._get_request_files(path)
+            response = client.post(url, params=params, json=json_, data=data, files=files)
+            gradient_response = http_client.GradientResponse.interpret_response(response)
         return gradient_response
 
     def _process_response(self, response):
@@ -235,13 +340,15 @@ class AlterResource(BaseRepository):
         url = self.get_request_url(**kwargs)
         response = self._send(url, **kwargs)
         self._validate_response(response)
+        self._clear_cache(url, **kwargs)
         return response
 
     def _send(self, url, **kwargs):
-        client = self._get_client(**kwargs)
-        json_data = self._get_request_json(kwargs)
-        response = self._send_request(client, url, json_data=json_data)
-        gradient_response = http_client.GradientResponse.interpret_response(response)
+        with tracing.tracer.span("repository.send", repository=type(self).__name__):
+            client = self._get_client(**kwargs)
+            json_data = self._get_request_json(kwargs)
+            response = self._send_request(client, url, json_data=json_data)
+            gradient_response = http_client.GradientResponse.interpret_response(response)
         return gradient_response
 
     def _send_request(self, client, url, json_data=None):
@@ -1,7 +1,12 @@
+from .async_common import AsyncAlterResourceMixin, AsyncCreateResourceMixin, AsyncDeleteResourceMixin, \
+    AsyncGetResourceMixin, AsyncListResourcesMixin, AsyncRepositoryMixin
 from .common import BaseRepository, AlterResource, CreateResource, DeleteResource, GetResource, ListResources
 from .datasets import DatasetMixin
 from .. import serializers
 
+# calls the API runs itself instead of presigning them, so sending them again repeats what they did
+SERVER_SIDE_S3_METHODS = frozenset(("createMultipartUpload", "completeMultipartUpload"))
+
 
 class DatasetVersionMixin(DatasetMixin):
     SERIALIZER_CLS = serializers.DatasetVersionSchema
@@ -68,4 +73,35 @@ class GenerateDatasetVersionPreSignedS3Urls(DatasetVersionMixin, BaseRepository)
         return {'calls': kwargs['calls']}
 
     def _send_request(self, client, url, json=None, params=None):
-        return client.post(url, json=json, params=params)
+        # generating pre-signed URLs doesn't change anything so it's safe to retry,
+        # but a retried createMultipartUpload opens another upload and a retried completeMultipartUpload fails
+        # the repository is shared by threads, so this is worked out from the request only
+        idempotent = not any(call.get('method') in SERVER_SIDE_S3_METHODS for call in json['calls'])
+        return client.post(url, json=json, params=params, idempotent=idempotent)
+
+
+class AsyncListDatasetVersions(AsyncListResourcesMixin, ListDatasetVersions):
+    pass
+
+
+class AsyncCreateDatasetVersion(AsyncCreateResourceMixin, CreateDatasetVersion):
+    pass
+
+
+class AsyncGetDatasetVersion(AsyncGetResourceMixin, GetDatasetVersion):
+    pass
+
+
+class AsyncUpdateDatasetVersion(AsyncAlterResourceMixin, UpdateDatasetVersion):
+    pass
+
+
+class AsyncDeleteDatasetVersion(AsyncDeleteResourceMixin, DeleteDatasetVersion):
+    pass
+
+
+class AsyncGenerateDatasetVersionPreSignedS3Urls(AsyncRepositoryMixin, GenerateDatasetVersionPreSignedS3Urls):
+    async def generate(self, id, calls):
+        response = await self._get(id=id, calls=calls)
+        self._validate_response(response)
+        return serializers.DatasetVersionPreSignedURLSchema().get_instance(response.data, many=True)
@@ -33,7 +33,7 @@ class CreateDataset(DatasetMixin, CreateResource):
 
 
 class GetDataset(DatasetMixin, GetResource):
-    pass
+    CACHE_TTL = 300
 
 
 class UpdateDataset(DatasetMixin, AlterResource):
@@ -50,6 +50,8 @@ class DeleteDataset(DatasetMixin, DeleteResource):
 
 class GetDatasetRef(DatasetMixin, GetResource):
     SERIALIZER_CLS = serializers.DatasetRefSchema
+    # refs like "latest" move with every committed version, so they're revalidated often
+    CACHE_TTL = 30
 
     @staticmethod
     def get_request_url(**kwargs):
@@ -6,6 +6,7 @@ from ..repositories.common import ListResources
 
 class ListMachineTypes(ListResources):
     SERIALIZER_CLS = serializers.VmTypeSchema
+    CACHE_TTL = 3600
 
     def get_request_url(self, **kwargs):
         return "vmTypes/getVmTypesByClusters"
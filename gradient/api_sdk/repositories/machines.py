@@ -1,5 +1,9 @@
+import asyncio
 import time
 
+from .async_common import AsyncAlterResourceMixin, AsyncCreateResourceMixin, AsyncDeleteResourceMixin, \
+    AsyncGetResourceMixin, AsyncListResourcesMixin, AsyncRepositoryMixin, AsyncStartResourceMixin, \
+    AsyncStopResourceMixin
 from .common import BaseRepository, CreateResource, DeleteResource, ListResources, StartResource, StopResource, \
     GetResource, AlterResource
 from .. import serializers, models
@@ -53,6 +57,9 @@ class DeleteMachine(MachinesApiUrlMixin, DeleteResource):
 
 
 class ListMachines(MachinesApiUrlMixin, ListResources):
+    SERIALIZER_CLS = serializers.MachineSchema
+    STREAMING_SUPPORTED = True
+
     def _parse_objects(self, data, **kwargs):
         instances = []
 
@@ -170,10 +177,11 @@ class GetMachineUtilization(MachinesApiUrlMixin, GetResource):
 
 
 class WaitForState(object):
-    def __init__(self, api_key, logger, ps_client_name=None):
+    def __init__(self, api_key, logger, ps_client_name=None, retry_policy=None):
         self.api_key = api_key
         self.logger = logger
-        self.get_machine_repository = GetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name)
+        self.get_machine_repository = GetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name,
+                                                 retry_policy=retry_policy)
 
     def wait_for_state(self, machine_id, state, interval=5):
 
@@ -187,3 +195,66 @@ class WaitForState(object):
     def _get_machine_state(self, machine_id):
         machine = self.get_machine_repository.get(id=machine_id)
         return machine.state
+
+
+class AsyncCheckMachineAvailability(AsyncRepositoryMixin, CheckMachineAvailability):
+    async def get(self, machine_type, region):
+        kwargs = {"machineType": machine_type,
+                  "region": region}
+        response = await self._get(**kwargs)
+        self._validate_response(response)
+        is_available = response.data["available"]
+        return is_available
+
+
+class AsyncCreateMachine(AsyncCreateResourceMixin, CreateMachine):
+    pass
+
+
+class AsyncDeleteMachine(AsyncDeleteResourceMixin, DeleteMachine):
+    pass
+
+
+class AsyncListMachines(AsyncListResourcesMixin, ListMachines):
+    pass
+
+
+class AsyncRestartMachine(AsyncStartResourceMixin, RestartMachine):
+    async def restart(self, id_, **kwargs):
+        await self._run(id=id_, **kwargs)
+
+
+class AsyncStartMachine(AsyncStartResourceMixin, StartMachine):
+    pass
+
+
+class AsyncStopMachine(AsyncStopResourceMixin, StopMachine):
+    pass
+
+
+class AsyncGetMachine(AsyncGetResourceMixin, GetMachine):
+    pass
+
+
+class AsyncUpdateMachine(AsyncAlterResourceMixin, UpdateMachine):
+    pass
+
+
+class AsyncGetMachineUtilization(AsyncGetResourceMixin, GetMachineUtilization):
+    pass
+
+
+class AsyncWaitForState(object):
+    def __init__(self, api_key, logger, ps_client_name=None, retry_policy=None, session_pool=None):
+        self.api_key = api_key
+        self.logger = logger
+        self.get_machine_repository = AsyncGetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name,
+                                                      retry_policy=retry_policy, session_pool=session_pool)
+
+    async def wait_for_state(self, machine_id, state, interval=5):
+        while True:
+            machine = await self.get_machine_repository.get(id=machine_id)
+            if machine.state == state:
+                return
+
+            await asyncio.sleep(interval)
@@ -22,6 +22,9 @@ class GetBaseModelsApiUrlMixin(object):
 
 
 class ListModels(GetBaseModelsApiUrlMixin, ParseModelDictMixin, ListResources):
+    STREAMING_SUPPORTED = True
+    STREAMED_ITEMS_KEY = "modelList"
+
     def get_request_url(self, **kwargs):
         return "/mlModels/getModelList/"
 
@@ -99,13 +102,13 @@ class UploadModel(GetBaseModelsApiUrlMixin, CreateResource):
 
     def _upload_model(self, file_path, model_id, cluster_id=None):
         model_uploader = s3_uploader.S3ModelUploader(
-            self.api_key, logger=self.logger, ps_client_name=self.ps_client_name
+            self.api_key, logger=self.logger, ps_client_name=self.ps_client_name, retry_policy=self.retry_policy,
         )
         model_uploader.upload(file_path, model_id, cluster_id=cluster_id)
 
     def _delete_model(self, model_id):
         repository = DeleteModel(
-            self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+            self.api_key, logger=self.logger, ps_client_name=self.ps_client_name, retry_policy=self.retry_policy)
         repository.delete(model_id)
 
 
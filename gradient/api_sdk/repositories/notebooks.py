@@ -2,6 +2,8 @@ import json
 
 from ..clients import http_client
 from ..sdk_exceptions import ResourceCreatingError
+from .async_common import AsyncCreateResourceMixin, AsyncDeleteResourceMixin, AsyncGetResourceMixin, \
+    AsyncListResourcesMixin, AsyncRepositoryMixin, AsyncStopResourceMixin
 from .common import CreateResource, DeleteResource, ListResources, GetResource, \
     StopResource, GetMetrics, ListMetrics, StreamMetrics, BaseRepository, ListLogs
 from .. import config
@@ -112,6 +114,9 @@ class StopNotebook(GetNotebookApiUrlMixin, StopResource):
 
 
 class ListNotebooks(GetNotebookApiUrlMixin, ListResources):
+    STREAMING_SUPPORTED = True
+    STREAMED_ITEMS_KEY = "notebookList"
+
     def get_request_url(self, **kwargs):
         return "notebooks/getNotebooks"
 
@@ -135,6 +140,10 @@ class ListNotebooks(GetNotebookApiUrlMixin, ListResources):
         notebooks = serializer.get_instance(notebook_dicts, many=True)
         return notebooks
 
+    def _parse_streamed_object(self, notebook_dict):
+        notebook_dict["id"] = notebook_dict["handle"]
+        return serializers.NotebookSchema().get_instance(notebook_dict)
+
     def _get_request_params(self, kwargs):
         filters = {
             "filter": {
@@ -151,7 +160,7 @@ class ListNotebooks(GetNotebookApiUrlMixin, ListResources):
         filter_string = json.dumps(filters)
         params["filter"] = filter_string
 
-        tags = kwargs.get("tags", [])
+        tags = kwargs.get("tags") or []
         for i, tag in enumerate(tags):
             key = "tagFilter[{}]".format(i)
             params[key] = tag
@@ -234,3 +243,43 @@ class ListNotebookLogs(ListLogs):
             "limit": kwargs["limit"]
         }
         return params
+
+
+class AsyncCreateNotebook(AsyncCreateResourceMixin, CreateNotebook):
+    pass
+
+
+class AsyncStartNotebook(AsyncCreateResourceMixin, StartNotebook):
+    pass
+
+
+class AsyncForkNotebook(AsyncRepositoryMixin, ForkNotebook):
+    async def fork(self, id_, project_id):
+        instance = {"notebookId": id_, "projectId": project_id}
+        handle = await self._send_request(instance)
+        return handle
+
+    async def _send_request(self, data):
+        url = self.get_request_url()
+        client = self._get_client()
+        response = await client.post(url, json=data)
+        gradient_response = http_client.GradientResponse.interpret_response(response)
+        self._validate_response(gradient_response)
+        handle = self._process_response(gradient_response)
+        return handle
+
+
+class AsyncDeleteNotebook(AsyncDeleteResourceMixin, DeleteNotebook):
+    pass
+
+
+class AsyncGetNotebook(AsyncGetResourceMixin, GetNotebook):
+    pass
+
+
+class AsyncStopNotebook(AsyncStopResourceMixin, StopNotebook):
+    pass
+
+
+class AsyncListNotebooks(AsyncListResourcesMixin, ListNotebooks):
+    pass
@@ -18,6 +18,8 @@ class StorageProviderMixin(object):
 
 
 class ListStorageProviders(StorageProviderMixin, ListResources):
+    CACHE_TTL = 300
+
     def _get_request_params(self, kwargs):
         limit = kwargs.get("limit") or 20
         offset = kwargs.get("offset") or 0
@@ -33,7 +35,7 @@ class CreateStorageProvider(StorageProviderMixin, CreateResource):
 
 
 class GetStorageProvider(StorageProviderMixin, GetResource):
-    pass
+    CACHE_TTL = 300
 
 
 class UpdateStorageProvider(StorageProviderMixin, AlterResource):
@@ -0,0 +1,221 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from .config import config
+
+
+class CachedResponse(object):
+    def __init__(self, status_code, headers, content, url):
+        """Response read from the cache with the interface of requests.Response used by the SDK
+
+        :param int status_code:
+        :param dict headers:
+        :param bytes content:
+        :param str url:
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.request = None
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    def json(self):
+        return json.loads(self.content.decode("utf-8"))
+
+
+class CacheEntry(object):
+    def __init__(self, path, response, etag, stored_at):
+        """
+        :param str path: path to the file of the entry
+        :param CachedResponse response:
+        :param str|None etag:
+        :param float stored_at: timestamp of the last (re)validation
+        """
+        self.path = path
+        self.response = response
+        self.etag = etag
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl):
+        return time.time() - self.stored_at < ttl
+
+
+class ResponseCache(object):
+    def __init__(self, path, max_size=None):
+        """On-disk cache of GET responses with size-bounded LRU eviction
+
+        Every API key gets its own directory so responses are never shared between accounts.
+        Entries are files named after a hash of the request. Modification time of a file is its last use.
+
+        :param str path: cache directory
+        :param int max_size: max size of all cached responses in bytes
+        """
+        self.path = path
+        self.max_size = max_size or config.HTTP_CACHE_MAX_SIZE
+
+    def get(self, api_key, url, params=None, json_=None):
+        """
+        :rtype: CacheEntry|None
+        """
+        entry_path = self._get_entry_path(api_key, url, params, json_)
+        try:
+            with open(entry_path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        self._touch(entry_path)
+        response = CachedResponse(
+            status_code=data["status_code"],
+            headers=data["headers"],
+            content=base64.b64decode(data["content"]),
+            url=url,
+        )
+        return CacheEntry(entry_path, response, data.get("etag"), data["stored_at"])
+
+    def set(self, api_key, url, response, params=None, json_=None):
+        """Store successful response
+
+        :param requests.Response response:
+        """
+        headers = response.headers or {}
+        data = {
+            "status_code": response.status_code,
+            "headers": {"Content-Type": headers.get("Content-Type")},
+            "content": base64.b64encode(response.content or b"").decode("ascii"),
+            "etag": headers.get("ETag"),
+            "stored_at": time.time(),
+            "url": url,
+        }
+        entry_path = self._get_entry_path(api_key, url, params, json_)
+        self._write(entry_path, data)
+        self.evict()
+
+    def revalidate(self, entry):
+        """Mark entry as fresh after server confirmed it didn't change
+
+        :param CacheEntry entry:
+        """
+        with open(entry.path) as f:
+            data = json.load(f)
+
+        data["stored_at"] = time.time()
+        self._write(entry.path, data)
+
+    def clear(self, api_key=None, prefix=None):
+        """Remove responses cached for the API key, or all of them
+
+        :param str prefix: remove only responses of URLs starting with it
+        """
+        for entry_path, _, _ in self._list_entries(api_key):
+            url = self._get_url(entry_path) if prefix is not None else None
+            if url is None or url.startswith(prefix):
+                self._remove(entry_path)
+
+    def evict(self):
+        """Remove least recently used responses until cache fits in max size"""
+        entries = sorted(self._list_entries(), key=lambda entry: entry[1])
+        total_size = sum(size for _, _, size in entries)
+        for entry_path, _, size in entries:
+            if total_size <= self.max_size:
+                break
+
+            self._remove(entry_path)
+            total_size -= size
+
+    def _get_entry_path(self, api_key, url, params, json_):
+        request_key = json.dumps([url, params, json_], sort_keys=True, default=str)
+        file_name = hashlib.sha256(request_key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self._get_key_dir(api_key), file_name)
+
+    def _get_key_dir(self, api_key):
+        key_hash = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.path, key_hash)
+
+    def _list_entries(self, api_key=None):
+        """
+        :returns: (path, last use, size) of every entry
+        :rtype: list[tuple[str,float,int]]
+        """
+        dirs = [self._get_key_dir(api_key)] if api_key is not None else self._list_key_dirs()
+        entries = []
+        for dir_path in dirs:
+            try:
+                file_names = os.listdir(dir_path)
+            except OSError:
+                continue
+
+            for file_name in file_names:
+                entry_path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(entry_path)
+                except OSError:
+                    continue
+
+                entries.append((entry_path, stat.st_mtime, stat.st_size))
+
+        return entries
+
+    def _list_key_dirs(self):
+        try:
+            return [os.path.join(self.path, name) for name in os.listdir(self.path)]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _get_url(entry_path):
+        """Get URL of the entry. Entries that can't be read or were stored without it match every prefix"""
+        try:
+            with open(entry_path) as f:
+                return json.load(f).get("url")
+        except (IOError, OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(entry_path, data):
+        dir_path = os.path.dirname(entry_path)
+        if not os.path.exists(dir_path):
+            os.makedirs(dir_path, mode=0o700)
+
+        # write to a temporary file first so concurrent CLI invocations never read partially written entries
+        fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            ResponseCache._remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _touch(entry_path):
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(entry_path):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+
+def get_response_cache():
+    """Get response cache if caching was enabled with PAPERSPACE_HTTP_CACHE
+
+    :rtype: ResponseCache|None
+    """
+    if not config.HTTP_CACHE:
+        return None
+
+    return ResponseCache(os.path.join(config.CONFIG_DIR_PATH, "cache"))
@@ -0,0 +1,248 @@
+import asyncio
+import datetime
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+from .config import config
+from .logger import MuteLogger
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+RETRY_AFTER_STATUS_CODES = frozenset((429, 503))
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class RetryBudget(object):
+    def __init__(self, ratio=0.2, min_retries=10, max_tokens=100):
+        """Limits number of retries to a fraction of sent requests
+
+        Every request adds ``ratio`` of a token to the budget and every retry takes one token,
+        so a client can't flood an API that is failing anyway with retries.
+
+        :param float ratio: fraction of requests that can be retried
+        :param int min_retries: number of retries available before any request was sent
+        :param int max_tokens: max number of retries that can be saved up
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_retries)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self):
+        """
+        :returns: True if there was a token left for a retry
+        :rtype: bool
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self):
+        with self._lock:
+            return self._tokens
+
+
+class RetryPolicy(object):
+    def __init__(self, max_retries=None, backoff_factor=0.5, max_backoff=30, max_retry_after=120,
+                 methods=IDEMPOTENT_METHODS, status_codes=RETRY_STATUS_CODES, budget=None, logger=None,
+                 sleep=time.sleep, async_sleep=asyncio.sleep):
+        """Retry policy with exponential backoff and jitter
+
+        :param int max_retries: max number of retries of a single request
+        :param float backoff_factor: base of the exponential backoff in seconds
+        :param float max_backoff: max backoff in seconds
+        :param float max_retry_after: longest Retry-After in seconds the policy is willing to wait for
+        :param frozenset[str] methods: HTTP methods retried by default
+        :param frozenset[int] status_codes: response status codes that are retried
+        :param RetryBudget budget: retry budget shared by all requests using this policy
+        :param Logger logger:
+        :param callable sleep:
+        :param callable async_sleep: coroutine function used by call_async
+        """
+        self.max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.methods = methods
+        self.status_codes = status_codes
+        self.budget = budget or RetryBudget()
+        self.logger = logger or MuteLogger()
+        self.sleep = sleep
+        self.async_sleep = async_sleep
+
+    def call(self, method, send, *args, idempotent=None, **kwargs):
+        """Call ``send(*args, **kwargs)`` retrying it when the request failed with a transient error
+
+        :param str method: HTTP method of the request
+        :param callable send: function sending the request and returning a response
+        :param bool|None idempotent: override for requests that are (not) safe to send again,
+            method of the request decides by default
+        :returns: response returned by the last call of ``send``
+        """
+        retryable = self.is_retryable_method(method, idempotent)
+        self.budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                response = send(*args, **kwargs)
+            except Exception as e:
+                delay = self._get_exception_delay(e, attempt, retryable)
+                if delay is None:
+                    raise
+
+                self.logger.debug("{} request failed with {}. Retrying in {:.2f}s".format(method, repr(e), delay))
+            else:
+                delay = self._get_response_delay(response, attempt, retryable)
+                if delay is None:
+                    return response
+
+                self.logger.debug("{} request failed with status code {}. Retrying in {:.2f}s"
+                                  .format(method, response.status_code, delay))
+                # connection of a streamed response goes back to the pool only once it's closed
+                response.close()
+
+            self.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, method, send, *args, idempotent=None, **kwargs):
+        """Await ``send(*args, **kwargs)`` retrying it when the request failed with a transient error
+
+        Same as ``call`` but for coroutine functions. Waits between retries without blocking the event loop
+        """
+        retryable = self.is_retryable_method(method, idempotent)
+        self.budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                response = await send(*args, **kwargs)
+            except Exception as e:
+                delay = self._get_exception_delay(e, attempt, retryable)
+                if delay is None:
+                    raise
+
+                self.logger.debug("{} request failed with {}. Retrying in {:.2f}s".format(method, repr(e), delay))
+            else:
+                delay = self._get_response_delay(response, attempt, retryable)
+                if delay is None:
+                    return response
+
+                self.logger.debug("{} request failed with status code {}. Retrying in {:.2f}s"
+                                  .format(method, response.status_code, delay))
+                response.release()
+
+            await self.async_sleep(delay)
+            attempt += 1
+
+    def copy(self, **kwargs):
+        """Get policy with some of the settings changed. The copy shares retry budget with this policy
+
+        :rtype: RetryPolicy
+        """
+        settings = dict(
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            max_backoff=self.max_backoff,
+            max_retry_after=self.max_retry_after,
+            methods=self.methods,
+            status_codes=self.status_codes,
+            budget=self.budget,
+            logger=self.logger,
+            sleep=self.sleep,
+            async_sleep=self.async_sleep,
+        )
+        settings.update(kwargs)
+        return RetryPolicy(**settings)
+
+    def is_retryable_method(self, method, idempotent=None):
+        if idempotent is not None:
+            return idempotent
+
+        return method.upper() in self.methods
+
+    def is_retryable_exception(self, exception):
+        if isinstance(exception, RETRY_EXCEPTIONS):
+            return True
+
+        # exceptions raised by other transports, e.g. gql's TransportServerError, carry the status code
+        return getattr(exception, "code", None) in self.status_codes
+
+    def get_backoff(self, attempt):
+        """Exponential backoff with full jitter
+
+        :param int attempt: number of the retry, counting from 0
+        :rtype: float
+        """
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, backoff)
+
+    @staticmethod
+    def get_retry_after(response):
+        """Get number of seconds from the Retry-After header of the response
+
+        :rtype: float|None
+        """
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max((retry_at - now).total_seconds(), 0)
+
+    def _can_retry(self, attempt, retryable):
+        return retryable and attempt < self.max_retries and self.budget.withdraw()
+
+    def _get_exception_delay(self, exception, attempt, retryable):
+        if not self.is_retryable_exception(exception) or not self._can_retry(attempt, retryable):
+            return None
+
+        return self.get_backoff(attempt)
+
+    def _get_response_delay(self, response, attempt, retryable):
+        if response.status_code not in self.status_codes:
+            return None
+
+        delay = self.get_backoff(attempt)
+        if response.status_code in RETRY_AFTER_STATUS_CODES:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+
+                delay = retry_after
+
+        if not self._can_retry(attempt, retryable):
+            return None
+
+        return delay
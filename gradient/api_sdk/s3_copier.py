@@ -0,0 +1,442 @@
+import re
+import threading
+from concurrent import futures
+from xml.etree import ElementTree
+
+import requests
+
+from . import sdk_exceptions, tracing
+from .clients import http_client
+from .config import config
+from .retries import IDEMPOTENT_METHODS
+
+S3_XMLNS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+S3_RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+S3_MAX_RETRIES = 5
+S3_MAX_KEYS = 1000  # most keys S3 lists per page
+# deleteObjects, the only POST sent to storage provider, can be retried like the idempotent methods
+S3_RETRY_METHODS = IDEMPOTENT_METHODS | frozenset(('POST',))
+OBJECT_PRESIGN_BATCH_SIZE = 100
+MAX_PART_COUNT = 10000
+MAX_COPY_SIZE = 5 * 1024 ** 3  # 5GiB, larger objects can only be copied in parts
+COPY_PART_SIZE = 512 * 1024 ** 2  # 512MiB, parts of objects too large to be copied in one request
+PART_PRESIGN_BATCH_SIZE = 100
+PUT_TIMEOUT = 300  # 5 minutes
+COPY_CONCURRENCY = 16
+
+
+def normalize_path(path):
+    """Get dataset path starting with a slash and without repeated slashes
+
+    :param str path:
+    :rtype: str
+    """
+    if not path:
+        return '/'
+    path = re.sub(r'/+', '/', path)
+    if not path.startswith('/'):
+        path = '/' + path
+    return path
+
+
+def get_copy_source(source_dataset_version_id, dataset_version_id, key):
+    """Get CopySource param of copyObject and uploadPartCopy copying an object of a version to another one
+
+    :param str source_dataset_version_id: (ex: dataset_id:version)
+    :param str dataset_version_id: version the object is copied to
+    :param str key: key of the source object
+    :rtype: dict
+    """
+    source_dataset_id, _, source_version = source_dataset_version_id.partition(':')
+    copy_source = dict(Version=source_version, Key=key)
+    # objects are copied from the same dataset unless another one is set
+    if source_dataset_id != dataset_version_id.partition(':')[0]:
+        copy_source['Dataset'] = source_dataset_id
+    return copy_source
+
+
+class CopyProgress(object):
+    """Progress of a copy, e.g. gradient.commands.transfer_progress.TransferProgress. This one ignores it"""
+
+    def add_file(self, size=0):
+        pass
+
+    def add_bytes(self, amount):
+        pass
+
+    def file_done(self, failed=False):
+        pass
+
+
+class TaskQueue(object):
+    def __init__(self, executor, limit):
+        """Tasks run by an executor, at most limit of them queued or running at once
+
+        The first task that fails stops the rest. Its exception is raised by put(), check() or join()
+
+        :param futures.Executor executor:
+        :param int limit:
+        """
+        self._executor = executor
+        self._limit = limit
+        self._pending = set()
+
+    def put(self, func, *args):
+        self.check()
+        while len(self._pending) >= self._limit:
+            self._wait(futures.FIRST_COMPLETED)
+        self._pending.add(self._executor.submit(func, *args))
+
+    def check(self):
+        self._wait(futures.FIRST_COMPLETED, timeout=0)
+
+    def join(self):
+        self._wait(futures.ALL_COMPLETED)
+
+    def _wait(self, return_when, timeout=None):
+        done, self._pending = futures.wait(self._pending, timeout=timeout, return_when=return_when)
+        for future in done:
+            if future.exception() is not None:
+                for pending in self._pending:
+                    pending.cancel()
+                raise future.exception()
+
+
+class S3DatasetVersionCopier(object):
+    def __init__(self, client, s3_retry_policy=None, logger=None):
+        """Copies files between dataset versions with pre-signed server-side copy requests,
+        so their content never leaves the storage provider
+
+        :param gradient.api_sdk.clients.DatasetVersionsClient client:
+        :param RetryPolicy s3_retry_policy: policy of requests sent to the storage provider.
+            Retry policy of the client with the status codes S3 asks to retry by default
+        :param gradient.api_sdk.logger.Logger logger: logger of the client by default
+        """
+        self.client = client
+        self.logger = logger or client.logger
+        # S3 asks clients to retry requests that failed with 500 InternalError too
+        self.s3_retry_policy = s3_retry_policy or client.retry_policy.copy(
+            max_retries=S3_MAX_RETRIES,
+            status_codes=S3_RETRY_STATUS_CODES,
+            methods=S3_RETRY_METHODS,
+        )
+
+    def copy(self, source_dataset_version_id, target_dataset_version_id, source_path='/', target_path='/',
+             concurrency=COPY_CONCURRENCY, part_concurrency=None, progress=None):
+        """Copy a file or a directory
+
+        Objects up to MAX_COPY_SIZE are copied with copyObject, larger ones with a multipart upload
+        of uploadPartCopy requests
+
+        :param str source_dataset_version_id: Dataset version ID (ex: dataset_id:version) to copy files from
+        :param str target_dataset_version_id: Dataset version ID to copy files to
+        :param str source_path: file or directory to copy
+        :param str target_path: target directory, or path of the target file if source path is a file
+        :param int concurrency: number of objects copied at once
+        :param int part_concurrency: number of parts of an object larger than MAX_COPY_SIZE copied at once.
+            PAPERSPACE_UPLOAD_PART_CONCURRENCY by default
+        :param CopyProgress progress: counts files and bytes as they are copied
+
+        :returns: number of copied files
+        :rtype: int
+        """
+        source_path = normalize_path(source_path)
+        target_path = normalize_path(target_path)
+        part_concurrency = part_concurrency or config.UPLOAD_PART_CONCURRENCY
+        progress = progress or CopyProgress()
+        count = 0
+
+        with futures.ThreadPoolExecutor(max_workers=concurrency) as executor, requests.Session() as session:
+            tasks = TaskQueue(executor, limit=concurrency * 2)
+            pages = self.iter_objects(source_dataset_version_id, source_path, is_file=not source_path.endswith('/'))
+            for objects in pages:
+                copies = []
+                for obj in objects:
+                    obj = dict(obj, size=int(obj.get('size') or 0),
+                               target_key=self.get_target_key(source_path, target_path, obj['key']))
+                    progress.add_file(obj['size'])
+                    count += 1
+
+                    if obj['size'] > MAX_COPY_SIZE:
+                        tasks.put(self._copy_multipart, session, source_dataset_version_id,
+                                  target_dataset_version_id, obj, part_concurrency, progress)
+                    else:
+                        copies.append(obj)
+
+                for i in range(0, len(copies), OBJECT_PRESIGN_BATCH_SIZE):
+                    self._sign_and_copy(session, source_dataset_version_id, target_dataset_version_id, tasks,
+                                        copies[i:i + OBJECT_PRESIGN_BATCH_SIZE], progress)
+            tasks.join()
+
+        return count
+
+    @staticmethod
+    def get_target_key(source_path, target_path, key):
+        """
+        :param str source_path: normalized dataset path
+        :param str target_path: normalized dataset path
+        :param str key: key of a source object, relative to the root of the dataset version
+        :rtype: str
+        """
+        if '/' + key == source_path:
+            # file is copied into the target directory or to the target path
+            if target_path.endswith('/'):
+                return target_path + key.rpartition('/')[2]
+            return target_path
+
+        source_dir = source_path.strip('/')
+        name = key[len(source_dir) + 1:] if source_dir else key
+        return target_path.rstrip('/') + '/' + name
+
+    def call_s3(self, method, send, *args, **kwargs):
+        """Send request to storage provider with send(*args, **kwargs), retrying it if needed
+
+        :param str method: HTTP method
+        :param callable send: function sending the request and returning the response
+        :rtype: requests.Response
+        """
+        with tracing.tracer.span("s3.request", method=method) as span:
+            response = self.s3_retry_policy.call(method, send, *args, **kwargs)
+            if span.enabled:
+                span.set(status_code=response.status_code)
+                # body of the response may be already consumed, so only Content-Length is used
+                span.add_bytes(sent=http_client.request_recorder.get_bytes_sent(response),
+                               received=http_client.request_recorder.get_bytes_received(response, streamed=True))
+        return response
+
+    def _call_s3_or_fail(self, method, send, *args, **kwargs):
+        try:
+            return self.call_s3(method, send, *args, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            raise sdk_exceptions.S3RequestFailedError('Failed to execute request against storage provider: %s' % e)
+
+    @staticmethod
+    def validate_s3_response(response):
+        if not response.ok:
+            raise sdk_exceptions.S3RequestFailedError(
+                'Failed to execute request against storage provider: %s\n\n%s' % (response.status_code, response.text))
+
+    def get_object(self, dataset_version_id, path):
+        """Get key, size and ETag of an object or None if it doesn't exist
+
+        :param str dataset_version_id:
+        :param str path: dataset path of the object
+        :rtype: dict|None
+        """
+        path = path.lstrip('/')
+
+        if not path:
+            return
+
+        pre_signed = self.client.generate_pre_signed_s3_url(
+            dataset_version_id,
+            method='headObject',
+            params={'Key': path},
+        )
+
+        response = self._call_s3_or_fail('HEAD', requests.head, pre_signed.url)
+        if response.status_code == 404:
+            return
+        self.validate_s3_response(response)
+
+        size = response.headers.get('Content-Length', 0)
+        return {'key': path, 'size': size, 'etag': response.headers.get('ETag')}
+
+    def list_objects(self, dataset_version_id, recursive=False, path='/', absolute=False, max_keys=20):
+        """Yield pages of objects under path, with whether there are more pages after them
+
+        :param str dataset_version_id:
+        :param bool recursive: list objects of subdirectories instead of the subdirectories
+        :param str path: dataset directory
+        :param bool absolute: keys are relative to the root of the dataset version instead of path
+        :param int max_keys: objects listed per page
+        :returns: (list of dicts with key and size and ETag of objects, bool)
+        """
+        path = normalize_path(path)
+
+        if not path.endswith('/'):
+            path += '/'
+
+        next_continuation_token = None
+
+        while True:
+            params = {'Prefix': path, 'MaxKeys': max_keys}
+            if next_continuation_token:
+                params['ContinuationToken'] = next_continuation_token
+            if recursive:
+                params['Delimiter'] = ''
+
+            pre_signed = self.client.generate_pre_signed_s3_url(
+                dataset_version_id,
+                method='listObjectsV2',
+                params=params,
+            )
+
+            response = self._call_s3_or_fail('GET', requests.get, pre_signed.url)
+            self.validate_s3_response(response)
+
+            tree = ElementTree.fromstring(response.text)
+
+            prefix = tree.find('{' + S3_XMLNS + '}Prefix').text
+            results = []
+            next_continuation_token = None
+
+            key_prefix = path[1:] if absolute else ''
+
+            for item in tree:
+                name = item.tag.rpartition('}')[2]
+                if name == 'Contents':
+                    key = item.find('{' + S3_XMLNS + '}Key').text[len(prefix):]
+                    is_dir = key.endswith('/')
+
+                    if not key or (recursive and is_dir):
+                        continue
+
+                    result = {'key': key_prefix + key}
+                    if not is_dir:
+                        result['size'] = item.find(
+                            '{' + S3_XMLNS + '}Size').text
+                        etag = item.find('{' + S3_XMLNS + '}ETag')
+                        result['etag'] = etag.text if etag is not None else None
+
+                    results.append(result)
+                elif name == 'NextContinuationToken':
+                    next_continuation_token = item.text
+                elif name == 'CommonPrefixes':
+                    if recursive:
+                        continue
+                    key = item.find(
+                        '{' + S3_XMLNS + '}Prefix').text[len(prefix):]
+                    results.append({'key': key_prefix + key})
+
+            yield results, bool(next_continuation_token)
+
+            if not next_continuation_token:
+                break
+
+    def iter_objects(self, dataset_version_id, path, is_file=False):
+        """Yield pages of objects under path with keys relative to the root of the dataset version
+
+        :param str dataset_version_id:
+        :param str path: normalized dataset path
+        :param bool is_file: path may be a file. Only its object is yielded if it exists
+        """
+        if is_file:
+            result = self.get_object(dataset_version_id, path)
+            if result is not None:
+                yield [result]
+                return
+
+        for results, _ in self.list_objects(dataset_version_id=dataset_version_id, path=path,
+                                            recursive=True, absolute=True, max_keys=S3_MAX_KEYS):
+            yield results
+
+    def copy_object(self, session, pre_signed, key):
+        """Send pre-signed copyObject or uploadPartCopy request
+
+        :param requests.Session session:
+        :param models.DatasetVersionPreSignedURL pre_signed:
+        :param str key: key the object is copied to, used in errors
+        :rtype: requests.Response
+        """
+        r = self._call_s3_or_fail('PUT', session.put, pre_signed.url, headers=pre_signed.headers, timeout=PUT_TIMEOUT)
+        self.validate_s3_response(r)
+        # S3 can fail a copy after it started responding with 200 OK, the error is in the body then
+        if '<Error>' in r.text:
+            raise sdk_exceptions.S3RequestFailedError('Failed to copy %s on storage provider: %s' % (key, r.text))
+        return r
+
+    def _sign_and_copy(self, session, source_dataset_version_id, target_dataset_version_id, tasks, objects,
+                       progress):
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
+            target_dataset_version_id,
+            calls=[dict(method='copyObject', params=dict(
+                Key=obj['target_key'],
+                CopySource=get_copy_source(source_dataset_version_id, target_dataset_version_id, obj['key'])))
+                for obj in objects],
+        )
+
+        for pre_signed, obj in zip(pre_signeds, objects):
+            tasks.put(self._copy, session, pre_signed, obj, progress)
+
+    def _copy(self, session, pre_signed, obj, progress):
+        try:
+            self.copy_object(session, pre_signed, obj['target_key'])
+        except Exception:
+            progress.file_done(failed=True)
+            raise
+
+        # content is copied by the storage provider, so bytes are counted once it's done
+        progress.add_bytes(obj['size'])
+        progress.file_done()
+
+    def _copy_multipart(self, session, source_dataset_version_id, target_dataset_version_id, obj, part_concurrency,
+                        progress):
+        key = obj['target_key']
+        size = obj['size']
+        part_size = max(COPY_PART_SIZE, -(-size // MAX_PART_COUNT))
+        part_count = -(-size // part_size)
+        copy_source = get_copy_source(source_dataset_version_id, target_dataset_version_id, obj['key'])
+
+        upload_id = self.client.generate_pre_signed_s3_url(
+            target_dataset_version_id,
+            method='createMultipartUpload',
+            params={'Key': key},
+        ).url['UploadId']
+
+        parts = []
+        parts_lock = threading.Lock()
+
+        def copy_part(part, pre_signed, length):
+            r = self.copy_object(session, pre_signed, key)
+            etag = next(item.text for item in ElementTree.fromstring(r.text).iter()
+                        if item.tag.rpartition('}')[2] == 'ETag')
+            progress.add_bytes(length)
+            with parts_lock:
+                parts.append({'ETag': etag.replace('"', ''), 'PartNumber': part})
+
+        try:
+            with futures.ThreadPoolExecutor(max_workers=max(min(part_concurrency, part_count), 1)) as executor:
+                part_tasks = TaskQueue(executor, limit=part_concurrency)
+                for first in range(1, part_count + 1, PART_PRESIGN_BATCH_SIZE):
+                    # no more parts are signed once one of them failed
+                    part_tasks.check()
+                    part_numbers = range(first, min(first + PART_PRESIGN_BATCH_SIZE, part_count + 1))
+                    ranges = [((part - 1) * part_size, min(part * part_size, size)) for part in part_numbers]
+                    pre_signeds = self.client.generate_pre_signed_s3_urls(
+                        target_dataset_version_id,
+                        calls=[dict(method='uploadPartCopy', params=dict(
+                            Key=key, UploadId=upload_id, PartNumber=part, CopySource=copy_source,
+                            CopySourceRange='bytes={}-{}'.format(start, end - 1)))
+                            for part, (start, end) in zip(part_numbers, ranges)],
+                    )
+
+                    for part, pre_signed, (start, end) in zip(part_numbers, pre_signeds, ranges):
+                        part_tasks.put(copy_part, part, pre_signed, end - start)
+                part_tasks.join()
+
+            parts.sort(key=lambda p: p['PartNumber'])
+            self.client.generate_pre_signed_s3_url(
+                target_dataset_version_id,
+                method='completeMultipartUpload',
+                params={
+                    'Key': key,
+                    'UploadId': upload_id,
+                    'MultipartUpload': {'Parts': parts}
+                },
+            )
+        except Exception:
+            progress.file_done(failed=True)
+            try:
+                pre_signed = self.client.generate_pre_signed_s3_url(
+                    target_dataset_version_id,
+                    method='abortMultipartUpload',
+                    params={'Key': key, 'UploadId': upload_id},
+                )
+                self._call_s3_or_fail('DELETE', session.delete, pre_signed.url)
+            except Exception as e:
+                # error of the copy is more useful than the one of its cleanup
+                self.logger.warning('Failed to abort copy of {}: {}'.format(key, e))
+            raise
+
+        progress.file_done()
@@ -1,6 +1,5 @@
 import abc
 import os
-import time
 
 import requests
 import six
@@ -8,13 +7,17 @@ import six
 from . import sdk_exceptions
 from .clients import ModelsClient
 from .clients.base_client import BaseClient
+from .clients.http_client import default_session_pool
 from .logger import MuteLogger
+from .retries import RetryPolicy
 
 
 class S3FilesDownloader(object):
-    def __init__(self, logger=MuteLogger()):
+    def __init__(self, logger=MuteLogger(), retry_policy=None, session_pool=None):
         self.logger = logger
         self.file_download_retries = 8
+        self.retry_policy = retry_policy or RetryPolicy(logger=logger)
+        self.session_pool = session_pool or default_session_pool
 
     def download_list(self, sources, destination_dir):
         """
@@ -33,16 +36,13 @@ class S3FilesDownloader(object):
         self.logger.log("Downloading: {}".format(file_path))
 
         # Trying to download several times in case of connection error with S3.
-        # The error seems to occur randomly but adding short sleep between retries helps a bit
-        for _ in range(max_retries + 1):
-            try:
-                response = requests.get(file_url)
-                break
-            except requests.exceptions.ConnectionError:
-                self.logger.debug(
-                    "Downloading {} resulted in error. Trying again...".format(file_path))
-                time.sleep(0.1)
-        else:  # break statement not executed - ConnectionError `max_retries` times
+        # The error seems to occur randomly but backing off between retries helps
+        retry_policy = self.retry_policy.copy(max_retries=max_retries)
+        # keep-alive session of the host, with default timeouts of the pool
+        session = self.session_pool.get_session(file_url)
+        try:
+            response = retry_policy.call("GET", session.get, file_url)
+        except requests.exceptions.ConnectionError:
             raise sdk_exceptions.ResourceFetchingError(
                 "Downloading {} resulted in error".format(file_path))
 
@@ -83,7 +83,7 @@ class ResourceDownloader(object):
 
     def download(self, job_id, destination):
         files = self._get_files_list(job_id)
-        s3_downloader = S3FilesDownloader(logger=self.logger)
+        s3_downloader = S3FilesDownloader(logger=self.logger, retry_policy=self.client.retry_policy)
         s3_downloader.download_list(files, destination)
 
     @abc.abstractmethod
@@ -14,14 +14,16 @@ from .utils import MultipartEncoder, MultipartEncoderWithProgressbar
 class S3FileUploader(object):
     DEFAULT_MULTIPART_ENCODER_CLS = MultipartEncoder
 
-    def __init__(self, multipart_encoder_cls=None, logger=None, ps_client_name=None):
+    def __init__(self, multipart_encoder_cls=None, logger=None, ps_client_name=None, retry_policy=None):
         """
         :param type(MultipartEncoder) multipart_encoder_cls:
         :param Logger logger:
+        :param RetryPolicy retry_policy:
         """
         self.multipart_encoder_cls = multipart_encoder_cls or self.DEFAULT_MULTIPART_ENCODER_CLS
         self.logger = logger or MuteLogger()
         self.ps_client_name = ps_client_name
+        self.retry_policy = retry_policy
 
     def upload(self, file_path, url, s3_fields=None):
         """Upload a file to S3
@@ -58,7 +60,7 @@ class S3FileUploader(object):
 
     def _get_client(self, url):
         client = http_client.API(
-            url, logger=self.logger, ps_client_name=self.ps_client_name)
+            url, logger=self.logger, ps_client_name=self.ps_client_name, retry_policy=self.retry_policy)
         return client
 
     def _get_multipart_encoder_monitor(self, fields):
@@ -102,13 +104,16 @@ class S3PutFileUploader(S3FileUploader):
 class S3ModelFileUploader(object):
     DEFAULT_MULTIPART_ENCODER_CLS = MultipartEncoderWithProgressbar
 
-    def __init__(self, api_key, multipart_encoder_cls=None, logger=None, ps_client_name=None, s3uploader=None):
+    def __init__(self, api_key, multipart_encoder_cls=None, logger=None, ps_client_name=None, s3uploader=None,
+                 retry_policy=None):
         """
         :param str api_key:
         :param Logger logger:
+        :param RetryPolicy retry_policy:
         """
         self.logger = logger or MuteLogger()
         self.multipart_encoder_cls = multipart_encoder_cls or self.DEFAULT_MULTIPART_ENCODER_CLS
+        self.retry_policy = retry_policy
         self.ps_api_client = self._get_client(
             config.CONFIG_HOST,
             api_key=api_key,
@@ -117,7 +122,8 @@ class S3ModelFileUploader(object):
         self.s3uploader = s3uploader or S3PutFileUploader(
             logger=self.logger,
             ps_client_name=ps_client_name,
-            multipart_encoder_cls=self.multipart_encoder_cls
+            multipart_encoder_cls=self.multipart_encoder_cls,
+            retry_policy=retry_policy,
         )
 
     def upload(self, file_path, model_id, cluster_id=None):
@@ -166,7 +172,7 @@ class S3ModelFileUploader(object):
 
     def _get_client(self, url, ps_client_name=None, api_key=None):
         client = http_client.API(
-            url, logger=self.logger, ps_client_name=ps_client_name, api_key=api_key)
+            url, logger=self.logger, ps_client_name=ps_client_name, api_key=api_key, retry_policy=self.retry_policy)
         return client
 
 
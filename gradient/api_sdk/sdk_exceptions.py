@@ -62,5 +62,9 @@ class InvalidParametersError(GradientSdkError):
     pass
 
 
+class S3RequestFailedError(GradientSdkError):
+    pass
+
+
 class EndWebsocketStream(Exception):
     pass
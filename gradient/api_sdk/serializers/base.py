@@ -1,5 +1,7 @@
 import marshmallow
 
+from .. import tracing
+
 
 class BaseSchema(marshmallow.Schema):
     MODEL = None
@@ -15,11 +17,13 @@ class BaseSchema(marshmallow.Schema):
         if not self.MODEL:
             raise NotImplementedError
 
-        if not many:
-            return self._get_instance(obj_dict)
+        with tracing.tracer.span("serializer.get_instance", schema=type(self).__name__, many=many) as span:
+            if not many:
+                return self._get_instance(obj_dict)
 
-        instances = [self._get_instance(obj_d) for obj_d in obj_dict]
-        return instances
+            instances = [self._get_instance(obj_d) for obj_d in obj_dict]
+            span.set(count=len(instances))
+            return instances
 
     def _get_instance(self, obj_dict):
         obj = self.load(obj_dict)
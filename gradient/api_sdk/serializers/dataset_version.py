@@ -24,5 +24,8 @@ class DatasetVersionSchema(BaseSchema):
 class DatasetVersionPreSignedURLSchema(BaseSchema):
     MODEL = models.DatasetVersionPreSignedURL
 
-    url = ma.fields.Str()
+    # result of the call instead of an URL for multipart upload calls, e.g. {"Key": ..., "UploadId": ...}
+    url = ma.fields.Raw()
     expires_in = ma.fields.Integer()
+    headers = ma.fields.Dict()
+    body = ma.fields.Str()
@@ -0,0 +1,221 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+from .config import config
+
+try:
+    import contextvars
+except ImportError:  # Python < 3.7
+    contextvars = None
+
+
+class _ThreadLocalVar(object):
+    """ContextVar of Python < 3.7, where spans are only current in the thread that entered them"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, "value", None)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+class _EmptyContext(object):
+    def run(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+if contextvars is not None:
+    _current_span = contextvars.ContextVar("gradient_current_span", default=None)
+    copy_context = contextvars.copy_context
+else:
+    _current_span = _ThreadLocalVar()
+
+    def copy_context():
+        """Context to run functions of other threads in, so their spans are children of the current one"""
+        return _EmptyContext()
+
+
+def _new_id():
+    return uuid.uuid4().hex[:16]
+
+
+class Span(object):
+    enabled = True
+
+    def __init__(self, tracer, name, parent=None, attributes=None):
+        """Timed operation. Spans started while another one is active in the same thread or task are its children
+
+        :param Tracer tracer:
+        :param str name:
+        :param Span parent:
+        :param dict attributes:
+        """
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else _new_id()
+        self.span_id = _new_id()
+        self.attributes = attributes or {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+        self.start = None
+        self.duration = None
+        self._token = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add_bytes(self, sent=0, received=0):
+        self.bytes_sent += sent or 0
+        self.bytes_received += received or 0
+
+    def __enter__(self):
+        self.start = time.time()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.duration = time.time() - self.start
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # span of a generator closed from another context, e.g. by garbage collection
+            pass
+        if exc_type is not None:
+            self.error = "{}: {}".format(exc_type.__name__, exc_val)
+
+        self.tracer.export(self)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "thread": threading.current_thread().name,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan(object):
+    """Returned when tracing is disabled so instrumented code costs next to nothing"""
+    enabled = False
+
+    def set(self, **attributes):
+        pass
+
+    def add_bytes(self, sent=0, received=0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesExporter(object):
+    def __init__(self, path):
+        """Appends every finished span to a file as a line of JSON
+
+        :param str path:
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(os.path.expanduser(self.path), "a")
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer(object):
+    def __init__(self):
+        """Records spans to the file set with PAPERSPACE_TRACE_FILE or ``gradient --trace FILE``
+
+        Nothing is recorded if the file is not set
+        """
+        self._exporter = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(config.TRACE_FILE)
+
+    def span(self, name, parent=None, **attributes):
+        """Start a span. Use as a context manager
+
+        :param str name: e.g. "http.request"
+        :param Span parent: parent span. Span active in current thread or task by default
+        :param attributes: values describing the operation, e.g. url
+        :rtype: Span
+        """
+        if not config.TRACE_FILE:
+            return NOOP_SPAN
+
+        return Span(self, name, parent=parent or _current_span.get(), attributes=attributes)
+
+    @staticmethod
+    def current_span():
+        """Get span active in current thread or task, e.g. to pass it as parent of spans in worker threads
+
+        :rtype: Span|None
+        """
+        return _current_span.get()
+
+    def export(self, span):
+        exporter = self._get_exporter()
+        if exporter is not None:
+            exporter.export(span)
+
+    def _get_exporter(self):
+        path = config.TRACE_FILE
+        with self._lock:
+            if self._exporter is not None and self._exporter.path != path:
+                self._exporter.close()
+                self._exporter = None
+
+            if self._exporter is None and path:
+                self._exporter = JsonLinesExporter(path)
+
+            return self._exporter
+
+    def close(self):
+        with self._lock:
+            if self._exporter is not None:
+                self._exporter.close()
+                self._exporter = None
+
+
+tracer = Tracer()
+atexit.register(tracer.close)
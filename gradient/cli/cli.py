@@ -2,6 +2,7 @@ import click
 import click_completion
 import requests
 
+from gradient.api_sdk import tracing
 from gradient.api_sdk.config import config
 from gradient.api_sdk.sdk_exceptions import GradientSdkError
 from gradient.cli import common
@@ -25,8 +26,49 @@ class GradientGroup(common.ClickGroup):
 
             CliLogger().error(e)
 
+    def invoke(self, ctx):
+        with tracing.tracer.span("cli.invoke", command=self._get_command_path(ctx)):
+            return super(GradientGroup, self).invoke(ctx)
+
+    @staticmethod
+    def _get_command_path(ctx):
+        # only names of commands are recorded, values of options may be secret
+        words = []
+        for arg in ctx.protected_args + ctx.args:
+            if arg.startswith("-"):
+                break
+            words.append(arg)
+        return " ".join(words)
+
+
+def disable_response_cache(ctx, param, value):
+    if value:
+        config.HTTP_CACHE = False
+
+
+def enable_tracing(ctx, param, value):
+    if value:
+        config.TRACE_FILE = value
+
 
 @click.group(cls=GradientGroup, **config.HELP_COLORS_DICT)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=disable_response_cache,
+    help="Don't use responses cached on disk (enabled with PAPERSPACE_HTTP_CACHE=true)",
+)
+@click.option(
+    "--trace",
+    metavar="FILE",
+    expose_value=False,
+    is_eager=True,
+    callback=enable_tracing,
+    help="Append timings of API requests, parsing and commands to FILE as JSON lines. "
+         "Can be set with PAPERSPACE_TRACE_FILE too",
+)
 def cli():
     pass
 
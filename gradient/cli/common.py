@@ -273,3 +273,70 @@ def validate_comma_split_option(comma_option_value, option_value, raise_if_no_va
 
         tags = sorted(set(option_value))
         return tags
+
+
+def bulk_tags_options(entity_name, action):
+    """Options of commands adding or removing tags of many entities at once
+
+    :param str entity_name: e.g. "notebook"
+    :param str action: "add" or "remove"
+    """
+    action_description = "add to" if action == "add" else "remove from"
+
+    def decorator(f):
+        options = [
+            click.option(
+                "--id",
+                "ids",
+                multiple=True,
+                help="One or many IDs of {}s".format(entity_name),
+                cls=GradientOption,
+            ),
+            click.option(
+                "--ids",
+                "ids_comma",
+                help="Separated by comma IDs of {}s".format(entity_name),
+                cls=GradientOption,
+            ),
+            click.option(
+                "--idsFile",
+                "ids_file",
+                type=click.File(),
+                help="File with IDs of {}s, one per line. Use - to read from standard input".format(entity_name),
+            ),
+            click.option(
+                "--tag",
+                "tags",
+                multiple=True,
+                help="One or many tags that you want to {} every {}".format(action_description, entity_name),
+                cls=GradientOption,
+            ),
+            click.option(
+                "--tags",
+                "tags_comma",
+                help="Separated by comma tags that you want to {} every {}".format(action_description, entity_name),
+                cls=GradientOption,
+            ),
+            api_key_option,
+        ]
+        return functools.reduce(lambda x, opt: opt(x), reversed(options), f)
+
+    return decorator
+
+
+def get_bulk_entity_ids(ids, ids_comma, ids_file):
+    """Collect entity IDs from --id, --ids and --idsFile options, keeping their order
+
+    :rtype: list[str]
+    """
+    entity_ids = list(ids or [])
+    if ids_comma:
+        entity_ids.extend(s.strip() for s in ids_comma.split(","))
+    if ids_file:
+        entity_ids.extend(line.strip() for line in ids_file)
+
+    entity_ids = [entity_id for entity_id in dict.fromkeys(entity_ids) if entity_id]
+    if not entity_ids:
+        raise click.UsageError("No IDs provided")
+
+    return entity_ids
@@ -20,7 +20,7 @@ def execute_list(command, **kwargs):
             click.echo("")
 
 
-def validate_dataset_id(dataset_ref, ref_type=None):
+def validate_dataset_id(dataset_ref, ref_type=None, option='--id'):
     dataset_part = EXAMPLE_ID
     full_part = dataset_part
 
@@ -34,13 +34,20 @@ def validate_dataset_id(dataset_ref, ref_type=None):
     dataset_id, _, ref = dataset_ref.partition(":")
     if not dataset_id:
         raise click.UsageError(
-            "The '--id' option is missing the dataset ID (ex: {}})".format(full_part))
+            "The '{}' option is missing the dataset ID (ex: {})".format(option, full_part))
     if ref_type and not ref:
         raise click.UsageError(
-            "The '--id' option is missing the {} (ex: {})".format(ref_type, full_part))
+            "The '{}' option is missing the {} (ex: {})".format(option, ref_type, full_part))
     elif not ref_type and ref:
         raise click.UsageError(
-            "The '--id' option should not have a version/tag (ex: {})".format(full_part))
+            "The '{}' option should not have a version/tag (ex: {})".format(option, full_part))
+
+
+def parse_dataset_path(value, option):
+    """Split dataset version ID with an optional path (ex: dataset_id:version/path) into the ID and the path"""
+    dataset_version_id, slash, path = value.partition('/')
+    validate_dataset_id(dataset_version_id, ref_type='version', option=option)
+    return dataset_version_id, slash + path
 
 
 @cli.group("datasets", help="Manage datasets", cls=ClickGroup)
@@ -299,6 +306,13 @@ def show_dataset_version_details(api_key, dataset_version_id, options_file):
     cls=common.GradientOption,
     multiple=True,
 )
+@click.option(
+    "--dedup",
+    "dedup",
+    is_flag=True,
+    help="Copy files that didn't change since the last committed version from it instead of uploading them",
+    cls=common.GradientOption,
+)
 @common.api_key_option
 @common.options_file
 def create_dataset_version(
@@ -306,12 +320,13 @@ def create_dataset_version(
         message,
         api_key,
         source_paths,
+        dedup,
         options_file,
 ):
     validate_dataset_id(dataset_id)
     command = commands.CreateDatasetVersionCommand(api_key=api_key)
     command.execute(dataset_id=dataset_id, message=message,
-                    source_paths=source_paths)
+                    source_paths=source_paths, dedup=dedup)
 
 
 @dataset_versions.command("update", help="Update dataset version")
@@ -434,13 +449,46 @@ def list_dataset_files(api_key, dataset_version_id, path, recursive, options_fil
     cls=common.GradientOption,
     required=True,
 )
+@click.option(
+    "--part-concurrency",
+    "part_concurrency",
+    help="Number of ranges of a large file downloaded at once",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-part-concurrency",
+    "max_part_concurrency",
+    help="Number of ranges downloaded at once across all files",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-bandwidth",
+    "max_bandwidth",
+    help="Bandwidth of the download across all files [MB/s]. Unlimited by default",
+    type=click.FloatRange(min=0.01),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--json-progress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress as lines of JSON, e.g. for CI logs",
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, options_file):
+def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, part_concurrency,
+                      max_part_concurrency, max_bandwidth, json_progress, options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.GetDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
-                    source_paths=source_paths, target_path=target_path)
+                    source_paths=source_paths, target_path=target_path,
+                    part_concurrency=part_concurrency,
+                    max_part_concurrency=max_part_concurrency,
+                    max_bandwidth=max_bandwidth and max_bandwidth * 1e6,
+                    json_progress=json_progress)
 
 
 @dataset_version_files.command("put", help="Put files")
@@ -465,13 +513,64 @@ def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, op
     help="Target dataset file path",
     cls=common.GradientOption,
 )
+@click.option(
+    "--part-concurrency",
+    "part_concurrency",
+    help="Number of parts of a large file uploaded at once",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-part-concurrency",
+    "max_part_concurrency",
+    help="Number of parts uploaded at once across all files",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--part-size",
+    "part_size",
+    help="Size of parts of large files [MB], between 6 and 5368. "
+         "Raised for files that wouldn't fit in 10000 parts. 15 by default",
+    type=click.IntRange(min=6, max=5368),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="Continue an interrupted upload of the same source paths to the same target path. "
+         "Files uploaded since they last changed are skipped",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-bandwidth",
+    "max_bandwidth",
+    help="Bandwidth of the upload across all files [MB/s]. Unlimited by default",
+    type=click.FloatRange(min=0.01),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--json-progress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress as lines of JSON, e.g. for CI logs",
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, options_file):
+def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, part_concurrency,
+                      max_part_concurrency, part_size, resume, max_bandwidth, json_progress, options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.PutDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
-                    source_paths=source_paths, target_path=target_path)
+                    source_paths=source_paths, target_path=target_path,
+                    part_concurrency=part_concurrency,
+                    max_part_concurrency=max_part_concurrency,
+                    part_size=part_size and int(part_size * 1e6),
+                    resume=resume,
+                    max_bandwidth=max_bandwidth and max_bandwidth * 1e6,
+                    json_progress=json_progress)
 
 
 @dataset_version_files.command("delete", help="Delete files")
@@ -489,10 +588,211 @@ def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, op
     cls=common.GradientOption,
     multiple=True,
 )
+@click.option(
+    "--json-progress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress as lines of JSON, e.g. for CI logs",
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def delete_dataset_files(api_key, dataset_version_id, paths, options_file):
+def delete_dataset_files(api_key, dataset_version_id, paths, json_progress, options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.DeleteDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
-                    paths=paths or ['/'])
+                    paths=paths or ['/'],
+                    json_progress=json_progress)
+
+
+@dataset_version_files.command("sync-get", help="Get only new or changed files")
+@click.option(
+    "--id",
+    "dataset_version_id",
+    help="Dataset version ID (ex: {}:{})".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--source-path",
+    "source_path",
+    help="Directory to get. Whole dataset version by default",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--target-path",
+    "target_path",
+    help="Target directory path",
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--delete",
+    "delete",
+    is_flag=True,
+    help="Delete files in target directory that are not in source directory",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--part-concurrency",
+    "part_concurrency",
+    help="Number of ranges of a large file downloaded at once",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-part-concurrency",
+    "max_part_concurrency",
+    help="Number of ranges downloaded at once across all files",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-bandwidth",
+    "max_bandwidth",
+    help="Bandwidth of the download across all files [MB/s]. Unlimited by default",
+    type=click.FloatRange(min=0.01),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--json-progress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress as lines of JSON, e.g. for CI logs",
+    cls=common.GradientOption,
+)
+@api_key_option
+@common.options_file
+def sync_get_dataset_files(api_key, dataset_version_id, source_path, target_path, delete, part_concurrency,
+                           max_part_concurrency, max_bandwidth, json_progress, options_file):
+    validate_dataset_id(dataset_version_id, ref_type='version')
+    command = commands.SyncGetDatasetFilesCommand(api_key=api_key)
+    command.execute(dataset_version_id=dataset_version_id,
+                    source_path=source_path, target_path=target_path, delete=delete,
+                    part_concurrency=part_concurrency,
+                    max_part_concurrency=max_part_concurrency,
+                    max_bandwidth=max_bandwidth and max_bandwidth * 1e6,
+                    json_progress=json_progress)
+
+
+@dataset_version_files.command("sync-put", help="Put only new or changed files")
+@click.option(
+    "--id",
+    "dataset_version_id",
+    help="Dataset version ID (ex: {}:{})".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--source-path",
+    "source_path",
+    help="Directory to put",
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--target-path",
+    "target_path",
+    help="Target dataset directory path",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--delete",
+    "delete",
+    is_flag=True,
+    help="Delete files in target directory that are not in source directory",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--part-concurrency",
+    "part_concurrency",
+    help="Number of parts of a large file uploaded at once",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-part-concurrency",
+    "max_part_concurrency",
+    help="Number of parts uploaded at once across all files",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--part-size",
+    "part_size",
+    help="Size of parts of large files [MB], between 6 and 5368. "
+         "Raised for files that wouldn't fit in 10000 parts. 15 by default",
+    type=click.IntRange(min=6, max=5368),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--max-bandwidth",
+    "max_bandwidth",
+    help="Bandwidth of the upload across all files [MB/s]. Unlimited by default",
+    type=click.FloatRange(min=0.01),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--json-progress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress as lines of JSON, e.g. for CI logs",
+    cls=common.GradientOption,
+)
+@api_key_option
+@common.options_file
+def sync_put_dataset_files(api_key, dataset_version_id, source_path, target_path, delete, part_concurrency,
+                           max_part_concurrency, part_size, max_bandwidth, json_progress, options_file):
+    validate_dataset_id(dataset_version_id, ref_type='version')
+    command = commands.SyncPutDatasetFilesCommand(api_key=api_key)
+    command.execute(dataset_version_id=dataset_version_id,
+                    source_path=source_path, target_path=target_path, delete=delete,
+                    part_concurrency=part_concurrency,
+                    max_part_concurrency=max_part_concurrency,
+                    part_size=part_size and int(part_size * 1e6),
+                    max_bandwidth=max_bandwidth and max_bandwidth * 1e6,
+                    json_progress=json_progress)
+
+
+@dataset_version_files.command("copy", help="Copy files between dataset versions without downloading them")
+@click.option(
+    "--from",
+    "source",
+    help="Dataset version ID with an optional path of a file or directory to copy "
+         "(ex: {}:{}/path)".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--to",
+    "target",
+    help="Dataset version ID with an optional path of the target directory "
+         "(ex: {}:{}/path/)".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+    required=True,
+)
+@click.option(
+    "--part-concurrency",
+    "part_concurrency",
+    help="Number of parts of a file larger than 5GiB copied at once",
+    type=click.IntRange(min=1),
+    cls=common.GradientOption,
+)
+@click.option(
+    "--json-progress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress as lines of JSON, e.g. for CI logs",
+    cls=common.GradientOption,
+)
+@api_key_option
+@common.options_file
+def copy_dataset_files(api_key, source, target, part_concurrency, json_progress, options_file):
+    source_dataset_version_id, source_path = parse_dataset_path(source, option='--from')
+    target_dataset_version_id, target_path = parse_dataset_path(target, option='--to')
+    command = commands.CopyDatasetFilesCommand(api_key=api_key)
+    command.execute(source_dataset_version_id=source_dataset_version_id,
+                    target_dataset_version_id=target_dataset_version_id,
+                    source_path=source_path, target_path=target_path,
+                    part_concurrency=part_concurrency,
+                    json_progress=json_progress)
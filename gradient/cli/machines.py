@@ -693,3 +693,23 @@ def machine_remove_tags(id, options_file, api_key, **kwargs):
 
     command = machines_commands.MachineRemoveTagsCommand(api_key=api_key)
     command.execute(id, **kwargs)
+
+
+@machines_tags.command("addBulk", help="Add tags to many machines at once")
+@common.bulk_tags_options("machine", "add")
+def machine_add_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = machines_commands.MachineAddTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
+
+
+@machines_tags.command("removeBulk", help="Remove tags from many machines at once")
+@common.bulk_tags_options("machine", "remove")
+def machine_remove_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = machines_commands.MachineRemoveTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
@@ -284,3 +284,23 @@ def ml_model_remove_tags(id, options_file, api_key, **kwargs):
 
     command = models_commands.MLModelRemoveTagsCommand(api_key=api_key)
     command.execute(id, **kwargs)
+
+
+@model_tags.command("addBulk", help="Add tags to many ml models at once")
+@common.bulk_tags_options("ml model", "add")
+def ml_model_add_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = models_commands.MLModelAddTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
+
+
+@model_tags.command("removeBulk", help="Remove tags from many ml models at once")
+@common.bulk_tags_options("ml model", "remove")
+def ml_model_remove_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = models_commands.MLModelRemoveTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
@@ -356,6 +356,26 @@ def notebook_remove_tags(id, options_file, api_key, **kwargs):
     command.execute(id, **kwargs)
 
 
+@notebook_tags.command("addBulk", help="Add tags to many notebooks at once")
+@common.bulk_tags_options("notebook", "add")
+def notebook_add_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = notebooks.NotebookAddTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
+
+
+@notebook_tags.command("removeBulk", help="Remove tags from many notebooks at once")
+@common.bulk_tags_options("notebook", "remove")
+def notebook_remove_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = notebooks.NotebookRemoveTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
+
+
 @notebook_metrics.command(
     "get",
     short_help="Get notebook metrics",
@@ -162,3 +162,23 @@ def project_remove_tags(id, options_file, api_key, **kwargs):
 
     command = projects_commands.ProjectRemoveTagsCommand(api_key=api_key)
     command.execute(id, **kwargs)
+
+
+@project_tags.command("addBulk", help="Add tags to many projects at once")
+@common.bulk_tags_options("project", "add")
+def project_add_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = projects_commands.ProjectAddTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
+
+
+@project_tags.command("removeBulk", help="Remove tags from many projects at once")
+@common.bulk_tags_options("project", "remove")
+def project_remove_tags_bulk(ids, ids_comma, ids_file, tags, tags_comma, api_key):
+    entity_ids = common.get_bulk_entity_ids(ids, ids_comma, ids_file)
+    tags = validate_comma_split_option(tags_comma, tags, raise_if_no_values=True)
+
+    command = projects_commands.ProjectRemoveTagsBulkCommand(api_key=api_key)
+    command.execute(entity_ids, tags)
@@ -21,6 +21,9 @@ class CliLogger(Logger):
         color = "yellow" if config.USE_CONSOLE_COLORS else None
         self._log(message, color=color)
 
+    def is_debug_enabled(self):
+        return config.DEBUG
+
     def debug(self, message, *args, **kwargs):
         if config.DEBUG:
             self._log("DEBUG: {}".format(message))
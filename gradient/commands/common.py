@@ -1,5 +1,8 @@
 import abc
 import collections
+import functools
+import inspect
+import itertools
 import json
 import pydoc
 
@@ -9,7 +12,7 @@ from click import style
 from halo import halo
 
 from gradient import api_sdk, exceptions
-from gradient.api_sdk import sdk_exceptions
+from gradient.api_sdk import sdk_exceptions, tracing
 from gradient.api_sdk.config import config
 from gradient.clilogger import CliLogger
 from gradient.cliutils import get_terminal_lines, TerminalPrinter
@@ -17,8 +20,31 @@ from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.exceptions import ApplicationError
 
 
+def _trace_execute(execute):
+    if inspect.isgeneratorfunction(execute):
+        @functools.wraps(execute)
+        def traced_execute(self, *args, **kwargs):
+            with tracing.tracer.span("command.execute", command=type(self).__name__):
+                return (yield from execute(self, *args, **kwargs))
+    else:
+        @functools.wraps(execute)
+        def traced_execute(self, *args, **kwargs):
+            with tracing.tracer.span("command.execute", command=type(self).__name__):
+                return execute(self, *args, **kwargs)
+
+    traced_execute._traced = True
+    return traced_execute
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseCommand:
+    def __init_subclass__(cls, **kwargs):
+        super(BaseCommand, cls).__init_subclass__(**kwargs)
+        # execute() of every command, including ones inherited from mixins, is recorded when tracing is enabled
+        execute = cls.execute
+        if not getattr(execute, "__isabstractmethod__", False) and not getattr(execute, "_traced", False):
+            cls.execute = _trace_execute(execute)
+
     def __init__(self, api_key, logger=CliLogger()):
         self.api_key = api_key
         self.client = self._get_client(api_key, logger)
@@ -85,8 +111,9 @@ class ListCommandMixin(object):
 
     @staticmethod
     def _make_list_table(table_data):
-        ascii_table = terminaltables.AsciiTable(table_data)
-        table_string = ascii_table.table
+        with tracing.tracer.span("table.render", rows=len(table_data)):
+            ascii_table = terminaltables.AsciiTable(table_data)
+            table_string = ascii_table.table
         return table_string
 
     def _generate_data_table(self, **kwargs):
@@ -112,6 +139,31 @@ class ListCommandMixin(object):
             offset += limit
 
 
+@six.add_metaclass(abc.ABCMeta)
+class StreamingListCommandMixin(ListCommandMixin):
+    """List command printing instances while they are still being received
+
+    _get_instances returns an iterator. Short lists are printed in a single table, as by ListCommandMixin,
+    longer ones in tables of TABLE_BATCH_SIZE rows each, as soon as each batch is complete
+    """
+    TABLE_BATCH_SIZE = 100
+
+    def execute(self, **kwargs):
+        instances = iter(self._get_instances(kwargs))
+        with halo.Halo(text=self.WAITING_FOR_RESPONSE_MESSAGE, spinner="dots"):
+            batch = list(itertools.islice(instances, self.TABLE_BATCH_SIZE))
+            next_batch = list(itertools.islice(instances, self.TABLE_BATCH_SIZE))
+
+        if not next_batch:
+            self._log_objects_list(batch)
+            return
+
+        while batch:
+            table_data = self._get_table_data(batch)
+            self.logger.log(self._make_list_table(table_data))
+            batch, next_batch = next_batch, list(itertools.islice(instances, self.TABLE_BATCH_SIZE))
+
+
 @six.add_metaclass(abc.ABCMeta)
 class ListCommandPagerMixin(ListCommandMixin):
     def _get_instances(self, kwargs):
@@ -133,6 +185,48 @@ class ListCommandPagerMixin(ListCommandMixin):
             yield has_more
 
 
+@six.add_metaclass(abc.ABCMeta)
+class BulkTagsCommandMixin(ListCommandMixin):
+    WAITING_FOR_RESPONSE_MESSAGE = "Updating tags..."
+
+    def execute(self, entity_ids, tags):
+        with halo.Halo(text=self.WAITING_FOR_RESPONSE_MESSAGE, spinner="dots"):
+            results = self._get_instances(dict(entity_ids=entity_ids, tags=tags))
+
+        self._log_objects_list(results)
+
+        failed = [result for result in results if not result.ok]
+        changed = [result for result in results if result.changed]
+        self.logger.log("Tags changed: {}, unchanged: {}, failed: {}".format(
+            len(changed), len(results) - len(changed) - len(failed), len(failed)))
+        if failed:
+            raise ApplicationError("Failed to update tags of {} of {} entities".format(len(failed), len(results)))
+
+    def _get_table_data(self, results):
+        data = [("ID", "Tags", "Status")]
+        for result in results:
+            if not result.ok:
+                status = "Failed: {}".format(result.error)
+            elif result.changed:
+                status = "Changed"
+            else:
+                status = "Unchanged"
+
+            data.append((result.entity_id, ", ".join(result.tags), status))
+
+        return data
+
+
+class BulkAddTagsCommandMixin(BulkTagsCommandMixin):
+    def _get_instances(self, kwargs):
+        return self.client.add_tags_bulk(**kwargs)
+
+
+class BulkRemoveTagsCommandMixin(BulkTagsCommandMixin):
+    def _get_instances(self, kwargs):
+        return self.client.remove_tags_bulk(**kwargs)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class DetailsCommandMixin(object):
     WAITING_FOR_RESPONSE_MESSAGE = "Waiting for data..."
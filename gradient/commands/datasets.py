@@ -1,4 +1,7 @@
 import abc
+import binascii
+import collections
+import hashlib
 import mimetypes
 import multiprocessing
 import os
@@ -10,23 +13,36 @@ try:
     import queue
 except ImportError:
     import Queue as queue
+from concurrent import futures
 from xml.etree import ElementTree
 from urllib.parse import urlparse
-from ..api_sdk.clients import http_client
 from ..api_sdk.config import config
 from ..cli_constants import CLI_PS_CLIENT_NAME
 
-import halo
 import requests
 import six
 
 from gradient import api_sdk
+from gradient.api_sdk import tracing
+from gradient.api_sdk.s3_copier import MAX_COPY_SIZE, MAX_PART_COUNT, OBJECT_PRESIGN_BATCH_SIZE, \
+    PART_PRESIGN_BATCH_SIZE, PUT_TIMEOUT, S3DatasetVersionCopier, get_copy_source, normalize_path
 from gradient.api_sdk.sdk_exceptions import ResourceFetchingError
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.commands.common import BaseCommand, DetailsCommandMixin, ListCommandPagerMixin
+from gradient.commands.transfer_journal import TransferJournal, get_file_state
+from gradient.commands.transfer_progress import Attempt, TransferProgress
+from gradient.commands.transfer_scheduler import BandwidthLimiter, ByteBudget, FileSlice, largest_first
 from gradient.exceptions import ApplicationError
 
-S3_XMLNS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+DELETE_BATCH_SIZE = 1000  # most keys S3 deletes with one deleteObjects request
+# pages and presigned batches fetched ahead of the stage consuming them
+PREFETCH_PAGES = 1
+PREFETCH_PRESIGN_BATCHES = 2
+# number of files got in order of size before they are transferred
+SCHEDULE_WINDOW = 1000
+# files up to this size take less time to transfer than a round trip of presigning their URLs
+SMALL_FILE_SIZE = 1024 * 1024  # 1MiB
+SMALL_FILE_PRESIGN_BATCH_SIZE = 500
 
 
 class WorkerPool(object):
@@ -59,20 +75,22 @@ class WorkerPool(object):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._exception:
-            raise self._exception
-
+        # workers stop on their own after an exception, so they are only
+        # told to stop while all of them are still running
         for _ in range(self.worker_count):
-            try:
-                self._work.put(None, block=True, timeout=1)
-            except queue.Full:
-                break
-
-        self._work.join()
+            while not self.has_exception():
+                try:
+                    self._work.put(None, block=True, timeout=1)
+                    break
+                except queue.Full:
+                    pass
 
         for thread in self._threads:
             thread.join()
 
+        if self._exception:
+            raise self._exception
+
     def _worker(self):
         while not self.has_exception():
             try:
@@ -84,8 +102,9 @@ class WorkerPool(object):
                 if work is None:
                     return
 
-                (func, args, kwargs) = work
-                func(*args, **kwargs)
+                (func, args, kwargs, parent_span) = work
+                with tracing.tracer.span("worker.task", parent=parent_span, task=getattr(func, "__name__", None)):
+                    func(*args, **kwargs)
 
                 with self._completed_lock:
                     self._completed_count += 1
@@ -95,9 +114,11 @@ class WorkerPool(object):
                 self._work.task_done()
 
     def put(self, func, *args, **kwargs):
+        # spans of the task are children of the span that queued it
+        work = (func, args, kwargs, tracing.tracer.current_span())
         while not self.has_exception():
             try:
-                return self._work.put((func, args, kwargs), block=True, timeout=1)
+                return self._work.put(work, block=True, timeout=1)
             except queue.Full:
                 pass
 
@@ -115,6 +136,60 @@ class WorkerPool(object):
             return self._completed_count
 
 
+def prefetch(iterable, size=1):
+    """Iterate iterable in a background thread, keeping up to size items ready ahead of the consumer
+
+    Chains stages of a transfer, e.g. listing and presigning, so every stage works while the next one
+    does. The iterable runs in the context of the first next() so its spans are traced in it.
+    Exceptions of the iterable are raised in the consumer
+
+    :param iterable:
+    :param int size: number of items kept ready
+    """
+    items = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, block=True, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((done, e))
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+
+    context = tracing.copy_context()
+    thread = threading.Thread(target=context.run, args=(produce,))
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item, exception = items.get()
+            if item is done:
+                if exception is not None:
+                    raise exception
+                return
+            yield item
+    finally:
+        # consumer stopped early, the producer quits at its next item
+        stopped.set()
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseDatasetsCommand(BaseCommand):
     def _get_client(self, api_key, logger):
@@ -222,7 +297,18 @@ class ShowDatasetVersionDetailsCommand(DetailsCommandMixin, BaseDatasetVersionsC
 
 
 class CreateDatasetVersionCommand(BaseDatasetVersionsCommand):
-    def execute(self, dataset_id, message=None, source_paths=None):
+    def execute(self, dataset_id, message=None, source_paths=None, dedup=False):
+        """
+        :param str dataset_id:
+        :param str message:
+        :param list[str] source_paths: files to put into the version. The version is committed after that
+        :param bool dedup: copy files that didn't change since the last committed version from it
+            by the storage provider instead of uploading them
+        """
+        dedup_from = None
+        if source_paths and dedup:
+            dedup_from = self._get_last_committed_version_id(dataset_id)
+
         if source_paths:
             for source_path in source_paths:
                 if not os.path.exists(source_path):
@@ -238,12 +324,22 @@ class CreateDatasetVersionCommand(BaseDatasetVersionsCommand):
             create = PutDatasetFilesCommand(
                 api_key=self.api_key, logger=self.logger)
             create.execute(dataset_version_id,
-                           source_paths=source_paths, target_path='/')
+                           source_paths=source_paths, target_path='/', dedup_from=dedup_from)
 
             commit = CommitDatasetVersionCommand(
                 api_key=self.api_key, logger=self.logger)
             commit.execute(dataset_version_id)
 
+    def _get_last_committed_version_id(self, dataset_id):
+        # versions are listed from the newest
+        versions = self.client.list(dataset_id=dataset_id, is_committed=True, limit=1)
+        if not versions:
+            return None
+
+        dataset_version_id = '{}:{}'.format(dataset_id, versions[0].version)
+        self.logger.log('Deduplicating files against dataset version: {}'.format(dataset_version_id))
+        return dataset_version_id
+
 
 class UpdateDatasetVersionCommand(BaseDatasetVersionsCommand):
     def execute(self, dataset_version_id, message=None):
@@ -317,7 +413,11 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
             api_key=self.api_key,
             logger=self.logger,
             ps_client_name=CLI_PS_CLIENT_NAME,
+            retry_policy=self.client.retry_policy,
         )
+        # requests sent to storage provider, shared with the SDK so they are retried and listed the same way
+        self.copier = S3DatasetVersionCopier(self.client, logger=self.logger)
+        self.s3_retry_policy = self.copier.s3_retry_policy
 
     def assert_supported(self, dataset_id):
         dataset_id, _, _ = dataset_id.partition(':')
@@ -337,113 +437,268 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
             pass
         return dataset_ref
 
-    @staticmethod
-    def validate_s3_response(response):
-        if not response.ok:
-            raise ApplicationError('Failed to execute request against storage provider: %s\n\n%s' %
-                                   (response.status_code, response.text))
+    def call_s3(self, method, send, *args, **kwargs):
+        """Send request to storage provider with send(*args, **kwargs), retrying it if needed
 
-    @staticmethod
-    def report_connection_error(exception):
-        raise ApplicationError('Failed to execute request against storage provider: %s' %
-                               exception)
+        :param str method: HTTP method
+        :param callable send: function sending the request and returning the response
+        :rtype: requests.Response
+        """
+        return self.copier.call_s3(method, send, *args, **kwargs)
 
-    @staticmethod
-    def normalize_path(path):
-        if not path:
-            return '/'
-        path = re.sub(r'/+', '/', path)
-        if not path.startswith('/'):
-            path = '/' + path
-        return path
+    def call_s3_transfer(self, method, send, *args):
+        """call_s3() for requests transferring content of a file
 
-    def get_object(self, dataset_version_id, path):
-        path = path.lstrip('/')
+        send(*args, attempt) reports bytes of the request to the Attempt it gets as the last argument.
+        Bytes of attempts that failed are taken back from progress, so retries don't count them twice
 
-        if not path:
-            return
+        :param str method: HTTP method
+        :param callable send: function sending the request and returning the response
+        :rtype: requests.Response
+        """
+        def send_attempt(*args):
+            attempt = Attempt(self._progress, self._limiter)
+            try:
+                response = send(*args, attempt)
+            except Exception:
+                attempt.cancel()
+                raise
+
+            if not response.ok:
+                attempt.cancel()
+            return response
+
+        return self.call_s3(method, send_attempt, *args)
+
+    def track_progress(self, text):
+        """Start progress of the transfer, rendered as lines of JSON if json_progress is set
+
+        :param str text: e.g. "Uploading files"
+        :rtype: TransferProgress
+        """
+        self._progress = TransferProgress(text, json_output=self.json_progress)
+        return self._progress
+
+    def sign_deletes(self, dataset_version_id, keys):
+        """Presign deleteObjects requests of keys in batches of DELETE_BATCH_SIZE, all of them in one call
+
+        :param str dataset_version_id:
+        :param list[str] keys: keys relative to the root of the dataset version
+        :returns: (keys, pre-signed deleteObjects request) pairs
+        :rtype: list[tuple[list[str], models.DatasetVersionPreSignedURL]]
+        """
+        batches = [keys[i:i + DELETE_BATCH_SIZE] for i in range(0, len(keys), DELETE_BATCH_SIZE)]
+        if not batches:
+            return []
 
-        pre_signed = self.client.generate_pre_signed_s3_url(
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
             dataset_version_id,
-            method='headObject',
-            params={'Key': path},
+            calls=[dict(method='deleteObjects', params=dict(
+                Delete=dict(Objects=[dict(Key=key) for key in batch], Quiet=True))) for batch in batches],
         )
+        return list(zip(batches, pre_signeds))
 
-        try:
-            response = requests.head(pre_signed.url)
-            if response.status_code == 404:
-                return
-            self.validate_s3_response(response)
-
-            size = response.headers.get('Content-Length', 0)
-            return {'key': path, 'size': size}
-        except requests.exceptions.ConnectionError as e:
-            return self.report_connection_error(e)
-
-    def list_objects(self, dataset_version_id, recursive=False, path='/', absolute=False, max_keys=20):
-        path = self.normalize_path(path)
-
-        if not path.endswith('/'):
-            path += '/'
-
-        next_continuation_token = None
-
-        while True:
-            params = {'Prefix': path, 'MaxKeys': max_keys}
-            if next_continuation_token:
-                params['ContinuationToken'] = next_continuation_token
-            if recursive:
-                params['Delimiter'] = ''
-
-            pre_signed = self.client.generate_pre_signed_s3_url(
-                dataset_version_id,
-                method='listObjectsV2',
-                params=params,
-            )
+    def _delete_batch(self, pre_signed, keys):
+        """Delete objects with one deleteObjects request
 
+        Storage provider reports keys it failed to delete in the response, they are logged one by one
+        """
+        with requests.Session() as session:
             try:
-                response = requests.get(pre_signed.url)
-                self.validate_s3_response(response)
+                r = self.call_s3('POST', session.post, pre_signed.url, data=pre_signed.body,
+                                 headers=pre_signed.headers)
+                self.validate_s3_response(r)
             except requests.exceptions.ConnectionError as e:
-                self.report_connection_error(e)
-                return
+                for _ in keys:
+                    self._progress.file_done(failed=True)
+                return self.report_connection_error(e)
+
+        errors = []
+        for item in ElementTree.fromstring(r.text):
+            if item.tag.rpartition('}')[2] == 'Error':
+                errors.append({child.tag.rpartition('}')[2]: child.text for child in item})
+
+        for error in errors:
+            # keys of the response are keys in the bucket, prefixed by the location of the dataset version
+            bucket_key = error.get('Key') or ''
+            key = max((k for k in keys if bucket_key.endswith('/' + k.lstrip('/'))), key=len, default=bucket_key)
+            self.logger.error('Failed to delete {}: {} {}'.format(key, error.get('Code'), error.get('Message') or ''))
+            self._progress.file_done(failed=True)
+
+        for _ in range(len(keys) - len(errors)):
+            self._progress.file_done()
+
+    def init_scheduler(self, max_bandwidth=None):
+        """
+        :param float max_bandwidth: bytes per second transferred across all files.
+            PAPERSPACE_MAX_BANDWIDTH or unlimited by default
+        """
+        max_bandwidth = max_bandwidth or config.MAX_BANDWIDTH
+        self._limiter = BandwidthLimiter(max_bandwidth) if max_bandwidth else None
+        self._in_flight = ByteBudget(config.TRANSFER_MAX_BYTES_IN_FLIGHT)
 
-            tree = ElementTree.fromstring(response.text)
+    @staticmethod
+    def schedule(sign_and_transfer, dataset_version_id, pool, results, update_status):
+        """Queue transfers of files, largest first, so large files overlap with the tail of small ones
+
+        URLs of large files are presigned in batches of the pool size, so they don't expire while waiting
+        for workers. Small files are presigned in batches of SMALL_FILE_PRESIGN_BATCH_SIZE, so the round trip
+        of presigning is shared by many of them
+        """
+        results = largest_first(results)
+        start = 0
+        while start < len(results):
+            batch_size = pool.worker_count
+            if int(results[start].get('size') or 0) <= SMALL_FILE_SIZE:
+                batch_size = max(batch_size, SMALL_FILE_PRESIGN_BATCH_SIZE)
+            sign_and_transfer(dataset_version_id, pool, results[start:start + batch_size], update_status)
+            start += batch_size
+
+    def iter_pre_signed_objects(self, dataset_version_id, method, path, is_file=False):
+        """Yield batches of (objects, pre-signed URLs of method for their keys) of objects under path
+
+        Listing and presigning run in their own threads, so the next page of keys and the next
+        batches of URLs are fetched while the caller transfers the current batch
+
+        :param str dataset_version_id:
+        :param str method: S3 method, e.g. getObject
+        :param str path: normalized dataset path
+        :param bool is_file: path may be a file. Its object is yielded if it exists
+        """
+        def sign_batches():
+            for results in prefetch(self.iter_objects(dataset_version_id, path, is_file), size=PREFETCH_PAGES):
+                for i in range(0, len(results), OBJECT_PRESIGN_BATCH_SIZE):
+                    batch = results[i:i + OBJECT_PRESIGN_BATCH_SIZE]
+                    pre_signeds = self.client.generate_pre_signed_s3_urls(
+                        dataset_version_id,
+                        calls=[dict(method=method, params=dict(Key=r['key'])) for r in batch],
+                    )
+                    yield batch, pre_signeds
+
+        return prefetch(sign_batches(), size=PREFETCH_PRESIGN_BATCHES)
+
+    def iter_objects(self, dataset_version_id, path, is_file=False):
+        return self.copier.iter_objects(dataset_version_id, path, is_file=is_file)
+
+    # CopySource param of copyObject and uploadPartCopy, also used by put to copy files it already has
+    copy_source = staticmethod(get_copy_source)
+
+    def copy_object(self, session, pre_signed, key):
+        return self.copier.copy_object(session, pre_signed, key)
+
+    def _delete_objects(self, dataset_version_id, pool, keys, update_status):
+        for batch, pre_signed in self.sign_deletes(dataset_version_id, keys):
+            update_status()
+            for _ in batch:
+                self._progress.add_file()
+            pool.put(self._delete_batch, pre_signed, batch)
+
+    def iter_remote_files(self, dataset_version_id, path):
+        """Yield (key relative to path, object) of all objects under path, sorted by key
+
+        :param str dataset_version_id:
+        :param str path: remote directory
+        """
+        for results, _ in self.list_objects(dataset_version_id, recursive=True, path=path, max_keys=1000):
+            for result in results:
+                yield result['key'], result
 
-            prefix = tree.find('{' + S3_XMLNS + '}Prefix').text
-            results = []
-            next_continuation_token = None
+    @staticmethod
+    def iter_local_files(root, prefix=''):
+        """Yield (key relative to root, (path, size)) of all files under root, sorted by key like S3 lists objects
+
+        Only one directory per level is listed at a time, so memory doesn't grow with the number of files
+
+        :param str root: local directory
+        :param str prefix: prefix of keys
+        """
+        entries = []
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # like os.walk, links to directories are not followed
+                    if entry.is_symlink():
+                        continue
+                    # files of a directory are in the place of its key with a trailing slash
+                    entries.append((prefix + entry.name + '/', entry.path, None))
+                elif entry.is_file():
+                    entries.append((prefix + entry.name, entry.path, entry.stat().st_size))
+
+        for key, path, size in sorted(entries):
+            if size is None:
+                for item in BaseDatasetFilesCommand.iter_local_files(path, key):
+                    yield item
+            else:
+                yield key, (path, size)
 
-            key_prefix = path[1:] if absolute else ''
+    @staticmethod
+    def merge_sorted(local_files, remote_files):
+        """Join two iterables of (key, item) sorted by key
+
+        :returns: (key, local item or None, remote item or None) for every key
+        """
+        local_files = iter(local_files)
+        remote_files = iter(remote_files)
+        local = next(local_files, None)
+        remote = next(remote_files, None)
+
+        while local is not None or remote is not None:
+            if remote is None or (local is not None and local[0] < remote[0]):
+                yield local[0], local[1], None
+                local = next(local_files, None)
+            elif local is None or remote[0] < local[0]:
+                yield remote[0], None, remote[1]
+                remote = next(remote_files, None)
+            else:
+                yield local[0], local[1], remote[1]
+                local = next(local_files, None)
+                remote = next(remote_files, None)
+
+    def compare_files(self, files, part_size=None):
+        """Tell which local files are the same as remote objects by size and ETag
+
+        Files of the same size as their objects are hashed by the HASH_WORKERS threads, up to COMPARE_WINDOW
+        of them ahead of the file that is yielded, so hashing doesn't hold up scheduling of transfers
+
+        :param files: iterable of (key, (path, size) or None, object returned by list_objects() or None)
+        :param int part_size: part size set for uploads
+        :returns: (key, local, remote, whether local file is unchanged) for every file, in order
+        """
+        compared = collections.deque()
+        for key, local, remote in files:
+            if local is not None and remote is not None and int(remote.get('size') or 0) == local[1]:
+                unchanged = self._hasher.submit(file_matches_etag, local[0], local[1], remote.get('etag'), part_size)
+            else:
+                unchanged = futures.Future()
+                unchanged.set_result(False)
+            compared.append((key, local, remote, unchanged))
 
-            for item in tree:
-                name = item.tag.rpartition('}')[2]
-                if name == 'Contents':
-                    key = item.find('{' + S3_XMLNS + '}Key').text[len(prefix):]
-                    is_dir = key.endswith('/')
+            while compared and (compared[0][3].done() or len(compared) > COMPARE_WINDOW):
+                key, local, remote, unchanged = compared.popleft()
+                yield key, local, remote, unchanged.result()
 
-                    if not key or (recursive and is_dir):
-                        continue
+        for key, local, remote, unchanged in compared:
+            yield key, local, remote, unchanged.result()
 
-                    result = {'key': key_prefix + key}
-                    if not is_dir:
-                        result['size'] = item.find(
-                            '{' + S3_XMLNS + '}Size').text
+    @staticmethod
+    def validate_s3_response(response):
+        if not response.ok:
+            raise ApplicationError('Failed to execute request against storage provider: %s\n\n%s' %
+                                   (response.status_code, response.text))
 
-                    results.append(result)
-                elif name == 'NextContinuationToken':
-                    next_continuation_token = item.text
-                elif name == 'CommonPrefixes':
-                    if recursive:
-                        continue
-                    key = item.find(
-                        '{' + S3_XMLNS + '}Prefix').text[len(prefix):]
-                    results.append({'key': key_prefix + key})
+    @staticmethod
+    def report_connection_error(exception):
+        raise ApplicationError('Failed to execute request against storage provider: %s' %
+                               exception)
 
-            yield results, bool(next_continuation_token)
+    normalize_path = staticmethod(normalize_path)
 
-            if not next_continuation_token:
-                break
+    def get_object(self, dataset_version_id, path):
+        return self.copier.get_object(dataset_version_id, path)
+
+    def list_objects(self, dataset_version_id, recursive=False, path='/', absolute=False, max_keys=20):
+        return self.copier.list_objects(dataset_version_id, recursive=recursive, path=path, absolute=absolute,
+                                        max_keys=max_keys)
 
 
 class ListDatasetFilesCommand(ListCommandPagerMixin, BaseDatasetFilesCommand):
@@ -465,35 +720,225 @@ class ListDatasetFilesCommand(ListCommandPagerMixin, BaseDatasetFilesCommand):
         return self.list_objects(**kwargs)
 
 
+DOWNLOAD_RANGE_SIZE = int(15e6)  # 15MB
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+RANGED_DOWNLOAD_SUFFIX = '.gradient-download'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class RangeRequestIgnoredError(Exception):
+    """Storage provider answered a range request with the whole object"""
+
+
 class GetDatasetFilesCommand(BaseDatasetFilesCommand):
 
-    @classmethod
-    def _get(cls, url, path):
+    @staticmethod
+    def _download(session, url, tmp_path, limiter=None):
+        with session.get(url, stream=True) as r:
+            if not r.ok:
+                # error message has to be read before the connection is released
+                r.content
+                return r
+
+            # content is checked against the ETag in the same pass that writes it
+            etag = r.headers.get('ETag')
+            hasher = get_etag_hasher(int(r.headers.get('Content-Length') or 0), etag)
+            with open(tmp_path, 'wb') as f:
+                for chunk in r.iter_content(chunk_size=8192):
+                    if limiter is not None:
+                        limiter.consume(len(chunk))
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+
+            verify_etag(etag, hasher, urlparse(url).path)
+            return r
+
+    @staticmethod
+    def _download_range(session, url, tmp_path, offset, length, etag=None, limiter=None):
+        headers = {'Range': 'bytes={}-{}'.format(offset, offset + length - 1)}
+        if etag:
+            # fails with 412 instead of mixing ranges of different versions of the object
+            headers['If-Match'] = etag
+        with session.get(url, headers=headers, stream=True) as r:
+            if r.status_code == 200:
+                # the whole object isn't read, closing the response drops the connection instead
+                return r
+            if r.status_code != 206:
+                # error message has to be read before the connection is released
+                r.content
+                return r
+
+            # every range writes at its own offset of the preallocated file
+            written = 0
+            hasher = ETagHasher()
+            with open(tmp_path, 'r+b') as f:
+                f.seek(offset)
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if limiter is not None:
+                        limiter.consume(len(chunk))
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    written += len(chunk)
+
+            if written != length:
+                # retried like any other broken response
+                raise requests.exceptions.ChunkedEncodingError(
+                    'Range of {} bytes ended after {} bytes'.format(length, written))
+            # ranges can only be checked together, once all of them are downloaded
+            r.content_md5 = hasher.hexdigest()
+            return r
+
+    def _get_ranges(self, url, path, key, size, etag):
+        """Download object in ranges fetched at once into a preallocated temporary file
+
+        Finished ranges are journaled, so download of the same version of the object
+        continues from them if it was interrupted. Object is downloaded again
+        if the file doesn't match its ETag
+        """
+        tmp_path = path + RANGED_DOWNLOAD_SUFFIX
+        hasher = get_etag_hasher(size, etag)
+        # ranges of an object uploaded in parts are its parts, so their MD5s add up to its ETag
+        range_size = hasher.part_size if hasher is not None and hasher.part_size else DOWNLOAD_RANGE_SIZE
+
+        restart = False
+        for _ in range(VERIFY_MAX_ATTEMPTS):
+            try:
+                md5s = self._get_ranges_once(url, tmp_path, key, size, etag, range_size, restart)
+            except RangeRequestIgnoredError:
+                os.remove(tmp_path)
+                self._get_stream(url, path, size)
+                return
+
+            if self._matches_etag(tmp_path, etag, hasher, range_size, md5s):
+                os.replace(tmp_path, path)
+                return
+
+            # all ranges were counted and all of them are downloaded again
+            self._progress.add_bytes(-size)
+            restart = True
+
+        raise ApplicationError('Downloaded %s does not match its ETag %s' % (key, etag))
+
+    def _matches_etag(self, tmp_path, etag, hasher, range_size, md5s):
+        if hasher is None or not config.VERIFY_TRANSFERS:
+            return True
+
+        if hasher.part_size is None:
+            # ranges of an object uploaded in one request are hashed together once all of them are written.
+            # The download thread waits for it, the hash workers only cap how many files are read back at once
+            digest = self._hasher.submit(hash_file, tmp_path, hasher).result()
+        else:
+            # ranges journaled by an older version of the command don't have MD5s
+            md5s = [md5 or hash_file(tmp_path, ETagHasher(), (part - 1) * range_size, range_size)
+                    for part, md5 in enumerate(md5s, 1)]
+            digest = composite_etag(md5s)
+
+        return digest == etag.strip('"')
+
+    def _get_ranges_once(self, url, tmp_path, key, size, etag, range_size, restart=False):
+        """
+        :returns: MD5s of ranges in order
+        :rtype: list[str|None]
+        """
+        state = [size, etag]
+        part_count = math.ceil(size / range_size)
+
+        download = self._journal.find_download(key)
+        if restart or download is None or download['state'] != state or download['part_size'] != range_size or \
+                not os.path.isfile(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                f.truncate(size)
+            self._journal.record_download(key, state, range_size)
+            download = {'parts': {}}
+
+        md5s = [download['parts'].get(part) for part in range(1, part_count + 1)]
+        part_numbers = [part for part in range(1, part_count + 1) if part not in download['parts']]
+        pending = set(part_numbers)
+
+        def pending_bytes():
+            return sum(min(range_size, size - (part - 1) * range_size) for part in pending)
+
+        self._progress.skip_bytes(size - pending_bytes())
+
+        with requests.Session() as session:
+            def get_range(part):
+                offset = (part - 1) * range_size
+                length = min(range_size, size - offset)
+                # ranges of all files share the part slots of the command
+                with self._part_slots, self._in_flight.reserve(length):
+                    try:
+                        r = self.call_s3_transfer('GET', self._download_range, session, url, tmp_path, offset,
+                                                  length, etag)
+                    except requests.exceptions.ConnectionError as e:
+                        return self.report_connection_error(e)
+
+                self.validate_s3_response(r)
+                if r.status_code != 206:
+                    raise RangeRequestIgnoredError(key)
+                self._journal.record_range(key, part, r.content_md5)
+                md5s[part - 1] = r.content_md5
+                pending.discard(part)
+
+            try:
+                with WorkerPool(count=max(min(self.part_concurrency, len(part_numbers)), 1)) as range_pool:
+                    for part in part_numbers:
+                        range_pool.put(get_range, part)
+            except RangeRequestIgnoredError:
+                # finished ranges are downloaded again with the rest of the object
+                self._progress.skip_bytes(pending_bytes() - size)
+                raise
+
+        return md5s
+
+    def _get(self, url, path, key=None, size=None, etag=None):
         dir_path = os.path.dirname(path)
-        tmp_path = path + '.tmp-%s' % uuid.uuid4()
 
         if os.path.exists(path) and not os.path.isfile(path):
             raise ApplicationError('%s already exists' % path)
 
         os.makedirs(dir_path, exist_ok=True)
 
+        # large objects are fetched over several connections, the rest in a single stream
+        if size is not None and int(size) > DOWNLOAD_RANGE_SIZE:
+            self._get_ranges(url, path, key, int(size), etag)
+        else:
+            self._get_stream(url, path, size)
+        self._progress.file_done()
+
+    def _get_stream(self, url, path, size=None):
+        tmp_path = path + '.tmp-%s' % uuid.uuid4()
         try:
             with requests.Session() as session:
                 try:
-                    with session.get(url, stream=True) as r:
-                        cls.validate_s3_response(r)
-                        with open(tmp_path, 'wb') as f:
-                            for chunk in r.iter_content(chunk_size=8192):
-                                f.write(chunk)
+                    with self._in_flight.reserve(int(size or 0)):
+                        r = self.call_s3_transfer(
+                            'GET', self._download, session, url, tmp_path)
+                    self.validate_s3_response(r)
                 except requests.exceptions.ConnectionError as e:
-                    return cls.report_connection_error(e)
+                    return self.report_connection_error(e)
+                except ChecksumMismatchError as e:
+                    raise ApplicationError(str(e))
 
             os.rename(tmp_path, path)
         finally:
             if os.path.isfile(tmp_path):
                 os.remove(tmp_path)
 
-    def execute(self, dataset_version_id, source_paths, target_path):
+    def execute(self, dataset_version_id, source_paths, target_path, part_concurrency=None,
+                max_part_concurrency=None, max_bandwidth=None, json_progress=False):
+        """
+        :param str dataset_version_id:
+        :param list[str] source_paths:
+        :param str target_path:
+        :param int part_concurrency: number of ranges of a large file downloaded at once.
+            PAPERSPACE_DOWNLOAD_PART_CONCURRENCY by default
+        :param int max_part_concurrency: number of ranges downloaded at once across all files.
+            PAPERSPACE_DOWNLOAD_MAX_PART_CONCURRENCY by default
+        :param float max_bandwidth: bytes per second downloaded across all files.
+            PAPERSPACE_MAX_BANDWIDTH or unlimited by default
+        :param bool json_progress: print progress as lines of JSON instead of a spinner
+        """
         self.assert_supported(dataset_version_id)
 
         dataset_version_id = self.resolve_dataset_version_id(
@@ -504,49 +949,42 @@ class GetDatasetFilesCommand(BaseDatasetFilesCommand):
         if not source_paths:
             source_paths = ['/']
 
+        self.part_concurrency = part_concurrency or config.DOWNLOAD_PART_CONCURRENCY
+        self._part_slots = threading.BoundedSemaphore(
+            max_part_concurrency or config.DOWNLOAD_MAX_PART_CONCURRENCY)
+        self.init_scheduler(max_bandwidth)
+        self.json_progress = json_progress
+
+        # finished ranges of large objects are journaled, so their download can continue after an interruption
+        self._journal = TransferJournal.for_transfer('get', dataset_version_id, target_path, list(source_paths)).load()
+        self._hasher = futures.ThreadPoolExecutor(max_workers=HASH_WORKERS)
+        try:
+            self._get_all(dataset_version_id, source_paths, target_path)
+        finally:
+            self._hasher.shutdown()
+            self._journal.close()
+
+        self._journal.clear()
+
+    def _get_all(self, dataset_version_id, source_paths, target_path):
         status_text = 'Downloading files'
 
-        with halo.Halo(text=status_text, spinner='dots') as status:
+        with self.track_progress(status_text) as progress:
             with WorkerPool() as pool:
                 for source_path in source_paths:
                     source_path = self.normalize_path(source_path)
-
-                    list_objects = None
-                    is_file = False
                     has_trailing_slash = source_path.endswith('/')
 
-                    if not has_trailing_slash:
-                        result = self.get_object(
-                            dataset_version_id, source_path)
-                        if result is not None:
-                            list_objects = [([result], False)]
-                            is_file = True
-
-                    if not list_objects:
-                        list_objects = self.list_objects(
-                            dataset_version_id=dataset_version_id,
-                            path=source_path,
-                            recursive=True,
-                            absolute=True,
-                            max_keys=max(pool.worker_count * 2, 64)
-                        )
-
                     def update_status():
-                        status.text = '{}: {} ({})  '.format(
-                            status_text, source_path, pool.completed_count())
-
-                    for results, _ in list_objects:
-                        if not results:
-                            break
-
-                        pre_signeds = self.client.generate_pre_signed_s3_urls(
-                            dataset_version_id,
-                            calls=[dict(method='getObject', params=dict(
-                                Key=r['key'])) for r in results],
-                        )
-
-                        for result, pre_signed in zip(results, pre_signeds):
-                            if is_file:
+                        progress.set_text('{}: {}'.format(status_text, source_path))
+
+                    batches = self.iter_pre_signed_objects(
+                        dataset_version_id, 'getObject', source_path, is_file=not has_trailing_slash)
+                    for results, pre_signeds in batches:
+                        objects = [dict(result, url=pre_signed.url) for result, pre_signed in zip(results, pre_signeds)]
+                        for result in largest_first(objects):
+                            # only the object of a file path has the same key as the path
+                            if '/' + result['key'] == source_path:
                                 path = target_path
                             elif has_trailing_slash:
                                 path = os.path.join(
@@ -555,184 +993,517 @@ class GetDatasetFilesCommand(BaseDatasetFilesCommand):
                                 path = os.path.join(target_path, result['key'])
 
                             update_status()
-                            pool.put(self._get, url=pre_signed.url, path=path)
+                            progress.add_file(result.get('size'))
+                            pool.put(self._get, url=result['url'], path=path, key=result['key'],
+                                     size=result.get('size'), etag=result.get('etag'))
 
 
 MULTIPART_CHUNK_SIZE = int(15e6)  # 15MB
-PUT_TIMEOUT = 300  # 5 minutes
+# S3 limits of multipart uploads
+MIN_PART_SIZE = 5 * 1024 ** 2  # 5MiB, except for the last part
+MAX_PART_SIZE = 5 * 1024 ** 3  # 5GiB
+
+
+def get_part_size(size, part_size=None):
+    """Get size of parts of a multipart upload of a file
+
+    Part size, MULTIPART_CHUNK_SIZE by default, is raised when needed to fit the file in MAX_PART_COUNT parts
+
+    :param int size: file size
+    :param int part_size:
+    :rtype: int
+    """
+    part_size = part_size or MULTIPART_CHUNK_SIZE
+
+    min_part_size = -(-size // MAX_PART_COUNT)
+    if min_part_size > MAX_PART_SIZE:
+        raise ApplicationError('File too large to upload: {} bytes. Maximum size is {} bytes'.format(
+            size, MAX_PART_SIZE * MAX_PART_COUNT))
+
+    if part_size < min_part_size:
+        # round up to a whole MB
+        part_size = min(-(-min_part_size // int(1e6)) * int(1e6), MAX_PART_SIZE)
+
+    return part_size
+
+
+MD5_ETAG_RE = re.compile(r'^"?([0-9a-f]{32})(?:-([0-9]+))?"?$')
+VERIFY_MAX_ATTEMPTS = 3
+# files hashed at once after they are downloaded or to be compared with objects. Content that is
+# transferred is hashed on the transfer threads, in the same pass that sends or writes it
+HASH_WORKERS = 2
+# local files hashed ahead of the one compared with its object
+COMPARE_WINDOW = 64
+
+
+class ChecksumMismatchError(requests.exceptions.ChunkedEncodingError):
+    """Content sent or received doesn't match ETag returned by storage provider. Retried like a broken response"""
+
+
+def parse_etag(etag):
+    """
+    :param str etag:
+    :returns: MD5 and number of parts of a multipart upload (None for an object uploaded in one request),
+        or (None, None) if ETag is not an MD5, e.g. of an object encrypted with a KMS key
+    :rtype: tuple[str|None, int|None]
+    """
+    match = MD5_ETAG_RE.match(etag or '')
+    if match is None:
+        return None, None
+
+    md5, part_count = match.groups()
+    return md5, int(part_count) if part_count else None
+
+
+def composite_etag(md5s):
+    """Get ETag of a multipart upload: MD5 of MD5s of its parts with the number of parts appended
+
+    :param list[str] md5s: MD5s of parts in order, e.g. their ETags
+    :rtype: str
+    """
+    md5 = hashlib.md5(b''.join(binascii.unhexlify(parse_etag(m)[0]) for m in md5s))
+    return '{}-{}'.format(md5.hexdigest(), len(md5s))
+
+
+class ETagHasher(object):
+    def __init__(self, part_size=None):
+        """Computes ETag of content in the same pass that reads or writes it
+
+        :param int part_size: size of parts of a multipart upload. Content is hashed as a single upload if not set
+        """
+        self.part_size = part_size
+        self.reset()
+
+    def reset(self):
+        self._md5 = hashlib.md5()
+        self._md5s = []
+        self._read = 0
+
+    def update(self, data):
+        data = memoryview(data)
+        while data:
+            chunk = data[:self.part_size - self._read] if self.part_size else data
+            self._md5.update(chunk)
+            self._read += len(chunk)
+            data = data[len(chunk):]
+            if self.part_size and self._read == self.part_size:
+                self._md5s.append(self._md5.hexdigest())
+                self._md5 = hashlib.md5()
+                self._read = 0
+
+    def hexdigest(self):
+        if not self.part_size:
+            return self._md5.hexdigest()
+
+        md5s = self._md5s + [self._md5.hexdigest()] if self._read else self._md5s
+        return composite_etag(md5s)
+
+
+def get_etag_hasher(size, etag, part_size=None):
+    """Get hasher of content of an object of size that should match the ETag
+
+    Multipart ETags can only be verified if the object was uploaded in parts of get_part_size()
+
+    :param int size:
+    :param str etag:
+    :param int part_size: part size set for uploads
+    :returns: hasher or None if the ETag can't be verified
+    :rtype: ETagHasher|None
+    """
+    md5, part_count = parse_etag(etag)
+    if md5 is None:
+        return None
+
+    if part_count is None:
+        return ETagHasher()
+
+    chunk_size = get_part_size(size, part_size)
+    if math.ceil(size / chunk_size) != part_count:
+        return None
+    return ETagHasher(chunk_size)
+
+
+def verify_etag(etag, hasher, name):
+    """Check content hashed while it was transferred against ETag returned by storage provider
+
+    :param str etag:
+    :param ETagHasher hasher: None if content can't be verified
+    :param str name: name of the transferred file, used in the error
+    :raises ChecksumMismatchError:
+    """
+    if hasher is None or not config.VERIFY_TRANSFERS:
+        return
+
+    md5, part_count = parse_etag(etag)
+    if md5 is None or (part_count is None) != (hasher.part_size is None):
+        return
+
+    digest = hasher.hexdigest()
+    if digest != etag.strip('"'):
+        raise ChecksumMismatchError(
+            'Checksum {} of {} does not match ETag {} returned by storage provider. '
+            'Set PAPERSPACE_VERIFY_TRANSFERS=false if objects are encrypted with KMS keys'.format(digest, name, etag))
+
+
+def hash_file(path, hasher, offset=0, length=None):
+    """
+    :param str path:
+    :param ETagHasher hasher:
+    :param int offset:
+    :param int length: bytes from offset to hash. Rest of the file by default
+    :rtype: str
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = f.read(HASH_CHUNK_SIZE if remaining is None else min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    return hasher.hexdigest()
+
+
+def file_matches_etag(path, size, etag, part_size=None):
+    """Check if content of a file is the same as of an object with the ETag
+
+    ETag of an object uploaded in one request is MD5 of its content. ETag of a multipart upload
+    is MD5 of MD5s of its parts with the number of parts appended, so it only matches if the object
+    was uploaded in parts of the same size as returned by get_part_size()
+
+    :param str path:
+    :param int size: file size
+    :param str etag:
+    :param int part_size: part size set for uploads
+    :rtype: bool
+    """
+    hasher = get_etag_hasher(size, etag, part_size)
+    return hasher is not None and hash_file(path, hasher) == etag.strip('"')
 
 
 class PutDatasetFilesCommand(BaseDatasetFilesCommand):
 
+    @staticmethod
+    def _put_file(session, url, path, headers, limiter=None):
+        with open(path, 'rb') as f:
+            data = FileSlice(f, 0, os.fstat(f.fileno()).st_size, limiter, ETagHasher())
+            r = session.put(url, data=data, headers=headers, timeout=PUT_TIMEOUT)
+
+        # raised inside the attempt, so the file is sent again
+        if r.ok:
+            verify_etag(r.headers.get('ETag'), data.hasher, path)
+        return r
+
+    def _get_part_size(self, size):
+        return get_part_size(size, self.part_size)
+
     # @classmethod
     def _put(self, session, path, url, content_type, dataset_version_id=None, key=None):
-        size = os.path.getsize(path)
+        state = get_file_state(path)
+        size = state[0]
         headers = {'Content-Type': content_type}
+        part_size = self._get_part_size(size)
 
         try:
             if size <= 0:
                 headers.update({'Content-Size': '0'})
-                r = session.put(url, data='', headers=headers, timeout=5)
-            # for files under 15MB
-            elif size <= (MULTIPART_CHUNK_SIZE):
-                with open(path, 'rb') as f:
-                    r = session.put(
-                        url, data=f, headers=headers, timeout=PUT_TIMEOUT)
+                r = self.call_s3(
+                    'PUT', session.put, url, data='', headers=headers, timeout=5)
+            # for files that fit in a single part
+            elif size <= part_size:
+                # file is opened again on every attempt so it's sent from the start on retries
+                with self._in_flight.reserve(size):
+                    r = self.call_s3_transfer(
+                        'PUT', self._put_file, session, url, path, headers)
             # # for chonky files, use a multipart upload
             else:
-                # Chunks need to be at least 5MB or AWS throws an
-                # EntityTooSmall error; we'll arbitrarily choose a
-                # 15MB chunksize
-                #
-                # Note also that AWS limits the max number of chunks
-                # in a multipart upload to 10000, so this setting
-                # currently enforces a hard limit on 150GB per file.
-                #
-                # We can dynamically assign a larger part size if needed,
-                # but for the majority of use cases we should be fine
-                # as-is
-                part_minsize = MULTIPART_CHUNK_SIZE
-                dataset_id, _, version = dataset_version_id.partition(":")
-                mpu_url = f'/datasets/{dataset_id}/versions/{version}/s3/preSignedUrls'
-                api_client = http_client.API(
-                    api_url=config.CONFIG_HOST,
-                    api_key=self.api_key,
-                    ps_client_name=CLI_PS_CLIENT_NAME
-                )
-
-                mpu_create_res = api_client.post(
-                    url=mpu_url,
-                    json={
-                        'datasetId': dataset_id,
-                        'version': version,
-                        'calls': [{
-                            'method': 'createMultipartUpload',
-                            'params': {'Key': key}
-                        }]
-                    }
-                )
-
-                mpu_data = mpu_create_res.json()[0]['url']
-
-                parts = []
-                with open(path, 'rb') as f:
-                    # we +1 the number of parts since we count from zero
-                    # to match what AWS expects for part numbers. We use
-                    # `ceil` to capture any remaining data less than
-                    # part_minsize at the end of upload
-                    for part in range(1, math.ceil(size / part_minsize) + 1):
-                        presigned_url_res = api_client.post(
-                            url=mpu_url,
-                            json={
-                                'datasetId': dataset_id,
-                                'version': version,
-                                'calls': [{
-                                    'method': 'uploadPart',
-                                    'params': {
-                                        'Key': key,
-                                        'UploadId': mpu_data['UploadId'],
-                                        'PartNumber': part
-                                    }
-                                }]
-                            }
-                        )
-
-                        presigned_url = presigned_url_res.json()[0]['url']
-
-                        chunk = f.read(part_minsize)
-
-                        for attempt in range(0, 5):
-                            part_res = session.put(
-                                presigned_url,
-                                data=chunk,
-                                headers=headers,
-                                timeout=PUT_TIMEOUT)
-
-                            if part_res.status_code == 200:
-                                break
-
-                        if part_res.status_code != 200:
-                            # Why do we silence exceptions that get
-                            # explicitly raised? Mystery for the ages, but
-                            # there you have it I guess...
-                            print(f'\nUnable to complete upload of {path}')
-                            raise ApplicationError(
-                                f'Unable to complete upload of {path}')
-                        etag = part_res.headers['ETag'].replace('"', '')
-                        parts.append({'ETag': etag, 'PartNumber': part})
-                        # This is a pretty jank way to get about multipart
-                        # upload status updates, but we structure the Halo
-                        # spinner to report on the number of completed
-                        # tasks dispatched to the workers in the pool.
-                        # Since it's more of a PITA to properly distribute
-                        # this MPU among all workers than I really want to
-                        # deal with, that means we can't easily plug into
-                        # Halo for these updates. But we can print to
-                        # console! Which again, jank and noisy, but arguably
-                        # better than a task sitting forever, never either
-                        # completing or emitting an error message.
-                        print(
-                            f'\nUploaded {len(parts) * part_minsize / 10e5}MB '
-                            f'of {int(size / 10e5)}MB for '
-                            f'{path}'
-                        )
-
-                r = api_client.post(
-                    url=mpu_url,
-                    json={
-                        'datasetId': dataset_id,
-                        'version': version,
-                        'calls': [{
-                            'method': 'completeMultipartUpload',
-                            'params': {
-                                'Key': key,
-                                'UploadId': mpu_data['UploadId'],
-                                'MultipartUpload': {'Parts': parts}
-                            }
-                        }]
-                    }
-                )
+                r = self._put_multipart(session, path, state, part_size, headers, dataset_version_id, key)
+
+            if getattr(r, 'ok', True):
+                self._journal.record_file(key, state)
+                self._progress.file_done()
+            else:
+                self._fail_file(path, '{} {}'.format(r.status_code, r.text))
 
         except requests.exceptions.ConnectionError as e:
+            self._failed = True
+            self._progress.file_done(failed=True)
             return self.report_connection_error(e)
         except Exception as e:
-            return e
+            self._fail_file(path, e)
+
+    def _fail_file(self, path, error):
+        """Count a file that failed to upload, so the upload fails once all other files are done"""
+        self.logger.error('Failed to upload {}: {}'.format(path, error))
+        self._failed = True
+        self._progress.file_done(failed=True)
+
+    def _abort_upload(self, session, dataset_version_id, key, upload_id):
+        pre_signed = self.client.generate_pre_signed_s3_url(
+            dataset_version_id,
+            method='abortMultipartUpload',
+            params={'Key': key, 'UploadId': upload_id},
+        )
+        r = self.call_s3('DELETE', session.delete, pre_signed.url)
+        # upload could be already removed, e.g. by a lifecycle rule of the bucket
+        if r.status_code != 404:
+            self.validate_s3_response(r)
+        self._journal.record_closed(upload_id)
+
+    def _put_multipart(self, session, path, state, part_size, headers, dataset_version_id, key):
+        # Chunks need to be at least 5MB or AWS throws an
+        # EntityTooSmall error, and AWS limits the max number
+        # of chunks in a multipart upload to 10000, so part_size
+        # comes from _get_part_size, which keeps it within both limits
+        size = state[0]
+
+        # upload left open by an interrupted run is continued if the file hasn't changed
+        upload_id, upload = self._journal.find_upload(key)
+        if upload is not None and (upload['state'] != state or upload['part_size'] != part_size):
+            self._abort_upload(session, dataset_version_id, key, upload_id)
+            upload = None
+
+        if upload is None:
+            upload_id = self.client.generate_pre_signed_s3_url(
+                dataset_version_id,
+                method='createMultipartUpload',
+                params={'Key': key},
+            ).url['UploadId']
+            self._journal.record_upload(upload_id, key, state, part_size)
+            upload = {'parts': {}}
+
+        # we +1 the number of parts since we count from zero
+        # to match what AWS expects for part numbers. We use
+        # `ceil` to capture any remaining data less than
+        # part_size at the end of upload
+        part_count = math.ceil(size / part_size)
+        parts = [{'ETag': etag, 'PartNumber': part} for part, etag in upload['parts'].items()]
+        self._progress.skip_bytes(sum(min(part_size, size - (part - 1) * part_size) for part in upload['parts']))
+        parts_lock = threading.Lock()
+
+        def put_part(part, presigned_url):
+            # every file gets its own uploaders, but all of them share
+            # the part slots of the command, so a directory of huge files
+            # doesn't open part_concurrency connections for each of them
+            offset = (part - 1) * part_size
+            length = min(part_size, size - offset)
+            with self._part_slots, self._in_flight.reserve(length):
+                part_res = self.call_s3_transfer(
+                    'PUT',
+                    self._put_part,
+                    session,
+                    presigned_url,
+                    path,
+                    offset,
+                    length,
+                    headers)
+
+            if part_res.status_code == 404:
+                # upload expired or was aborted, so the next run starts it over
+                self._journal.record_closed(upload_id)
+
+            if part_res.status_code != 200:
+                # Why do we silence exceptions that get
+                # explicitly raised? Mystery for the ages, but
+                # there you have it I guess...
+                raise ApplicationError(
+                    f'Unable to complete upload of {path}')
+            etag = part_res.headers['ETag'].replace('"', '')
+            self._journal.record_part(upload_id, part, etag)
+
+            # parts finish in any order; they are sorted before completing the upload
+            with parts_lock:
+                parts.append({'ETag': etag, 'PartNumber': part})
+
+        part_numbers = [part for part in range(1, part_count + 1) if part not in upload['parts']]
+        with WorkerPool(count=max(min(self.part_concurrency, len(part_numbers)), 1)) as part_pool:
+            part_urls = self._iter_part_urls(dataset_version_id, key, upload_id, part_numbers)
+            for part, presigned_url in part_urls:
+                if part_pool.has_exception():
+                    part_urls.close()
+                    break
+                part_pool.put(put_part, part, presigned_url)
+
+        parts.sort(key=lambda p: p['PartNumber'])
+
+        r = self.client.generate_pre_signed_s3_url(
+            dataset_version_id,
+            method='completeMultipartUpload',
+            params={
+                'Key': key,
+                'UploadId': upload_id,
+                'MultipartUpload': {'Parts': parts}
+            },
+        )
+        self._journal.record_closed(upload_id)
+
+        # parts were verified one by one, this checks they were put together in order
+        etag = r.url.get('ETag') if isinstance(r.url, dict) else None
+        if config.VERIFY_TRANSFERS and parse_etag(etag)[1] is not None and \
+                composite_etag([p['ETag'] for p in parts]) != etag.strip('"'):
+            raise ApplicationError('Upload of {} does not match its ETag {}'.format(path, etag))
+        return r
+
+    def _sign_parts(self, dataset_version_id, key, upload_id, part_numbers):
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
+            dataset_version_id,
+            calls=[dict(method='uploadPart', params=dict(
+                Key=key, UploadId=upload_id, PartNumber=part)) for part in part_numbers],
+        )
+        return [pre_signed.url for pre_signed in pre_signeds]
+
+    def _iter_part_urls(self, dataset_version_id, key, upload_id, part_numbers):
+        """Yield (part number, pre-signed URL) pairs
+
+        URLs are signed in batches of PART_PRESIGN_BATCH_SIZE. The next batch is signed
+        in the background while parts of the current one are being uploaded
+        """
+        batches = [part_numbers[i:i + PART_PRESIGN_BATCH_SIZE]
+                   for i in range(0, len(part_numbers), PART_PRESIGN_BATCH_SIZE)]
+
+        def sign(batch):
+            # runs in the context of the upload so its spans are traced as its children
+            return tracing.copy_context().run(self._sign_parts, dataset_version_id, key, upload_id, batch)
+
+        with futures.ThreadPoolExecutor(max_workers=1) as signer:
+            next_urls = signer.submit(sign, batches[0]) if batches else None
+            for i, batch in enumerate(batches):
+                urls = next_urls.result()
+                if i + 1 < len(batches):
+                    next_urls = signer.submit(sign, batches[i + 1])
+                for part, url in zip(batch, urls):
+                    yield part, url
 
     @staticmethod
-    def _list_files(source_path):
+    def _put_part(session, url, path, offset, length, headers, limiter=None):
+        # part is streamed from the file in blocks, so memory of uploaders doesn't grow
+        # with part size. File is opened again on every attempt, so retries send it from the start
+        with open(path, 'rb') as f:
+            data = FileSlice(f, offset, length, limiter, ETagHasher())
+            r = session.put(url, data=data, headers=headers, timeout=PUT_TIMEOUT)
+
+        if r.ok:
+            verify_etag(r.headers.get('ETag'), data.hasher, '{} (part at {})'.format(path, offset))
+        return r
+
+    def _list_files(self, source_path, key_prefix):
+        """Yield (key, path) of files of a source path, sorted by key
+
+        :param str source_path: absolute path to a file or directory
+        :param str key_prefix: key of the file or prefix of keys of files of the directory
+        """
         if os.path.isfile(source_path):
-            yield True, source_path
+            yield key_prefix, source_path.replace(os.path.sep, '/')
             return
 
         if os.path.isdir(source_path):
-            for dir_path, _, names in os.walk(source_path):
-                for name in names:
-                    yield False, os.path.join(dir_path, name)
+            for key, (path, _) in self.iter_local_files(source_path, key_prefix):
+                yield key, path.replace(os.path.sep, '/')
             return
 
         raise ApplicationError('Invalid source path: ' + source_path)
 
+    def _list_parent_files(self, source_path, key_prefix):
+        """Yield (key, object) of objects of the version set with dedup_from at keys of files of a source path
+
+        :param str source_path: absolute path to a file or directory
+        :param str key_prefix: key of the file or prefix of keys of files of the directory
+        """
+        if not self._dedup_from:
+            return
+
+        if os.path.isfile(source_path):
+            result = self.get_object(self._dedup_from, key_prefix)
+            if result is not None:
+                yield key_prefix, result
+            return
+
+        for name, result in self.iter_remote_files(self._dedup_from, key_prefix):
+            yield key_prefix + name, result
+
+    def _copy(self, session, pre_signed, key, path):
+        state = get_file_state(path)
+
+        try:
+            self.copy_object(session, pre_signed, key)
+            self._journal.record_file(key, state)
+            self._progress.file_done()
+        except Exception as e:
+            self._fail_file(path, e)
+
+    def _sign_and_copy(self, dataset_version_id, pool, results, update_status):
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
+            dataset_version_id,
+            calls=[dict(method='copyObject', params=dict(
+                Key=r['key'], CopySource=self.copy_source(self._dedup_from, dataset_version_id, r['key'])))
+                for r in results],
+        )
+
+        with requests.Session() as session:
+            for pre_signed, result in zip(pre_signeds, results):
+                update_status()
+                self._progress.add_file()
+                pool.put(self._copy, session, pre_signed, result['key'], result['path'])
+
     def _sign_and_put(self, dataset_version_id, pool, results, update_status):
+        # planned files only hold key, path and size, the rest is worked out once they are scheduled
+        mimetypes_ = [mimetypes.guess_type(r['key'])[0] or 'application/octet-stream' for r in results]
         pre_signeds = self.client.generate_pre_signed_s3_urls(
             dataset_version_id,
             calls=[dict(method='putObject', params=dict(
-                Key=r['key'], ContentType=r['mimetype'])) for r in results],
+                Key=r['key'], ContentType=mimetype)) for r, mimetype in zip(results, mimetypes_)],
         )
 
         with requests.Session() as session:
-            for pre_signed, result in zip(pre_signeds, results):
+            for pre_signed, result, mimetype in zip(pre_signeds, results, mimetypes_):
                 update_status()
                 pool.put(self._put,
                          session,
                          result['path'],
                          pre_signed.url,
-                         content_type=result['mimetype'],
+                         content_type=mimetype,
                          dataset_version_id=dataset_version_id,
                          key=result['key'])
 
-    def execute(self, dataset_version_id, source_paths, target_path):
+    def execute(self, dataset_version_id, source_paths, target_path, part_concurrency=None,
+                max_part_concurrency=None, part_size=None, resume=False, dedup_from=None, max_bandwidth=None,
+                json_progress=False):
+        """
+        :param str dataset_version_id:
+        :param list[str] source_paths:
+        :param str target_path:
+        :param int part_concurrency: number of parts of a multipart upload sent at once.
+            PAPERSPACE_UPLOAD_PART_CONCURRENCY by default
+        :param int max_part_concurrency: number of parts sent at once across all files.
+            PAPERSPACE_UPLOAD_MAX_PART_CONCURRENCY by default
+        :param int part_size: size of parts of multipart uploads in bytes, between 5MiB and 5GiB.
+            Raised for files that wouldn't fit in 10000 parts. 15MB by default
+        :param bool resume: continue upload of the same source paths to the same target path that was interrupted.
+            Files uploaded since they last changed are skipped and multipart uploads are continued. Uploads left
+            open by an interrupted run are aborted if they can't be continued
+        :param str dedup_from: ID of another version of the dataset (ex: dataset_id:version). Files that are
+            the same as its objects at the same keys are copied from it by the storage provider instead of
+            being uploaded
+        :param float max_bandwidth: bytes per second uploaded across all files.
+            PAPERSPACE_MAX_BANDWIDTH or unlimited by default
+        :param bool json_progress: print progress as lines of JSON instead of a spinner
+        """
+        if part_size is not None and not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+            raise ApplicationError('Part size must be between {} and {} bytes'.format(MIN_PART_SIZE, MAX_PART_SIZE))
+
         self.assert_supported(dataset_version_id)
 
+        self.part_size = part_size
+        self._dedup_from = dedup_from
+
+        self.part_concurrency = part_concurrency or config.UPLOAD_PART_CONCURRENCY
+        self._part_slots = threading.BoundedSemaphore(max_part_concurrency or config.UPLOAD_MAX_PART_CONCURRENCY)
+        self.init_scheduler(max_bandwidth)
+        self.json_progress = json_progress
+
         if not target_path:
             target_path = '/'
         else:
@@ -740,99 +1511,295 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
             if not target_path.endswith('/'):
                 target_path += '/'
 
+        # every upload is journaled, so it can be resumed if it's interrupted
+        self._journal = TransferJournal.for_transfer(
+            'put', dataset_version_id, target_path, [os.path.abspath(p) for p in source_paths]).load()
+        self._failed = False
+        if not resume:
+            self._abort_stale_uploads(dataset_version_id)
+            self._journal.clear()
+
+        # keys of uploads left open by an interrupted run, removed once their files are planned again
+        stale_keys = set(upload['key'] for _, upload in self._journal.open_uploads())
+        self._hasher = futures.ThreadPoolExecutor(max_workers=HASH_WORKERS)
+        try:
+            self._put_all(dataset_version_id, source_paths, target_path, stale_keys)
+        finally:
+            self._hasher.shutdown()
+            self._journal.close()
+
+        # uploads of files that are not uploaded anymore can't be continued
+        self._abort_stale_uploads(dataset_version_id, keys=stale_keys)
+
+        # failed files are in the journal, so the version isn't committed without them
+        if self._failed:
+            raise ApplicationError('Some files were not uploaded. Run the command with --resume to upload them')
+        self._journal.clear()
+
+    def _abort_stale_uploads(self, dataset_version_id, keys=None):
+        """Abort multipart uploads left open in the journal
+
+        :param str dataset_version_id:
+        :param set[str] keys: keys of uploads to abort. All of them by default
+        """
+        with requests.Session() as session:
+            for upload_id, upload in self._journal.open_uploads():
+                if keys is not None and upload['key'] not in keys:
+                    continue
+
+                try:
+                    self._abort_upload(session, dataset_version_id, upload['key'], upload_id)
+                except Exception as e:
+                    # parts of the upload are left in the bucket, but that shouldn't stop new uploads
+                    self.logger.warning('Failed to abort upload of {}: {}'.format(upload['key'], e))
+        self._journal.close()
+
+    def _put_all(self, dataset_version_id, source_paths, target_path, stale_keys):
         status_text = 'Uploading files'
 
-        with halo.Halo(text=status_text, spinner='dots') as status:
+        with self.track_progress(status_text) as progress:
             with WorkerPool() as pool:
+                def update_status():
+                    progress.set_text(status_text)
+
+                # all files are planned before any is uploaded, so the largest of all source paths go first
+                results = []
                 for source_path in source_paths:
                     has_trailing_slash = source_path.endswith(os.path.sep)
                     source_path = os.path.abspath(source_path)
                     source_name = os.path.basename(source_path)
+                    progress.set_text('Planning upload: {}'.format(source_path))
 
-                    def update_status():
-                        status.text = '{}: {} ({})'.format(
-                            status_text, source_path, pool.completed_count())
+                    key_prefix = target_path
+                    if os.path.isfile(source_path):
+                        key_prefix += source_name
+                    elif not has_trailing_slash:
+                        key_prefix += source_name + '/'
+
+                    copies = []
 
-                    results = []
+                    def unfinished_files(files):
+                        for key, path, parent in files:
+                            if path is None:
+                                continue
 
-                    for source_path_is_file, path in self._list_files(source_path):
-                        path = path.replace(os.path.sep, '/')
+                            stale_keys.discard(key)
+                            state = get_file_state(path)
+                            if self._journal.is_finished(key, state):
+                                continue
 
-                        key = target_path
-                        if source_path_is_file:
-                            key += source_name
-                        else:
-                            if not has_trailing_slash:
-                                key += source_name + '/'
-                            key += path[len(source_path)+1:]
+                            yield key, (path, state[0]), parent if state[0] <= MAX_COPY_SIZE else None
 
-                        mimetype = mimetypes.guess_type(
-                            key)[0] or 'application/octet-stream'
+                    files = self.merge_sorted(self._list_files(source_path, key_prefix),
+                                              self._list_parent_files(source_path, key_prefix))
+                    for key, (path, size), _, unchanged in self.compare_files(unfinished_files(files),
+                                                                              self.part_size):
+                        # unchanged content is copied from the other version without crossing the wire
+                        if unchanged:
+                            copies.append(dict(key=key, path=path))
+                            if len(copies) == pool.worker_count:
+                                self._sign_and_copy(dataset_version_id, pool, copies, update_status)
+                                copies = []
+                            continue
 
-                        results.append(
-                            dict(key=key, path=path, mimetype=mimetype))
+                        results.append(dict(key=key, path=path, size=size))
+                        progress.add_file(size)
 
-                        if len(results) == pool.worker_count:
-                            self._sign_and_put(
-                                dataset_version_id, pool, results, update_status)
-                            results = []
+                    if copies:
+                        self._sign_and_copy(dataset_version_id, pool, copies, update_status)
 
-                    if results:
-                        self._sign_and_put(
-                            dataset_version_id, pool, results, update_status)
+                self.schedule(self._sign_and_put, dataset_version_id, pool, results, update_status)
 
 
 class DeleteDatasetFilesCommand(BaseDatasetFilesCommand):
 
-    @classmethod
-    def _delete(cls, url):
-        with requests.Session() as session:
-            try:
-                r = session.delete(url)
-                cls.validate_s3_response(r)
-            except requests.exceptions.ConnectionError as e:
-                return cls.report_connection_error(e)
+    def execute(self, dataset_version_id, paths, json_progress=False):
+        """Delete objects with deleteObjects requests of up to DELETE_BATCH_SIZE keys, sent at once by the workers
 
-    def execute(self, dataset_version_id, paths):
+        :param str dataset_version_id:
+        :param list[str] paths:
+        :param bool json_progress: print progress as lines of JSON instead of a spinner
+        :returns: number of deleted objects and of objects that failed to be deleted
+        :rtype: dict
+        """
         self.assert_supported(dataset_version_id)
+        self.json_progress = json_progress
 
         status_text = 'Deleting files'
 
-        with halo.Halo(text=status_text, spinner='dots') as status:
+        with self.track_progress(status_text) as progress:
             with WorkerPool() as pool:
                 for path in paths:
                     path = self.normalize_path(path)
-
-                    list_objects = None
                     has_trailing_slash = path.endswith('/')
 
                     def update_status():
-                        status.text = '{}: {} ({})'.format(
-                            status_text, path, pool.completed_count())
-
-                    if not has_trailing_slash:
-                        result = self.get_object(dataset_version_id, path)
-                        if result is not None:
-                            list_objects = [([result], False)]
-
-                    if not list_objects:
-                        list_objects = self.list_objects(
-                            dataset_version_id=dataset_version_id,
-                            path=path,
-                            recursive=True,
-                            absolute=True,
-                        )
-
-                    for results, _ in list_objects:
-                        if not results:
-                            break
-
-                        pre_signeds = self.client.generate_pre_signed_s3_urls(
-                            dataset_version_id,
-                            calls=[dict(method='deleteObject', params=dict(
-                                Key=r['key'])) for r in results],
-                        )
-
-                        for pre_signed in pre_signeds:
-                            update_status()
-                            pool.put(self._delete, url=pre_signed.url)
+                        progress.set_text('{}: {}'.format(status_text, path))
+
+                    # next page of keys is listed while the current one is deleted
+                    pages = prefetch(self.iter_objects(dataset_version_id, path, is_file=not has_trailing_slash),
+                                     size=PREFETCH_PAGES)
+                    for results in pages:
+                        self._delete_objects(dataset_version_id, pool, [r['key'] for r in results], update_status)
+
+        summary = dict(deleted=progress.files_done - progress.files_failed, failed=progress.files_failed)
+        # last line of JSON progress holds the same counts
+        if not json_progress:
+            self.logger.log('Deleted {deleted} files, {failed} failed'.format(**summary))
+        return summary
+
+
+class SyncPutDatasetFilesCommand(PutDatasetFilesCommand):
+    """Put only new or changed files of a directory, optionally deleting objects missing in it"""
+
+    def execute(self, dataset_version_id, source_path, target_path, delete=False, **kwargs):
+        """
+        :param str dataset_version_id:
+        :param str source_path: local directory
+        :param str target_path: dataset directory
+        :param bool delete: delete objects under target path that are not in source path
+        :param kwargs: options of PutDatasetFilesCommand.execute()
+        """
+        if not os.path.isdir(source_path):
+            raise ApplicationError('Source path is not a directory: ' + source_path)
+
+        self._delete_missing = delete
+        super(SyncPutDatasetFilesCommand, self).execute(
+            dataset_version_id, [source_path], target_path, **kwargs)
+
+    def _put_all(self, dataset_version_id, source_paths, target_path, stale_keys):
+        source_path = os.path.abspath(source_paths[0])
+        status_text = 'Syncing files'
+
+        with self.track_progress(status_text) as progress:
+            with WorkerPool() as pool:
+                def update_status():
+                    progress.set_text('{}: {}'.format(status_text, source_path))
+
+                results = []
+                missing = []
+
+                def unfinished_files(files):
+                    for name, local, remote in files:
+                        key = target_path + name
+                        # files uploaded since they last changed, e.g. by an interrupted sync, aren't hashed again
+                        if local is not None and remote is not None and \
+                                self._journal.is_finished(key, get_file_state(local[0])):
+                            continue
+                        yield key, local, remote
+
+                merged = self.merge_sorted(self.iter_local_files(source_path),
+                                           self.iter_remote_files(dataset_version_id, target_path))
+                for key, local, remote, unchanged in self.compare_files(unfinished_files(merged), self.part_size):
+                    if local is None:
+                        if self._delete_missing:
+                            missing.append(key.lstrip('/'))
+                    elif not unchanged:
+                        stale_keys.discard(key)
+                        results.append(dict(key=key, path=local[0].replace(os.path.sep, '/'), size=local[1]))
+                        progress.add_file(local[1])
+
+                    # changed files are scheduled in windows, so a large tree isn't held in memory
+                    if len(results) == SCHEDULE_WINDOW:
+                        self.schedule(self._sign_and_put, dataset_version_id, pool, results, update_status)
+                        results = []
+
+                    if len(missing) == DELETE_BATCH_SIZE:
+                        self._delete_objects(dataset_version_id, pool, missing, update_status)
+                        missing = []
+
+                if missing:
+                    self._delete_objects(dataset_version_id, pool, missing, update_status)
+                if results:
+                    self.schedule(self._sign_and_put, dataset_version_id, pool, results, update_status)
+
+
+class SyncGetDatasetFilesCommand(GetDatasetFilesCommand):
+    """Get only new or changed files of a dataset directory, optionally deleting local files missing in it"""
+
+    def execute(self, dataset_version_id, source_path, target_path, delete=False, **kwargs):
+        """
+        :param str dataset_version_id:
+        :param str source_path: dataset directory
+        :param str target_path: local directory
+        :param bool delete: delete files under target path that are not in source path
+        :param kwargs: options of GetDatasetFilesCommand.execute()
+        """
+        self._delete_missing = delete
+        super(SyncGetDatasetFilesCommand, self).execute(
+            dataset_version_id, [source_path or '/'], target_path, **kwargs)
+
+    def _get_all(self, dataset_version_id, source_paths, target_path):
+        source_path = self.normalize_path(source_paths[0])
+        if not source_path.endswith('/'):
+            source_path += '/'
+        status_text = 'Syncing files'
+
+        os.makedirs(target_path, exist_ok=True)
+        local_files = ((key, local) for key, local in self.iter_local_files(target_path)
+                       if not key.endswith(RANGED_DOWNLOAD_SUFFIX))
+
+        with self.track_progress(status_text) as progress:
+            with WorkerPool() as pool:
+                def update_status():
+                    progress.set_text('{}: {}'.format(status_text, source_path))
+
+                results = []
+
+                merged = self.merge_sorted(local_files, self.iter_remote_files(dataset_version_id, source_path))
+                for name, local, remote, unchanged in self.compare_files(merged):
+                    if remote is None:
+                        if self._delete_missing:
+                            os.remove(local[0])
+                    elif not unchanged:
+                        results.append(dict(remote, key=source_path[1:] + name,
+                                            path=os.path.join(target_path, *name.split('/'))))
+
+                    if len(results) == SCHEDULE_WINDOW:
+                        self.schedule(self._sign_and_get, dataset_version_id, pool, results, update_status)
+                        results = []
+
+                if results:
+                    self.schedule(self._sign_and_get, dataset_version_id, pool, results, update_status)
+
+    def _sign_and_get(self, dataset_version_id, pool, results, update_status):
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
+            dataset_version_id,
+            calls=[dict(method='getObject', params=dict(Key=r['key'])) for r in results],
+        )
+
+        for pre_signed, result in zip(pre_signeds, results):
+            update_status()
+            self._progress.add_file(result.get('size'))
+            pool.put(self._get, url=pre_signed.url, path=result['path'], key=result['key'],
+                     size=result.get('size'), etag=result.get('etag'))
+
+
+class CopyDatasetFilesCommand(BaseDatasetFilesCommand):
+    """Copy files between dataset versions on the storage provider, without downloading them"""
+
+    def execute(self, source_dataset_version_id, target_dataset_version_id, source_path='/', target_path='/',
+                part_concurrency=None, json_progress=False):
+        """
+        :param str source_dataset_version_id: Dataset version ID (ex: dataset_id:version) to copy files from
+        :param str target_dataset_version_id: Dataset version ID to copy files to
+        :param str source_path: file or directory to copy
+        :param str target_path: target directory, or path of the target file if source path is a file
+        :param int part_concurrency: number of parts of an object larger than 5GiB copied at once.
+            PAPERSPACE_UPLOAD_PART_CONCURRENCY by default
+        :param bool json_progress: print progress as lines of JSON instead of a spinner
+        """
+        self.assert_supported(source_dataset_version_id)
+        self.assert_supported(target_dataset_version_id)
+
+        source_dataset_version_id = self.resolve_dataset_version_id(source_dataset_version_id)
+        target_dataset_version_id = self.resolve_dataset_version_id(target_dataset_version_id)
+        self.json_progress = json_progress
+
+        with self.track_progress('Copying files') as progress:
+            count = self.client.copy_files(source_dataset_version_id, target_dataset_version_id,
+                                           source_path=source_path, target_path=target_path,
+                                           part_concurrency=part_concurrency, progress=progress)
+
+        if not count:
+            raise ApplicationError('No files found at %s' % self.normalize_path(source_path))
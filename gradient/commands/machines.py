@@ -7,7 +7,7 @@ from gradient.api_sdk.config import config
 from gradient.api_sdk.utils import concatenate_urls
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.commands import common, BaseCommand
-from gradient.commands.common import DetailsCommandMixin
+from gradient.commands.common import BulkAddTagsCommandMixin, BulkRemoveTagsCommandMixin, DetailsCommandMixin
 
 
 class GetMachinesClientMixin(object):
@@ -110,9 +110,9 @@ class ShowMachineCommand(DetailsCommandMixin, GetMachinesClientMixin, common.Bas
         return data
 
 
-class ListMachinesCommand(GetMachinesClientMixin, common.ListCommandMixin, BaseCommand):
+class ListMachinesCommand(GetMachinesClientMixin, common.StreamingListCommandMixin, BaseCommand):
     def _get_instances(self, kwargs):
-        instances = self.client.list(**kwargs)
+        instances = self.client.iter(**kwargs)
         return instances
 
     def _get_table_data(self, machines):
@@ -182,3 +182,11 @@ class MachineRemoveTagsCommand(GetMachinesClientMixin, BaseCommand):
     def execute(self, machine_id, *args, **kwargs):
         self.client.remove_tags(machine_id, **kwargs)
         self.logger.log("Tags removed from machine")
+
+
+class MachineAddTagsBulkCommand(GetMachinesClientMixin, BulkAddTagsCommandMixin, BaseCommand):
+    pass
+
+
+class MachineRemoveTagsBulkCommand(GetMachinesClientMixin, BulkRemoveTagsCommandMixin, BaseCommand):
+    pass
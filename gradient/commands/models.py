@@ -6,7 +6,8 @@ import six
 from gradient import api_sdk, exceptions, cli_constants
 from gradient.api_sdk import sdk_exceptions
 from gradient.api_sdk.s3_downloader import ModelFilesDownloader
-from gradient.commands.common import BaseCommand, ListCommandMixin, DetailsCommandMixin
+from gradient.commands.common import BaseCommand, DetailsCommandMixin, BulkAddTagsCommandMixin, \
+    BulkRemoveTagsCommandMixin, StreamingListCommandMixin
 from gradient.exceptions import ApplicationError
 
 
@@ -21,15 +22,14 @@ class GetModelsClientMixin:
         return client
 
 
-class ListModelsCommand(GetModelsClientMixin, ListCommandMixin, BaseCommand):
+class ListModelsCommand(GetModelsClientMixin, StreamingListCommandMixin, BaseCommand):
     def _get_instances(self, kwargs):
         try:
-            instances = self.client.list(**kwargs)
+            for instance in self.client.iter(**kwargs):
+                yield instance
         except sdk_exceptions.GradientSdkError as e:
             raise exceptions.ReceivingDataFailedError(e)
 
-        return instances
-
     def _get_table_data(self, models):
         data = [("Name", "ID", "Model Type", "Project ID")]
         for model in models:
@@ -112,3 +112,11 @@ class MLModelRemoveTagsCommand(GetModelsClientMixin, BaseCommand):
     def execute(self, ml_model_id, *args, **kwargs):
         self.client.remove_tags(ml_model_id, **kwargs)
         self.logger.log("Tags removed from ml model")
+
+
+class MLModelAddTagsBulkCommand(GetModelsClientMixin, BulkAddTagsCommandMixin, BaseCommand):
+    pass
+
+
+class MLModelRemoveTagsBulkCommand(GetModelsClientMixin, BulkRemoveTagsCommandMixin, BaseCommand):
+    pass
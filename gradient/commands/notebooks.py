@@ -12,7 +12,7 @@ from gradient.api_sdk import sdk_exceptions
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.cliutils import get_terminal_lines
 from gradient.commands.common import BaseCommand, ListCommandMixin, DetailsCommandMixin, StreamMetricsCommand, \
-    LogsCommandMixin
+    LogsCommandMixin, BulkAddTagsCommandMixin, BulkRemoveTagsCommandMixin
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -141,6 +141,14 @@ class NotebookRemoveTagsCommand(BaseNotebookCommand):
         self.logger.log("Tags removed from notebook")
 
 
+class NotebookAddTagsBulkCommand(BulkAddTagsCommandMixin, BaseNotebookCommand):
+    pass
+
+
+class NotebookRemoveTagsBulkCommand(BulkRemoveTagsCommandMixin, BaseNotebookCommand):
+    pass
+
+
 class GetNotebookMetricsCommand(BaseNotebookCommand):
     def execute(self, notebook_id, start, end, interval, built_in_metrics, *args, **kwargs):
         metrics = self.client.get_metrics(
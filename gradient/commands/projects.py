@@ -8,7 +8,8 @@ from gradient.api_sdk import sdk_exceptions
 from gradient.api_sdk.config import config
 from gradient.api_sdk.utils import concatenate_urls
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
-from .common import BaseCommand, ListCommandMixin, DetailsCommandMixin
+from .common import BaseCommand, ListCommandMixin, DetailsCommandMixin, BulkAddTagsCommandMixin, \
+    BulkRemoveTagsCommandMixin
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -74,6 +75,14 @@ class ProjectRemoveTagsCommand(BaseProjectCommand):
         self.logger.log("Tags removed from project")
 
 
+class ProjectAddTagsBulkCommand(BulkAddTagsCommandMixin, BaseProjectCommand):
+    pass
+
+
+class ProjectRemoveTagsBulkCommand(BulkRemoveTagsCommandMixin, BaseProjectCommand):
+    pass
+
+
 class ShowProjectDetailsCommand(DetailsCommandMixin, BaseProjectCommand):
     def _get_table_data(self, instance):
         """
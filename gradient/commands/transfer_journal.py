@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+
+from gradient.api_sdk.config import config
+
+
+def get_file_state(path):
+    """Get size and modification time of a file, used to tell if it changed since it was journaled
+
+    :param str path:
+    :rtype: list[int]
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class TransferJournal(object):
+    def __init__(self, path):
+        """Append-only record of the progress of a transfer, used to resume it after an interruption
+
+        Every line of the file is a JSON record of a finished file, an open multipart upload,
+        a completed part of an upload, an upload that was closed (completed or aborted),
+        a started download of a file in ranges or a finished range of a download.
+        A line cut off by a crash is ignored when the journal is loaded.
+
+        :param str path: path to the journal file
+        """
+        self.path = path
+        self.files = {}
+        self.uploads = {}
+        self.downloads = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def for_transfer(cls, *transfer):
+        """Get journal of a transfer, e.g. of putting the same source paths to the same dataset version
+
+        Journals are kept in the transfers directory of the config directory (~/.paperspace/transfers)
+
+        :param transfer: JSON serializable values identifying the transfer
+        :rtype: TransferJournal
+        """
+        name = hashlib.sha1(json.dumps(transfer, sort_keys=True).encode("utf-8")).hexdigest()
+        return cls(os.path.join(config.CONFIG_DIR_PATH, "transfers", name + ".jsonl"))
+
+    def load(self):
+        self.files = {}
+        self.uploads = {}
+        self.downloads = {}
+
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._apply(record)
+        except (IOError, OSError):
+            pass
+
+        return self
+
+    def _apply(self, record):
+        type_ = record.get("type")
+        if type_ == "file":
+            self.files[record["key"]] = record["state"]
+        elif type_ == "upload":
+            self.uploads[record["upload_id"]] = dict(
+                key=record["key"], state=record["state"], part_size=record["part_size"], parts={})
+        elif type_ == "part" and record["upload_id"] in self.uploads:
+            self.uploads[record["upload_id"]]["parts"][record["part"]] = record["etag"]
+        elif type_ == "closed":
+            self.uploads.pop(record["upload_id"], None)
+        elif type_ == "download":
+            self.downloads[record["key"]] = dict(state=record["state"], part_size=record["part_size"], parts={})
+        elif type_ == "range" and record["key"] in self.downloads:
+            self.downloads[record["key"]]["parts"][record["part"]] = record.get("md5")
+
+    def _write(self, **record):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._apply(record)
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "a")
+            self._file.write(line)
+            # flushed on every record so nothing is lost if the process is killed
+            self._file.flush()
+
+    def is_finished(self, key, state):
+        """Check if file was uploaded and hasn't changed since then
+
+        :param str key:
+        :param list[int] state: see get_file_state()
+        :rtype: bool
+        """
+        with self._lock:
+            return self.files.get(key) == state
+
+    def find_upload(self, key):
+        """Get open multipart upload of a key
+
+        :param str key:
+        :returns: upload ID and upload (dict with key, state, part_size and parts) or (None, None)
+        :rtype: tuple[str|None, dict|None]
+        """
+        with self._lock:
+            for upload_id, upload in self.uploads.items():
+                if upload["key"] == key:
+                    return upload_id, dict(upload, parts=dict(upload["parts"]))
+        return None, None
+
+    def find_download(self, key):
+        """Get download of a key in ranges
+
+        :param str key:
+        :returns: dict with state, part_size and MD5s of finished parts by part number or None
+        :rtype: dict|None
+        """
+        with self._lock:
+            download = self.downloads.get(key)
+            return dict(download, parts=dict(download["parts"])) if download else None
+
+    def open_uploads(self):
+        """
+        :rtype: list[tuple[str, dict]]
+        """
+        with self._lock:
+            return list(self.uploads.items())
+
+    def record_file(self, key, state):
+        self._write(type="file", key=key, state=state)
+
+    def record_upload(self, upload_id, key, state, part_size):
+        self._write(type="upload", upload_id=upload_id, key=key, state=state, part_size=part_size)
+
+    def record_part(self, upload_id, part, etag):
+        self._write(type="part", upload_id=upload_id, part=part, etag=etag)
+
+    def record_closed(self, upload_id):
+        self._write(type="closed", upload_id=upload_id)
+
+    def record_download(self, key, state, part_size):
+        self._write(type="download", key=key, state=state, part_size=part_size)
+
+    def record_range(self, key, part, md5=None):
+        self._write(type="range", key=key, part=part, md5=md5)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self):
+        """Remove the journal file and forget all records"""
+        self.close()
+        with self._lock:
+            self.files = {}
+            self.uploads = {}
+            self.downloads = {}
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,207 @@
+import collections
+import json
+import sys
+import threading
+import time
+
+import halo
+
+REFRESH_INTERVAL = 0.5  # seconds
+THROUGHPUT_WINDOW = 5  # seconds of transfer the current throughput is measured over
+
+
+def format_size(size):
+    """
+    :param int size: bytes
+    :rtype: str
+    """
+    if abs(size) < 1000:
+        return '{} B'.format(int(size))
+
+    for unit in ('kB', 'MB', 'GB', 'TB'):
+        size /= 1000.0
+        if abs(size) < 1000 or unit == 'TB':
+            return '{:.1f} {}'.format(size, unit)
+
+
+def format_duration(seconds):
+    """
+    :param float seconds:
+    :rtype: str
+    """
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return '{}:{:02}:{:02}'.format(hours, minutes, seconds)
+
+
+class TransferProgress(object):
+    def __init__(self, text, json_output=False, refresh_interval=REFRESH_INTERVAL, stream=None):
+        """Progress of all files of a transfer, updated by worker threads and rendered at a fixed rate
+
+        Rendered in a spinner, or as lines of JSON when json_output is set, e.g. for CI logs
+
+        :param str text: e.g. "Uploading files"
+        :param bool json_output:
+        :param float refresh_interval: seconds between renders
+        :param stream: where lines of JSON are written. Standard output by default
+        """
+        self.text = text
+        self.json_output = json_output
+        self.refresh_interval = refresh_interval
+        self.stream = stream
+
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.files_total = 0
+        self.files_failed = 0
+        self._transferred = 0
+        self._samples = collections.deque()
+        self._started = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._spinner = None
+
+    def set_text(self, text):
+        self.text = text
+
+    def add_file(self, size=0):
+        """Count a file queued for transfer
+
+        :param int size: bytes to transfer
+        """
+        with self._lock:
+            self.files_total += 1
+            self.bytes_total += int(size or 0)
+
+    def file_done(self, failed=False):
+        with self._lock:
+            self.files_done += 1
+            if failed:
+                self.files_failed += 1
+
+    def add_bytes(self, amount):
+        """Count bytes sent or received. Negative amount takes back bytes of a failed attempt
+
+        :param int amount:
+        """
+        with self._lock:
+            self.bytes_done += amount
+            self._transferred += amount
+
+    def skip_bytes(self, amount):
+        """Count bytes transferred by an interrupted run, e.g. of a resumed upload, without counting them in throughput
+
+        :param int amount:
+        """
+        with self._lock:
+            self.bytes_done += amount
+
+    def snapshot(self):
+        """
+        :returns: dict with text, bytes_done, bytes_total, files_done, files_total, files_failed,
+            throughput [bytes/s], eta [s] (None while unknown) and elapsed [s]
+        :rtype: dict
+        """
+        now = time.monotonic()
+        with self._lock:
+            progress = dict(
+                text=self.text,
+                bytes_done=self.bytes_done,
+                bytes_total=self.bytes_total,
+                files_done=self.files_done,
+                files_total=self.files_total,
+                files_failed=self.files_failed,
+            )
+            transferred = self._transferred
+
+            self._samples.append((now, transferred))
+            while len(self._samples) > 2 and now - self._samples[1][0] >= THROUGHPUT_WINDOW:
+                self._samples.popleft()
+            since, transferred_since = self._samples[0]
+
+        throughput = (transferred - transferred_since) / (now - since) if now > since else 0.0
+        remaining = progress['bytes_total'] - progress['bytes_done']
+        progress.update(
+            throughput=throughput,
+            eta=remaining / throughput if throughput > 0 else None,
+            elapsed=now - self._started if self._started else 0.0,
+        )
+        return progress
+
+    def render(self, progress=None):
+        """
+        :param dict progress: result of snapshot()
+        :rtype: str
+        """
+        progress = progress or self.snapshot()
+        parts = []
+        if progress['bytes_total']:
+            parts.append('{} of {}'.format(format_size(progress['bytes_done']), format_size(progress['bytes_total'])))
+        parts.append('{} of {} files'.format(progress['files_done'], progress['files_total']))
+        if progress['files_failed']:
+            parts.append('{} failed'.format(progress['files_failed']))
+        if progress['throughput'] > 0:
+            parts.append('{}/s'.format(format_size(progress['throughput'])))
+        if progress['eta'] is not None:
+            parts.append('ETA {}'.format(format_duration(progress['eta'])))
+        return '{} ({})'.format(progress['text'], ', '.join(parts))
+
+    def _write_json(self, finished=False):
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(dict(self.snapshot(), finished=finished)) + '\n')
+        stream.flush()
+
+    def _refresh(self):
+        while not self._stopped.wait(self.refresh_interval):
+            if self.json_output:
+                self._write_json()
+            else:
+                self._spinner.text = self.render()
+
+    def __enter__(self):
+        self._started = time.monotonic()
+        self._samples.append((self._started, 0))
+        if not self.json_output:
+            self._spinner = halo.Halo(text=self.text, spinner='dots')
+            self._spinner.start()
+
+        self._thread = threading.Thread(target=self._refresh)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stopped.set()
+        self._thread.join()
+
+        if self.json_output:
+            self._write_json(finished=True)
+        else:
+            self._spinner.stop()
+
+
+class Attempt(object):
+    def __init__(self, progress, limiter=None):
+        """Meter of one attempt of a request transferring file content
+
+        Counts bytes in progress at the rate of the limiter. Bytes are taken back
+        if the attempt fails, so retried requests aren't counted twice
+
+        :param TransferProgress progress:
+        :param gradient.commands.transfer_scheduler.BandwidthLimiter limiter:
+        """
+        self.progress = progress
+        self.limiter = limiter
+        self.count = 0
+
+    def consume(self, amount):
+        if self.limiter is not None:
+            self.limiter.consume(amount)
+        self.count += amount
+        self.progress.add_bytes(amount)
+
+    def cancel(self):
+        self.progress.add_bytes(-self.count)
+        self.count = 0
@@ -0,0 +1,133 @@
+import contextlib
+import os
+import threading
+import time
+
+
+class BandwidthLimiter(object):
+    def __init__(self, rate, burst=None):
+        """Token bucket capping bytes per second of all transfers sharing it
+
+        :param float rate: bytes per second
+        :param float burst: bytes that can be transferred at once after idling. One second of transfer by default
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        """Take tokens for amount of bytes, waiting until the bucket refills if it doesn't hold them
+
+        Tokens are taken at once and the bucket goes into debt, so chunks larger than the bucket
+        still pass and transfers waiting together are served in the order they came
+
+        :param int amount:
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+class FileSlice(object):
+    def __init__(self, f, offset, length, limiter=None, hasher=None):
+        """File-like view of length bytes of an open file from offset
+
+        requests takes Content-Length from len() and sends it in blocks read straight from the file,
+        so a part of any size only takes a block of memory. seek() rewinds it to send it again
+        without copying anything
+
+        :param f: file opened in binary mode
+        :param int offset:
+        :param int length:
+        :param BandwidthLimiter limiter: anything with consume(), called with the size of every block read
+        :param hasher: anything with update() and reset(), updated with every block read in the same pass.
+            Unset if the slice is moved anywhere but its start
+        """
+        self._f = f
+        self.offset = offset
+        self.length = length
+        self._position = 0
+        self._limiter = limiter
+        self.hasher = hasher
+
+    def __len__(self):
+        return self.length
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.length
+        offset = min(max(offset, 0), self.length)
+        if self.hasher is not None and offset != self._position:
+            if offset == 0:
+                self.hasher.reset()
+            else:
+                self.hasher = None
+        self._position = offset
+        return self._position
+
+    def read(self, size=-1):
+        remaining = self.length - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+
+        # seeking before every block keeps reads in the slice after a rewind
+        self._f.seek(self.offset + self._position)
+        data = self._f.read(size)
+        self._position += len(data)
+        if self._limiter is not None:
+            self._limiter.consume(len(data))
+        if self.hasher is not None:
+            self.hasher.update(data)
+        return data
+
+
+class ByteBudget(object):
+    def __init__(self, limit):
+        """Caps bytes of requests in flight across all workers of a command
+
+        A request larger than the whole budget waits until nothing else is in flight and runs alone
+
+        :param int limit: bytes
+        """
+        self.limit = limit
+        self._used = 0
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def reserve(self, amount):
+        with self._condition:
+            while self._used and self._used + amount > self.limit:
+                self._condition.wait()
+            self._used += amount
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._used -= amount
+                self._condition.notify_all()
+
+
+def largest_first(results):
+    """Sort objects or files to transfer by size, largest first
+
+    Transfers of large files are started while there are still small ones left to fill in the workers
+    at the end, which shortens the total time of the transfer
+
+    :param list[dict] results: dicts with size
+    :rtype: list[dict]
+    """
+    return sorted(results, key=lambda r: int(r.get('size') or 0), reverse=True)
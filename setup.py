@@ -52,7 +52,7 @@ setup(
         'Programming Language :: Python :: 3.8',
     ],
     keywords='paperspace api development library',
-    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'old_tests']),
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'old_tests', 'benchmarks']),
     install_requires=[
         'requests[security]',
         'six',
@@ -88,6 +88,9 @@ setup(
             'sphinx-click',
             'recommonmark'
         ],
+        "async": [
+            'aiohttp>=3.6',
+        ],
     },
     cmdclass={
         'verify': VerifyVersionCommand,
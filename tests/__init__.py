@@ -1,3 +1,6 @@
+import json
+
+
 class MockResponse:
     def __init__(self, json_data=None, status_code=200, content="", headers=None, request=None):
         """
@@ -10,6 +13,7 @@ class MockResponse:
         self.url = "example.com"
         self.headers = headers
         self.request = request
+        self.closed = False
 
     @property
     def ok(self):
@@ -19,3 +23,14 @@ class MockResponse:
         if self.json_data is None:
             raise ValueError("No JSON")
         return self.json_data
+
+    def iter_content(self, chunk_size=1):
+        content = json.dumps(self.json_data).encode() if self.json_data is not None else self.content
+        if isinstance(content, str):
+            content = content.encode()
+
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
@@ -26,7 +26,7 @@ class TestListDatasets(object):
 +-------+-----------------+-------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_list_datasets(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -59,7 +59,7 @@ class TestShowDatasetDetails(object):
 +-----------------+-------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_show_dataset_details(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -82,7 +82,7 @@ class TestCreateDataset(object):
     STDOUT = """Created dataset: dsttn2y7j1ux882
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_create_dataset(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -108,7 +108,7 @@ class TestUpdateDataset(object):
     STDOUT = """Updated dataset: dsttn2y7j1ux882
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_update_dataset(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -132,7 +132,7 @@ class TestDeleteDataset(object):
     STDOUT = """Deleted dataset: dsttn2y7j1ux882
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_delete_dataset(self, method):
         method.return_value = MockResponse(status_code=204)
 
@@ -159,7 +159,7 @@ class TestListDatasetVersions(object):
 +-------------------------+---------+-------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_list_dataset_versions(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -193,7 +193,7 @@ class TestShowDatasetVersionDetails(object):
 +-----------+-------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_show_dataset_details(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -216,7 +216,7 @@ class TestUpdateDatasetVersion(object):
     STDOUT = """Updated dataset version: dsttn2y7j1ux882:1rn19s2
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_update_dataset_version(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -240,7 +240,7 @@ class TestDeleteDatasetVersion(object):
     STDOUT = """Deleted dataset version: dsttn2y7j1ux882:1rn19s2
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_delete_dataset_version(self, method):
         method.return_value = MockResponse(status_code=204)
 
@@ -263,7 +263,7 @@ class TestSetDatasetTag(object):
     STDOUT = """Set dataset tag: dsttn2y7j1ux882:hello
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
     def test_update_dataset_version(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -286,7 +286,7 @@ class TestDeleteDatasetTag(object):
     STDOUT = """Deleted dataset tag: dsttn2y7j1ux882:hello
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_update_dataset_version(self, method):
         method.return_value = MockResponse()
 
@@ -35,7 +35,7 @@ class TestMachineAvailability(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Failed to fetch data: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_valid_message_when_availability_command_was_used(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON, 200)
 
@@ -49,7 +49,7 @@ class TestMachineAvailability(object):
                                        params=self.PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON, 200)
 
@@ -63,7 +63,7 @@ class TestMachineAvailability(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, machines_availability_config_path):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_availability_config_path]
@@ -78,7 +78,7 @@ class TestMachineAvailability(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_availability_command_was_used_with_invalid_api_token(self,
                                                                                                         get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
@@ -93,7 +93,7 @@ class TestMachineAvailability(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -107,7 +107,7 @@ class TestMachineAvailability(object):
         assert result.output == "Unknown error while checking machine availability\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -237,7 +237,7 @@ class TestCreateMachine(object):
         "--email", "some@email.com",
     ]
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machine_create_was_used_with_requested_options(self, get_patched):
         get_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE, 200)
 
@@ -253,7 +253,7 @@ class TestCreateMachine(object):
                                        data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machine_create_was_used_with_all_options(self, post_patched):
         post_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE, 200)
 
@@ -269,7 +269,7 @@ class TestCreateMachine(object):
                                         data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE, 200)
 
@@ -285,7 +285,7 @@ class TestCreateMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, machines_create_config_path):
         post_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_create_config_path]
@@ -302,7 +302,7 @@ class TestCreateMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_wrong_api_key_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -318,7 +318,7 @@ class TestCreateMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_wrong_template_id_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_TEMPLATE_ID, 400)
 
@@ -334,7 +334,7 @@ class TestCreateMachine(object):
         assert result.output == "Failed to create resource: templateId not found\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -350,7 +350,7 @@ class TestCreateMachine(object):
         assert result.output == "Failed to create resource\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_mutually_exclusive_options_were_used(self, get_patched):
         cli_runner = CliRunner()
         result = cli_runner.invoke(cli.cli, self.BASIC_COMMAND_WITH_MUTUALLY_EXCLUSIVE_OPTIONS_USED)
@@ -360,9 +360,9 @@ class TestCreateMachine(object):
                in result.output
         assert result.exit_code == 2
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_proper_data_and_tag_machine(self, post_patched, get_patched, put_patched):
         post_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE, 200)
         get_patched.return_value = MockResponse({}, 200)
@@ -427,7 +427,7 @@ class TestDestroyMachine(object):
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Failed to delete resource: Not found. " \
                                                  "Please contact support@paperspace.com for help.\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machines_destroy_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -443,7 +443,7 @@ class TestDestroyMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machines_destroy_was_used_with_all_options(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -459,7 +459,7 @@ class TestDestroyMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, machines_destroy_config_path):
         post_patched.return_value = MockResponse()
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_destroy_config_path]
@@ -476,7 +476,7 @@ class TestDestroyMachine(object):
                                         data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machines_destroy_was_used_with_api_key_option(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -492,7 +492,7 @@ class TestDestroyMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machines_destroy_was_used_with_wrong_api_key(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -508,7 +508,7 @@ class TestDestroyMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_machine_with_given_id_was_not_found(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_404_MACHINE_NOT_FOUND,
                                                  status_code=400)
@@ -525,7 +525,7 @@ class TestDestroyMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -636,7 +636,7 @@ class TestListMachines(object):
         "--name", "some_name",
     ]
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_machines_list_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -647,10 +647,11 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS,
                                        json=None,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_all_options_were_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
 
@@ -661,10 +662,11 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                        json=self.ALL_OPTIONS_REQUEST_JSON,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_all_options_were_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
 
@@ -675,10 +677,11 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                        json=self.ALL_OPTIONS_REQUEST_JSON,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_params_option_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -688,11 +691,12 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS,
                                        json=self.REQUEST_JSON_WITH_PARAMS_OPTION,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_list_was_used_with_api_key_option(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -702,11 +706,12 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                        json=None,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, machines_list_config_path):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_list_config_path]
@@ -717,11 +722,12 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                        json=self.ALL_OPTIONS_REQUEST_JSON,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_list_was_used_with_wrong_api_key(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -731,11 +737,12 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                        json=None,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_no_machine_was_not_found(self, get_patched):
         get_patched.return_value = MockResponse(json_data=[], status_code=200)
 
@@ -745,11 +752,12 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS,
                                        json=None,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.output == self.EXPECTED_STDOUT_WHEN_NO_MACHINES_WERE_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -759,11 +767,12 @@ class TestListMachines(object):
         get_patched.assert_called_with(self.URL,
                                        headers=EXPECTED_HEADERS,
                                        json=None,
-                                       params=None)
+                                       params=None,
+                                       stream=True)
         assert result.output == "Failed to fetch data\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_params_option_was_used_with_mutually_exclusive_option(self, get_patched):
         cli_runner = CliRunner()
         result = cli_runner.invoke(cli.cli, self.COMMAND_WITH_MUTUALLY_EXCLUSIVE_OPTIONS)
@@ -802,7 +811,7 @@ class TestRestartMachine(object):
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Unable to restart instance: Not found. " \
                                                  "Please contact support@paperspace.com for help.\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_get_request_and_print_valid_message_when_restart_command_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -818,7 +827,7 @@ class TestRestartMachine(object):
                                         data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -834,7 +843,7 @@ class TestRestartMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_config_file(self, post_patched, machines_restart_config_path):
         post_patched.return_value = MockResponse()
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_restart_config_path]
@@ -851,7 +860,7 @@ class TestRestartMachine(object):
                                         data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_start_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -867,7 +876,7 @@ class TestRestartMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -883,7 +892,7 @@ class TestRestartMachine(object):
         assert result.output == "Unable to restart instance\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_machine_with_given_id_was_not_found(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_404_MACHINE_NOT_FOUND,
                                                  status_code=400)
@@ -958,7 +967,7 @@ class TestShowMachine(object):
     }
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Failed to fetch data: Machine not found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_machines_list_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -972,7 +981,7 @@ class TestShowMachine(object):
                                        params=self.REQUEST_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_show_was_used_with_api_key_option(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -986,7 +995,7 @@ class TestShowMachine(object):
         assert result.output.strip() == self.EXPECTED_STDOUT.strip()
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, machines_show_config_path):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_show_config_path]
@@ -1001,7 +1010,7 @@ class TestShowMachine(object):
                                        params=self.REQUEST_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_list_was_used_with_wrong_api_key(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -1015,7 +1024,7 @@ class TestShowMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_machine_was_not_found(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_MACHINE_WAS_NOT_FOUND,
                                                 status_code=404)
@@ -1030,7 +1039,7 @@ class TestShowMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -1074,7 +1083,7 @@ class TestStartMachine(object):
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Unable to start instance: Not found. " \
                                                  "Please contact support@paperspace.com for help.\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_get_request_and_print_valid_message_when_start_command_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -1090,7 +1099,7 @@ class TestStartMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -1106,7 +1115,7 @@ class TestStartMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, machines_start_config_path):
         post_patched.return_value = MockResponse()
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_start_config_path]
@@ -1123,7 +1132,7 @@ class TestStartMachine(object):
                                         data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_start_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -1139,7 +1148,7 @@ class TestStartMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -1155,7 +1164,7 @@ class TestStartMachine(object):
         assert result.output == "Unable to start instance\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_machine_with_given_id_was_not_found(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_404_MACHINE_NOT_FOUND,
                                                  status_code=400)
@@ -1202,7 +1211,7 @@ class TestStopMachine(object):
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Unable to stop instance: Not found. " \
                                                  "Please contact support@paperspace.com for help.\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_get_request_and_print_valid_message_when_stop_command_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -1218,7 +1227,7 @@ class TestStopMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=200)
 
@@ -1234,7 +1243,7 @@ class TestStopMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, machines_stop_config_path):
         post_patched.return_value = MockResponse()
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_stop_config_path]
@@ -1251,7 +1260,7 @@ class TestStopMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_stop_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -1267,7 +1276,7 @@ class TestStopMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -1283,7 +1292,7 @@ class TestStopMachine(object):
         assert result.output == "Unable to stop instance\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_machine_with_given_id_was_not_found(self, post_patched):
         post_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_404_MACHINE_NOT_FOUND,
                                                  status_code=400)
@@ -1345,7 +1354,7 @@ class TestUpdateMachine(object):
 
     RESPONSE_JSON_WITH_WRONG_MACHINE_ID = {"error": {"name": "Error", "status": 404, "message": "Not found"}}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machine_create_was_used_with_requested_options(self, get_patched):
         get_patched.return_value = MockResponse({}, 200)
 
@@ -1361,7 +1370,7 @@ class TestUpdateMachine(object):
                                        data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_valid_post_request_when_machine_create_was_used_with_all_options(self, get_patched):
         get_patched.return_value = MockResponse({}, 200)
 
@@ -1377,7 +1386,7 @@ class TestUpdateMachine(object):
                                        data=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, get_patched):
         get_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE, 200)
 
@@ -1393,7 +1402,7 @@ class TestUpdateMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, get_patched, machines_update_config_path):
         get_patched.return_value = MockResponse(example_responses.CREATE_MACHINE_RESPONSE, 200)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_update_config_path]
@@ -1410,7 +1419,7 @@ class TestUpdateMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_wrong_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -1426,7 +1435,7 @@ class TestUpdateMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_wrong_machine_id_was_used(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_MACHINE_ID, 400)
 
@@ -1442,7 +1451,7 @@ class TestUpdateMachine(object):
         assert result.output == "Failed to update resource: Not found\n"
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_error_message_when_no_content_was_received_in_response(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -1499,7 +1508,7 @@ class TestShowMachineUtilization(object):
     }
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Failed to fetch data: Machine not found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_machines_utilizaation_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -1513,7 +1522,7 @@ class TestShowMachineUtilization(object):
                                        params=self.REQUEST_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_utilization_was_used_with_api_key_option(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -1527,7 +1536,7 @@ class TestShowMachineUtilization(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, machines_utilization_config_path):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_utilization_config_path]
@@ -1542,7 +1551,7 @@ class TestShowMachineUtilization(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_utilization_was_used_with_wrong_api_key(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -1556,7 +1565,7 @@ class TestShowMachineUtilization(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_machine_was_not_found(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_MACHINE_WAS_NOT_FOUND,
                                                 status_code=404)
@@ -1571,7 +1580,7 @@ class TestShowMachineUtilization(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -1618,7 +1627,7 @@ class TestWaitForMachine(object):
     }
     EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND = "Failed to fetch data: Machine not found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_and_print_table_when_machines_waitfor_was_used(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -1632,7 +1641,7 @@ class TestWaitForMachine(object):
                                        params=self.REQUEST_PARAMS)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_waitfor_was_used_with_api_key_option(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.EXPECTED_RESPONSE_JSON, status_code=200)
 
@@ -1646,7 +1655,7 @@ class TestWaitForMachine(object):
         assert result.output == self.EXPECTED_STDOUT
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_post_request_when_machines_waitfor_was_used_with_wrong_api_key(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
 
@@ -1660,7 +1669,7 @@ class TestWaitForMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, machines_waitfor_config_path):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, status_code=400)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + [machines_waitfor_config_path]
@@ -1675,7 +1684,7 @@ class TestWaitForMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WITH_WRONG_API_TOKEN
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_machine_was_not_found(self, get_patched):
         get_patched.return_value = MockResponse(json_data=self.RESPONSE_JSON_WHEN_MACHINE_WAS_NOT_FOUND,
                                                 status_code=404)
@@ -1690,7 +1699,7 @@ class TestWaitForMachine(object):
         assert result.output == self.EXPECTED_STDOUT_WHEN_MACHINE_WAS_NOT_FOUND
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_error_message_when_error_status_code_received_but_no_content_was_provided(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
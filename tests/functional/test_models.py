@@ -42,7 +42,7 @@ class TestModelsList(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {
         "status": 401, "message": "No such API token"}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_list_of_models(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.LIST_MODELS_RESPONSE_JSON)
@@ -54,11 +54,12 @@ class TestModelsList(object):
         get_patched.assert_called_once_with(self.URL,
                                             headers=EXPECTED_HEADERS,
                                             json=None,
-                                            params={"limit": -1})
+                                            params={"limit": -1},
+                                            stream=True)
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_replate_api_key_in_headers_when_api_key_parameter_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.LIST_MODELS_RESPONSE_JSON)
@@ -70,12 +71,13 @@ class TestModelsList(object):
         get_patched.assert_called_once_with(self.URL,
                                             headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                             json=None,
-                                            params={"limit": -1})
+                                            params={"limit": -1},
+                                            stream=True)
 
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, models_list_config_path):
         get_patched.return_value = MockResponse(
             example_responses.LIST_MODELS_RESPONSE_JSON)
@@ -87,12 +89,13 @@ class TestModelsList(object):
         get_patched.assert_called_once_with(self.URL,
                                             headers=EXPECTED_HEADERS_WITH_CHANGED_API_KEY,
                                             json=self.EXPECTED_REQUEST_JSON_WITH_FILTERING,
-                                            params={"limit": -1})
+                                            params={"limit": -1},
+                                            stream=True)
 
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_proper_message_when_no_models_were_found(
             self, get_patched):
         get_patched.return_value = MockResponse(
@@ -104,11 +107,12 @@ class TestModelsList(object):
         get_patched.assert_called_once_with(self.URL,
                                             headers=EXPECTED_HEADERS,
                                             json=None,
-                                            params={"limit": -1})
+                                            params={"limit": -1},
+                                            stream=True)
 
         assert result.output == "No data found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -119,7 +123,8 @@ class TestModelsList(object):
         get_patched.assert_called_once_with(self.URL,
                                             headers=EXPECTED_HEADERS,
                                             json=None,
-                                            params={"limit": -1})
+                                            params={"limit": -1},
+                                            stream=True)
 
         assert result.output == "Failed to fetch data: No such API token\n"
 
@@ -139,7 +144,7 @@ class TestDeleteModel(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {
         "status": 400, "message": "Invalid API token"}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_delete_command_was_executed(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -156,7 +161,7 @@ class TestDeleteModel(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -174,7 +179,7 @@ class TestDeleteModel(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(self, post_patched, models_delete_config_path):
         post_patched.return_value = MockResponse(status_code=204)
         command = self.COMMAND_WITH_OPTIONS_FILE[:] + \
@@ -193,7 +198,7 @@ class TestDeleteModel(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_proper_message_when_model_with_given_id_was_not_found(
             self, post_patched):
         post_patched.return_value = MockResponse(
@@ -211,7 +216,7 @@ class TestDeleteModel(object):
 
         assert result.output == "Failed to delete resource: Unable to find model\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, post_patched):
         post_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -264,7 +269,7 @@ class TestModelCreate(object):
 
     CREATE_MODEL_V2_REPONSE = example_responses.MODEL_CREATE_RESPONSE_JSON_V2
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_create_command_was_used_with_basic_options(
             self, post_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -282,7 +287,7 @@ class TestModelCreate(object):
                       params=self.BASE_PARAMS),
         ])
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_update_command_was_used_with_all_options(
             self, post_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -376,9 +381,9 @@ class TestModelUpload(object):
         "status": 400, "message": "Invalid API token"}
     UPDATE_TAGS_RESPONSE_JSON_200 = example_responses.UPDATE_TAGS_RESPONSE
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_update_command_was_used_with_basic_options(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -418,9 +423,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_when_models_update_command_was_used_with_all_options(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -459,9 +464,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -503,9 +508,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_options_from_yaml_file(
             self, post_patched, put_patched, get_patched, models_upload_config_path):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -547,7 +552,7 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, post_patched):
         post_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -569,9 +574,9 @@ class TestModelUpload(object):
 
             assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_proper_data_and_tag_machine(
             self, post_patched, put_patched, get_patched):
         post_patched.return_value = MockResponse(self.CREATE_MODEL_V2_REPONSE)
@@ -669,7 +674,7 @@ class TestModelDetails(object):
     EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED = {
         "status": 400, "message": "Invalid API token"}
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_details_of_model(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON)
@@ -685,7 +690,7 @@ class TestModelDetails(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_details_of_model_that_has_some_tags(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON_WITH_TAGS)
@@ -701,7 +706,7 @@ class TestModelDetails(object):
 
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_replace_api_key_in_headers_when_api_key_parameter_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON)
@@ -718,7 +723,7 @@ class TestModelDetails(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_options_from_yaml_file(self, get_patched, models_details_config_path):
         get_patched.return_value = MockResponse(
             example_responses.MODEL_DETAILS_RESPONSE_JSON)
@@ -736,7 +741,7 @@ class TestModelDetails(object):
         assert result.output == self.EXPECTED_STDOUT
         assert EXPECTED_HEADERS["X-API-Key"] != "some_key"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_get_request_and_print_proper_message_when_no_models_were_found(
             self, get_patched):
         get_patched.return_value = MockResponse(
@@ -752,7 +757,7 @@ class TestModelDetails(object):
 
         assert result.output == "Model not found\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_proper_message_when_wrong_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse(
             self.EXPECTED_RESPONSE_WHEN_WRONG_API_KEY_WAS_USED, 401)
@@ -781,7 +786,7 @@ class TestDownloadModelFiles(object):
     def teardown_method(cls):
         shutil.rmtree(cls.DESTINATION_DIR_PATH)
 
-    @mock.patch("gradient.api_sdk.s3_downloader.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_get_a_list_of_files_and_download_them_to_defined_directory_when_download_command_was_executed(
             self, get_patched,
     ):
@@ -791,6 +796,7 @@ class TestDownloadModelFiles(object):
         file_response_mock_2.content = "\"Hello Paperspace 2\n\""
         file_response_mock_3 = mock.MagicMock()
         file_response_mock_3.content = "\"Elo\n\""
+        # files are downloaded with keep-alive sessions of the pool too
         get_patched.side_effect = [
             MockResponse(LIST_MODEL_FILES_RESPONSE_JSON),
             file_response_mock,
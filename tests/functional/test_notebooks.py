@@ -122,8 +122,8 @@ class TestNotebooksCreate(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Failed to create resource: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_notebook_id(self, post_patched, get_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
         get_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
@@ -139,8 +139,8 @@ class TestNotebooksCreate(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched, get_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
         get_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
@@ -156,8 +156,8 @@ class TestNotebooksCreate(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_notebook_id_when_all_options_were_used(self, post_patched, get_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
         get_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
@@ -173,8 +173,8 @@ class TestNotebooksCreate(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_option_from_yaml_file(self, post_patched, get_patched, notebooks_create_config_path):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
         get_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
@@ -191,7 +191,7 @@ class TestNotebooksCreate(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -207,7 +207,7 @@ class TestNotebooksCreate(object):
                                         params=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -257,7 +257,7 @@ class TestNotebooksFork(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Failed to fork notebook: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_notebook_id(self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
 
@@ -272,7 +272,7 @@ class TestNotebooksFork(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
 
@@ -287,7 +287,7 @@ class TestNotebooksFork(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -303,7 +303,7 @@ class TestNotebooksFork(object):
                                         params=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -357,8 +357,8 @@ class TestNotebooksStart(object):
     EXPECTED_STDOUT_WITH_KEY = "Started notebook with id: n123\n" \
                                "https://console.paperspace.com/some_namespace/notebook/prg284tu2\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched, get_patched):
         post_patched.return_value = MockResponse(self.EXPECTED_RESPONSE_JSON)
         get_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
@@ -374,7 +374,7 @@ class TestNotebooksStart(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -390,7 +390,7 @@ class TestNotebooksStart(object):
                                         params=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -427,7 +427,7 @@ class TestNotebooksStop(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Unable to stop instance: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_notebook_id(self, post_patched):
         post_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
 
@@ -442,8 +442,8 @@ class TestNotebooksStop(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched, get_patched):
         post_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
         get_patched.return_value = MockResponse(example_responses.NOTEBOOK_GET_RESPONSE)
@@ -459,7 +459,7 @@ class TestNotebooksStop(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -475,7 +475,7 @@ class TestNotebooksStop(object):
                                         params=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, post_patched):
         post_patched.return_value = MockResponse(status_code=400)
 
@@ -496,7 +496,7 @@ class TestListNotebookArtifacts(object):
     runner = CliRunner()
     URL = "https://api.paperspace.io/notebooks/artifactsList"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_valid_get_request_with_all_parameters_for_a_list_of_artifacts(self, get_patched):
         get_patched.return_value = MockResponse()
         notebook_id = "some_notebook_id"
@@ -515,7 +515,7 @@ class TestListNotebookArtifacts(object):
                                                "files": "foo"})
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize('option,param', [("--size", "size"),
                                               ("-s", "size"),
                                               ("--links", "links"),
@@ -560,7 +560,7 @@ class TestNotebooksDelete(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Failed to delete resource: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_post_request_and_print_notebook_id(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -575,7 +575,7 @@ class TestNotebooksDelete(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(status_code=204)
 
@@ -590,7 +590,7 @@ class TestNotebooksDelete(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_read_option_from_yaml_file(self, post_patched, notebooks_delete_config_path):
         post_patched.return_value = MockResponse(status_code=204)
         command = self.COMMAND_WITH_OPTIONS_FILE_USED[:] + [notebooks_delete_config_path]
@@ -606,7 +606,7 @@ class TestNotebooksDelete(object):
                                              files=None,
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -622,7 +622,7 @@ class TestNotebooksDelete(object):
                                        params=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -674,7 +674,7 @@ class TestNotebooksdetails(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Failed to fetch data: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_post_request_and_print_notebook_details(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON)
 
@@ -687,7 +687,7 @@ class TestNotebooksdetails(object):
                                              json={"notebookId": "some_id"},
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_post_request_and_print_notebook_details_with_tags(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_TAGS)
 
@@ -700,7 +700,7 @@ class TestNotebooksdetails(object):
                                              json={"notebookId": "some_id"},
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON)
 
@@ -713,7 +713,7 @@ class TestNotebooksdetails(object):
                                              json={"notebookId": "some_id"},
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_option_from_yaml_file(self, post_patched, notebooks_show_config_path):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE_USED[:] + [notebooks_show_config_path]
@@ -727,7 +727,7 @@ class TestNotebooksdetails(object):
                                              json={"notebookId": "some_id"},
                                              params=None)
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -741,7 +741,7 @@ class TestNotebooksdetails(object):
                                        params=None)
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -799,7 +799,7 @@ class TestNotebooksList(object):
     RESPONSE_JSON_WITH_WRONG_API_TOKEN = {"status": 400, "message": "Invalid API token"}
     EXPECTED_STDOUT_WITH_WRONG_API_TOKEN = "Failed to fetch data: Invalid API token\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_post_request_and_print_notebook_details(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON)
 
@@ -817,7 +817,7 @@ class TestNotebooksList(object):
         assert filter_params == self.EXPECTED_FILTERS
         assert "tagFilter[0]" not in params
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_post_request_and_print_notebook_details_when_filtering_by_tags(self, post_patched):
         post_patched.return_value = MockResponse(self.RESPONSE_JSON)
 
@@ -838,7 +838,7 @@ class TestNotebooksList(object):
         assert params["tagFilter[1]"] in ("tag1", "tag2")
         assert params["tagFilter[0]"] != params["tagFilter[1]"]
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_send_changed_headers_when_api_key_option_was_used(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON)
 
@@ -855,7 +855,7 @@ class TestNotebooksList(object):
         filter_params = json.loads(filter_params)
         assert filter_params == self.EXPECTED_FILTERS
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_option_from_yaml_file(self, get_patched, notebooks_list_config_path):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON)
         command = self.COMMAND_WITH_OPTIONS_FILE_USED[:] + [notebooks_list_config_path]
@@ -873,7 +873,7 @@ class TestNotebooksList(object):
         filter_params = json.loads(filter_params)
         assert filter_params == self.EXPECTED_FILTERS
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_command_was_used_with_invalid_api_token(self, get_patched):
         get_patched.return_value = MockResponse(self.RESPONSE_JSON_WITH_WRONG_API_TOKEN, 400)
 
@@ -891,7 +891,7 @@ class TestNotebooksList(object):
         assert filter_params == self.EXPECTED_FILTERS
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_no_content_was_received_in_response(self, get_patched):
         get_patched.return_value = MockResponse(status_code=400)
 
@@ -1082,7 +1082,7 @@ class TestNotebooksMetricsGetCommand(object):
 """
     EXPECTED_STDOUT_WHEN_ERROR_CODE_WAS_RETURNED_WITHOUT_ERROR_MESSAGE = "Failed to fetch data\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_all_available_metrics_when_metrics_get_command_was_used_with_basic_options(self, get_patched):
         get_patched.side_effect = [
             MockResponse(self.GET_NOTEBOOK_RESPONSE_JSON),
@@ -1113,7 +1113,7 @@ class TestNotebooksMetricsGetCommand(object):
 
         assert result.exit_code == 0, result.exc_info
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_metrics_when_metrics_get_command_was_used_with_all_options(self, get_patched):
         get_patched.side_effect = [
             MockResponse(self.GET_NOTEBOOK_RESPONSE_JSON),
@@ -1144,7 +1144,7 @@ class TestNotebooksMetricsGetCommand(object):
 
         assert result.exit_code == 0, result.exc_info
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_metrics_when_metrics_get_was_executed_and_options_file_was_used(
             self, get_patched, notebooks_metrics_get_config_path):
         get_patched.side_effect = [
@@ -1176,7 +1176,7 @@ class TestNotebooksMetricsGetCommand(object):
 
         assert result.exit_code == 0, result.exc_info
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_invalid_api_key_was_used(self, get_patched):
         get_patched.return_value = MockResponse({"status": 400, "message": "Invalid API token"},
                                                 status_code=403)
@@ -1195,7 +1195,7 @@ class TestNotebooksMetricsGetCommand(object):
 
         assert result.exit_code == 0, result.exc_info
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_deployment_was_not_found(self, get_patched):
         get_patched.side_effect = [
             MockResponse({"error": {"name": "ApplicationError", "status": 404,
@@ -1221,7 +1221,7 @@ class TestNotebooksMetricsGetCommand(object):
 
         assert result.exit_code == 0, result.exc_info
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_message_when_was_no_metrics_were_returned(self, get_patched):
         get_patched.side_effect = [
             MockResponse(self.GET_NOTEBOOK_RESPONSE_JSON),
@@ -1252,7 +1252,7 @@ class TestNotebooksMetricsGetCommand(object):
 
         assert result.exit_code == 0, result.exc_info
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_error_code_was_returned_without_error_message(self, get_patched):
         get_patched.side_effect = [
             MockResponse(self.GET_NOTEBOOK_RESPONSE_JSON),
@@ -1358,7 +1358,7 @@ class TestNotebooksMetricsStreamCommand(object):
 
     @mock.patch("gradient.commands.common.TerminalPrinter")
     @mock.patch("gradient.api_sdk.repositories.common.websocket.create_connection")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_all_available_metrics_when_metrics_get_command_was_used_with_basic_options(
             self, get_patched, create_ws_connection_patched, terminal_printer_cls_patched,
             basic_options_metrics_stream_websocket_connection_iterator):
@@ -1390,7 +1390,7 @@ class TestNotebooksMetricsStreamCommand(object):
 
     @mock.patch("gradient.commands.common.TerminalPrinter")
     @mock.patch("gradient.api_sdk.repositories.common.websocket.create_connection")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_metrics_when_metrics_get_command_was_used_with_all_options(
             self, get_patched, create_ws_connection_patched, terminal_printer_cls_patched,
             all_options_metrics_stream_websocket_connection_iterator):
@@ -1423,7 +1423,7 @@ class TestNotebooksMetricsStreamCommand(object):
 
     @mock.patch("gradient.commands.common.TerminalPrinter")
     @mock.patch("gradient.api_sdk.repositories.common.websocket.create_connection")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_read_metrics_when_metrics_get_was_executed_and_options_file_was_used(
             self, get_patched, create_ws_connection_patched, terminal_printer_cls_patched,
             all_options_metrics_stream_websocket_connection_iterator,
@@ -1457,7 +1457,7 @@ class TestNotebooksMetricsStreamCommand(object):
 
     @mock.patch("gradient.commands.common.TerminalPrinter")
     @mock.patch("gradient.api_sdk.repositories.common.websocket.create_connection")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_invalid_api_key_was_used(
             self, get_patched, create_ws_connection_patched, terminal_printer_cls_patched):
         get_patched.return_value = MockResponse({"status": 400, "message": "Invalid API token"}, 400)
@@ -1479,7 +1479,7 @@ class TestNotebooksMetricsStreamCommand(object):
 
     @mock.patch("gradient.commands.common.TerminalPrinter")
     @mock.patch("gradient.api_sdk.repositories.common.websocket.create_connection")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_should_print_valid_error_message_when_deployment_was_not_found(
             self, get_patched, create_ws_connection_patched, terminal_printer_cls_patched):
         get_patched.return_value = MockResponse(self.GET_NOTEBOOK_RESPONSE_JSON_WHEN_NOTEBOOK_NOT_FOUND, 404)
@@ -28,7 +28,7 @@ class TestListStorageProviders(object):
 +-------+-----------------+------+---------------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_list_storage_providers(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -63,7 +63,7 @@ class TestShowStorageProviderDetails(object):
 +--------+---------------------------------+
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     def test_show_storage_provider_details(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -86,7 +86,7 @@ class TestCreateStorageProvider(object):
     STDOUT = """Created new storage provider with id: spltautet072md4
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_create_storage_provider(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -116,7 +116,7 @@ class TestUpdateStorageProvider(object):
     STDOUT = """Updated storage provider
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_update_storage_provider(self, method):
         method.return_value = MockResponse(self.JSON)
 
@@ -139,7 +139,7 @@ class TestDeleteStorageProvider(object):
     STDOUT = """Deleted storage provider: spltautet072md4
 """
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.delete")
     def test_delete_storage_provider(self, method):
         method.return_value = MockResponse(status_code=204)
 
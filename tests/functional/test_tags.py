@@ -34,8 +34,8 @@ class TestEntityAddTags(object):
     UPDATE_TAGS_RESPONSE_JSON_200 = example_responses.UPDATE_TAGS_RESPONSE
     EXPECTED_STDOUT = "Tags added to %s\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -71,8 +71,8 @@ class TestEntityAddTags(object):
 
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -134,8 +134,8 @@ class TestEntityRemoveTags(object):
     UPDATE_TAGS_RESPONSE_JSON_200 = example_responses.UPDATE_TAGS_RESPONSE
     EXPECTED_STDOUT = "Tags removed from %s\n"
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -172,8 +172,8 @@ class TestEntityRemoveTags(object):
 
         assert result.exit_code == 0
 
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.put")
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
     @pytest.mark.parametrize(
         "entity_command, entity, result_entity",
         [
@@ -212,3 +212,61 @@ class TestEntityRemoveTags(object):
         )
 
         assert result.exit_code == 0
+
+
+class TestEntityTagsBulk(object):
+    LIST_URL = "https://api.paperspace.io/entityTags/getTags"
+    UPDATE_URL = "https://api.paperspace.io/entityTags/updateTags"
+
+    LIST_TAGS_RESPONSE_JSON = {
+        "id1": [{"tag": {"name": "test0"}}],
+        "id2": [{"tag": {"name": "test0"}}, {"tag": {"name": "test1"}}],
+    }
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    @pytest.mark.parametrize(
+        "entity_command, entity",
+        [
+            ("machines", "machine"),
+            ("models", "mlModel"),
+            ("notebooks", "notebook"),
+            ("projects", "project"),
+        ]
+    )
+    def test_should_list_tags_once_and_update_only_changed_entities(self, get_patched, put_patched, entity_command,
+                                                                    entity):
+        get_patched.return_value = MockResponse(self.LIST_TAGS_RESPONSE_JSON)
+        put_patched.return_value = MockResponse(example_responses.UPDATE_TAGS_RESPONSE)
+        command = [entity_command, "tags", "addBulk", "--ids", "id1,id2,id3", "--tag", "test1"]
+
+        result = CliRunner().invoke(cli.cli, command)
+
+        assert result.exit_code == 0, result.exc_info
+        get_patched.assert_called_once_with(
+            self.LIST_URL,
+            headers=EXPECTED_HEADERS,
+            json=None,
+            params={"entity": entity, "entityIds": ["id1", "id2", "id3"]},
+        )
+        updated_jsons = sorted((call[1]["json"] for call in put_patched.call_args_list), key=lambda j: j["entityId"])
+        assert updated_jsons == [
+            {"entity": entity, "entityId": "id1", "tags": ["test0", "test1"]},
+            {"entity": entity, "entityId": "id3", "tags": ["test1"]},
+        ]
+        assert "Tags changed: 2, unchanged: 1, failed: 0" in result.output
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_report_entities_which_tags_could_not_be_removed(self, get_patched, put_patched):
+        get_patched.return_value = MockResponse(self.LIST_TAGS_RESPONSE_JSON)
+        put_patched.side_effect = [MockResponse(example_responses.UPDATE_TAGS_RESPONSE),
+                                   MockResponse({"error": {"message": "Not found"}}, status_code=404)]
+        command = ["notebooks", "tags", "removeBulk", "--id", "id1", "--id", "id2", "--tags", "test0"]
+
+        with mock.patch("gradient.api_sdk.clients.base_client.TagsSupportMixin.TAGS_UPDATE_WORKERS", 1):
+            result = CliRunner().invoke(cli.cli, command)
+
+        assert put_patched.call_count == 2
+        assert "Tags changed: 1, unchanged: 0, failed: 1" in result.output
+        assert "Failed to update tags of 1 of 2 entities" in result.output
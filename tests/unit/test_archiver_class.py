@@ -138,7 +138,7 @@ class TestZipArchiver(object):
 
 
 class TestS3FileUploader(object):
-    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
     def test_should_upload_file_to_s3_and_get_bucket_url_when_upload_was_executed(self, post_patched):
         _, file_path = tempfile.mkstemp()
         uploader = gradient.api_sdk.s3_uploader.S3FileUploader()
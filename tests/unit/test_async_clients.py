@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import mock
+import pytest
+import requests
+
+from gradient.api_sdk import AsyncDatasetVersionsClient, AsyncMachinesClient, AsyncNotebooksClient
+from gradient.api_sdk.clients.async_http_client import AsyncAPI, AsyncResponse, AsyncSessionPool, aiohttp
+from gradient.api_sdk.retries import RetryPolicy
+from gradient.api_sdk.sdk_exceptions import ResourceFetchingError
+
+pytestmark = pytest.mark.skipif(aiohttp is None, reason="aiohttp is not installed")
+
+REQUEST_PATH = "gradient.api_sdk.clients.async_http_client.AsyncAPI._request"
+
+
+def get_response(json_data, status_code=200):
+    return AsyncResponse(status_code, {}, json.dumps(json_data).encode(), "https://api.paperspace.io")
+
+
+class TestAsyncNotebooksClient(object):
+    @mock.patch(REQUEST_PATH)
+    def test_should_fan_out_concurrent_get_requests(self, request_patched):
+        def request(method, path, params=None, json=None, headers=None, **kwargs):
+            return get_response({"handle": json["notebookId"], "name": "some_name"})
+
+        request_patched.side_effect = request
+        client = AsyncNotebooksClient("some_key")
+
+        async def get_all():
+            return await asyncio.gather(*(client.get(id="n{}".format(i)) for i in range(20)))
+
+        notebooks = asyncio.run(get_all())
+
+        assert [notebook.id for notebook in notebooks] == ["n{}".format(i) for i in range(20)]
+        request_patched.assert_called_with("GET", "https://api.paperspace.io/notebooks/getNotebook",
+                                           params=None, headers=mock.ANY, json={"notebookId": "n19"})
+
+    @mock.patch(REQUEST_PATH)
+    def test_should_list_notebooks_with_serializer_of_sync_repository(self, request_patched):
+        request_patched.return_value = get_response({"notebookList": [{"handle": "n1", "name": "nb"}]})
+        client = AsyncNotebooksClient("some_key")
+
+        notebooks = asyncio.run(client.list(limit=5))
+
+        assert notebooks[0].id == "n1"
+        params = request_patched.call_args[1]["params"]
+        assert json.loads(params["filter"])["filter"]["limit"] == 5
+
+
+class TestAsyncMachinesClient(object):
+    @mock.patch(REQUEST_PATH)
+    def test_should_raise_sdk_error_when_request_failed(self, request_patched):
+        request_patched.return_value = get_response({"error": {"message": "Not found"}}, status_code=404)
+        client = AsyncMachinesClient("some_key")
+
+        with pytest.raises(ResourceFetchingError) as e:
+            asyncio.run(client.stop("some_id"))
+
+        assert "Not found" in str(e.value)
+
+
+class TestAsyncDatasetVersionsClient(object):
+    @mock.patch(REQUEST_PATH)
+    def test_should_generate_pre_signed_urls(self, request_patched):
+        request_patched.return_value = get_response([{"url": "https://s3", "expiresIn": 60}])
+        client = AsyncDatasetVersionsClient("some_key")
+
+        urls = asyncio.run(client.generate_pre_signed_s3_urls("dsr1:v1", [{"method": "getObject"}]))
+
+        assert urls[0].url == "https://s3"
+        assert request_patched.call_args[0][0] == "POST"
+
+
+class TestAsyncAPI(object):
+    def test_should_encode_params_like_requests(self):
+        params = AsyncAPI._prepare_params({"a": 1, "b": None, "c": ["x", "y"]})
+
+        assert params == [("a", "1"), ("c", "x"), ("c", "y")]
+
+    def test_should_retry_connection_errors_translated_to_requests_exceptions(self):
+        api = AsyncAPI("https://api.paperspace.io", session_pool=AsyncSessionPool(),
+                       retry_policy=RetryPolicy(max_retries=2, async_sleep=mock.AsyncMock()))
+        session = mock.MagicMock()
+        session.request.side_effect = aiohttp.ClientConnectionError("refused")
+
+        with mock.patch.object(AsyncSessionPool, "get_session", return_value=session):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                asyncio.run(api.get("/projects"))
+
+        assert session.request.call_count == 3
@@ -0,0 +1,79 @@
+import mock
+
+from gradient.api_sdk import NotebooksClient, SdkClient
+from gradient.api_sdk.clients.base_client import BaseClient
+from gradient.api_sdk.repositories.projects import ListProjects
+from tests import MockResponse
+
+
+class TestBuildRepository(object):
+    def test_should_reuse_repository_and_its_api_client(self):
+        client = BaseClient(api_key="some_key", ps_client_name="some_client")
+
+        repository = client.build_repository(ListProjects)
+        api_client = repository._get_client()
+
+        assert client.build_repository(ListProjects) is repository
+        assert repository._get_client() is api_client
+        assert repository.retry_policy is client.retry_policy
+
+    def test_should_build_new_repository_when_api_key_was_changed(self):
+        client = BaseClient(api_key="some_key")
+        repository = client.build_repository(ListProjects)
+
+        client.api_key = "other_key"
+        new_repository = client.build_repository(ListProjects)
+
+        assert new_repository is not repository
+        assert new_repository._get_client().api_key == "other_key"
+
+    def test_should_build_new_repository_when_ps_client_name_was_changed(self):
+        client = BaseClient(api_key="some_key")
+        repository = client.build_repository(ListProjects)
+
+        client.ps_client_name = "gradient-cli"
+        new_repository = client.build_repository(ListProjects)
+
+        assert new_repository is not repository
+        assert new_repository._get_client().ps_client_name == "gradient-cli"
+
+    def test_repository_should_build_new_api_client_when_its_api_key_was_changed(self):
+        client = BaseClient(api_key="some_key")
+        repository = client.build_repository(ListProjects)
+        api_client = repository._get_client()
+
+        repository.api_key = "other_key"
+
+        assert repository._get_client() is not api_client
+        assert repository._get_client().api_key == "other_key"
+
+
+class TestSdkClient(object):
+    def test_should_share_retry_policy_and_propagate_api_key_to_all_clients(self):
+        sdk_client = SdkClient(api_key="some_key")
+
+        sdk_client.api_key = "other_key"
+
+        assert sdk_client.api_key == "other_key"
+        assert all(client.api_key == "other_key" for client in sdk_client.clients)
+        assert len({id(client.retry_policy) for client in sdk_client.clients}) == 1
+
+
+class TestTagsBulk(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.put")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_fetch_tags_in_chunks(self, get_patched, put_patched):
+        get_patched.side_effect = [MockResponse({"n1": [{"tag": {"name": "a"}}]}), MockResponse({})]
+        put_patched.return_value = MockResponse({})
+        client = NotebooksClient(api_key="some_key")
+        client.TAGS_LIST_CHUNK_SIZE = 2
+
+        results = client.add_tags_bulk(["n1", "n2", "n3", "n2"], ["a"])
+
+        assert [call[1]["params"]["entityIds"] for call in get_patched.call_args_list] == [["n1", "n2"], ["n3"]]
+        assert [(result.entity_id, result.tags, result.changed) for result in results] == [
+            ("n1", ["a"], False),
+            ("n2", ["a"], True),
+            ("n3", ["a"], True),
+        ]
+        assert put_patched.call_count == 2
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+import requests
+
+from benchmarks import report, runner
+from benchmarks.server import DATASET_ID, DATASET_VERSION, StandInServer
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server_:
+        yield server_
+
+
+def _presign(server, *calls):
+    url = "{}/datasets/{}/versions/{}/s3/preSignedUrls".format(server.url, DATASET_ID, DATASET_VERSION)
+    return [item["url"] for item in requests.post(url, json={"calls": list(calls)}).json()]
+
+
+class TestStandInServer(object):
+    def test_should_store_and_serve_objects_through_pre_signed_urls(self, server):
+        put_url, get_url = _presign(
+            server,
+            {"method": "putObject", "params": {"Key": "/some/file.txt"}},
+            {"method": "getObject", "params": {"Key": "some/file.txt"}},
+        )
+
+        assert requests.put(put_url, data=b"some content").ok
+        assert requests.get(get_url).content == b"some content"
+        assert server.object_keys() == ["{}/{}/some/file.txt".format(DATASET_ID, DATASET_VERSION)]
+
+    def test_should_assemble_multipart_uploads_in_part_number_order(self, server):
+        key = "big.bin"
+        upload = _presign(server, {"method": "createMultipartUpload", "params": {"Key": key}})[0]
+        part_urls = _presign(server, *[
+            {"method": "uploadPart", "params": {"Key": key, "UploadId": upload["UploadId"], "PartNumber": number}}
+            for number in (1, 2)
+        ])
+        requests.put(part_urls[1], data=b"world")
+        requests.put(part_urls[0], data=b"hello ")
+
+        _presign(server, {"method": "completeMultipartUpload", "params": {
+            "Key": key,
+            "UploadId": upload["UploadId"],
+            "MultipartUpload": {"Parts": [{"PartNumber": 2, "ETag": ""}, {"PartNumber": 1, "ETag": ""}]},
+        }})
+
+        get_url = _presign(server, {"method": "getObject", "params": {"Key": key}})[0]
+        assert requests.get(get_url).content == b"hello world"
+
+
+class TestRunner(object):
+    @pytest.mark.parametrize("scenario", ["small_files", "deep_tree"])
+    def test_should_run_all_operations_of_scenario(self, server, scenario, tmpdir):
+        results = runner.run_scenario(server, scenario, scale=0.01, isolated=False)
+
+        assert [result.operation for result in results] == list(runner.OPERATIONS)
+        assert [result.error for result in results] == [None] * len(runner.OPERATIONS)
+        assert all(result.requests and result.latency_p99 >= result.latency_p50 for result in results)
+
+        json_path = str(tmpdir.join("results.json"))
+        report.dump(results, json_path)
+        with open(json_path) as f:
+            assert len(json.load(f)) == len(results)
+        assert report.find_regressions(results, json_path, tolerance=0.2) == []
+
+    def test_percentile(self):
+        assert runner.percentile([], 50) is None
+        assert runner.percentile([3, 1, 2], 50) == 2
+        assert runner.percentile(list(range(1, 101)), 99) == 99
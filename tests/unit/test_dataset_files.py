@@ -0,0 +1,882 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import mock
+import pytest
+
+from benchmarks.server import DATASET_ID, DATASET_VERSION, DATASET_VERSION_ID, StandInServer
+from gradient.api_sdk import s3_copier
+from gradient.api_sdk.clients import DatasetVersionsClient
+from gradient.api_sdk.config import config
+from gradient.api_sdk.logger import MuteLogger
+from gradient.api_sdk.sdk_exceptions import GradientSdkError
+from gradient.commands import datasets as commands
+from gradient.commands.transfer_journal import TransferJournal, get_file_state
+from gradient.commands.transfer_progress import Attempt, TransferProgress
+from gradient.commands.transfer_scheduler import BandwidthLimiter, ByteBudget, FileSlice
+from gradient.exceptions import ApplicationError
+
+PART_SIZE = 1024
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp("config"))
+    with mock.patch.object(config, "CONFIG_DIR_PATH", path):
+        yield path
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server_:
+        with mock.patch.object(config, "CONFIG_HOST", server_.url), mock.patch.object(config, "HTTP_CACHE", False):
+            yield server_
+
+
+@pytest.fixture
+def big_file(tmpdir):
+    path = str(tmpdir.join("big.bin"))
+    with open(path, "wb") as f:
+        f.write(os.urandom(PART_SIZE * 7 + 100))
+    return path
+
+
+def read_object(server, key):
+    with server.store.open("{}/{}/{}".format(DATASET_ID, DATASET_VERSION, key)) as f:
+        return f.read()
+
+
+class ConcurrencyCounter(object):
+    def __init__(self):
+        self.current = 0
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def wrap(self, func):
+        def wrapper(*args, **kwargs):
+            with self._lock:
+                self.current += 1
+                self.max = max(self.max, self.current)
+            try:
+                # give other uploaders time to start
+                time.sleep(0.05)
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.current -= 1
+
+        return wrapper
+
+
+@mock.patch.object(commands, "MULTIPART_CHUNK_SIZE", PART_SIZE)
+class TestPutDatasetFilesMultipart(object):
+    def test_should_upload_parts_concurrently_and_assemble_them_in_order(self, server, big_file):
+        counter = ConcurrencyCounter()
+        put_part = commands.PutDatasetFilesCommand._put_part
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_part", staticmethod(counter.wrap(put_part))):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [big_file], "/", part_concurrency=3)
+
+        with open(big_file, "rb") as f:
+            assert read_object(server, "big.bin") == f.read()
+        assert counter.max == 3
+
+    def test_should_limit_parts_uploaded_at_once_across_all_files(self, server, big_file, tmpdir):
+        other_file = str(tmpdir.join("other.bin"))
+        with open(other_file, "wb") as f:
+            f.write(os.urandom(PART_SIZE * 5))
+        counter = ConcurrencyCounter()
+        put_part = commands.PutDatasetFilesCommand._put_part
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_part", staticmethod(counter.wrap(put_part))):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [str(tmpdir) + os.path.sep], "/",
+                            part_concurrency=4, max_part_concurrency=2)
+
+        assert counter.max == 2
+        with open(other_file, "rb") as f:
+            assert read_object(server, "other.bin") == f.read()
+
+    @mock.patch.object(commands, "PART_PRESIGN_BATCH_SIZE", 3)
+    def test_should_sign_part_urls_in_batches(self, server, big_file):
+        sign_parts = commands.PutDatasetFilesCommand._sign_parts
+        batches = []
+
+        def sign_parts_spy(self, dataset_version_id, key, upload_id, part_numbers):
+            batches.append(list(part_numbers))
+            return sign_parts(self, dataset_version_id, key, upload_id, part_numbers)
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_sign_parts", sign_parts_spy):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [big_file], "/")
+
+        assert batches == [[1, 2, 3], [4, 5, 6], [7, 8]]
+        with open(big_file, "rb") as f:
+            assert read_object(server, "big.bin") == f.read()
+
+
+class TestPartSize(object):
+    @pytest.mark.parametrize("size,part_size,expected", [
+        (int(100e6), None, commands.MULTIPART_CHUNK_SIZE),
+        (int(100e9), None, commands.MULTIPART_CHUNK_SIZE),
+        (int(1e12), None, int(100e6)),
+        (int(1e12) + 1, None, int(101e6)),
+        (int(1e12), int(200e6), int(200e6)),
+        (commands.MAX_PART_SIZE * commands.MAX_PART_COUNT, None, commands.MAX_PART_SIZE),
+    ])
+    def test_should_choose_part_size_fitting_file_in_max_part_count(self, size, part_size, expected):
+        command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.part_size = part_size
+
+        assert command._get_part_size(size) == expected
+
+    def test_should_raise_error_when_file_does_not_fit_in_max_part_count(self):
+        command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.part_size = None
+
+        with pytest.raises(ApplicationError):
+            command._get_part_size(commands.MAX_PART_SIZE * commands.MAX_PART_COUNT + 1)
+
+    @pytest.mark.parametrize("part_size", [commands.MIN_PART_SIZE - 1, commands.MAX_PART_SIZE + 1])
+    def test_should_raise_error_when_part_size_is_out_of_limits(self, part_size):
+        command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+
+        with pytest.raises(ApplicationError):
+            command.execute(DATASET_VERSION_ID, ["some_path"], "/", part_size=part_size)
+
+
+class PartPutSpy(object):
+    def __init__(self, fail_from=None):
+        self.parts = []
+        self.fail_from = fail_from
+        self._put_part = commands.PutDatasetFilesCommand._put_part
+
+    def __call__(self, session, url, path, offset, length, headers, limiter=None):
+        part = offset // PART_SIZE + 1
+        if self.fail_from and part >= self.fail_from:
+            raise RuntimeError("interrupted")
+
+        self.parts.append(part)
+        return self._put_part(session, url, path, offset, length, headers, limiter)
+
+
+@mock.patch.object(commands, "MULTIPART_CHUNK_SIZE", PART_SIZE)
+class TestPutDatasetFilesResume(object):
+    @staticmethod
+    def put(source_path, spy, **kwargs):
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_part", staticmethod(spy)):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [source_path], "/", part_concurrency=1, **kwargs)
+
+    def interrupted_put(self, source_path, **kwargs):
+        with pytest.raises(ApplicationError, match="Some files were not uploaded"):
+            self.put(source_path, PartPutSpy(fail_from=5), **kwargs)
+
+    def test_should_skip_finished_files_and_continue_open_upload(self, server, big_file, tmpdir, config_dir):
+        with open(str(tmpdir.join("small.txt")), "w") as f:
+            f.write("some content")
+        source_path = str(tmpdir) + os.path.sep
+
+        self.interrupted_put(source_path)
+        assert server.object_keys() == ["{}/{}/small.txt".format(DATASET_ID, DATASET_VERSION)]
+        assert len(server.store.upload_ids()) == 1
+
+        spy = PartPutSpy()
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_file") as put_file:
+            self.put(source_path, spy, resume=True)
+
+        assert not put_file.called
+        assert spy.parts == [5, 6, 7, 8]
+        with open(big_file, "rb") as f:
+            assert read_object(server, "big.bin") == f.read()
+        assert server.store.upload_ids() == []
+        assert os.listdir(os.path.join(config_dir, "transfers")) == []
+
+    def test_should_abort_open_upload_of_changed_file(self, server, big_file):
+        self.interrupted_put(big_file)
+        with open(big_file, "ab") as f:
+            f.write(b"more content")
+
+        spy = PartPutSpy()
+        self.put(big_file, spy, resume=True)
+
+        assert spy.parts == list(range(1, 9))
+        with open(big_file, "rb") as f:
+            assert read_object(server, "big.bin") == f.read()
+        assert server.store.upload_ids() == []
+
+    def test_should_log_failed_files_and_fail_after_uploading_the_rest(self, server, big_file, tmpdir):
+        path = str(tmpdir.join("small.txt"))
+        with open(path, "w") as f:
+            f.write("some content")
+        logger = mock.Mock()
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_part", staticmethod(PartPutSpy(fail_from=5))):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=logger)
+            with pytest.raises(ApplicationError, match="Some files were not uploaded"):
+                command.execute(DATASET_VERSION_ID, [big_file, path], "/", part_concurrency=1)
+
+        logger.error.assert_called_once_with(
+            "Failed to upload {}: interrupted".format(big_file.replace(os.path.sep, "/")))
+        assert server.object_keys() == ["{}/{}/small.txt".format(DATASET_ID, DATASET_VERSION)]
+
+    def test_should_abort_open_upload_and_start_over_without_resume(self, server, big_file):
+        self.interrupted_put(big_file)
+
+        spy = PartPutSpy()
+        self.put(big_file, spy)
+
+        assert spy.parts == list(range(1, 9))
+        assert server.store.upload_ids() == []
+
+
+class TestTransferJournal(object):
+    def test_should_ignore_line_cut_off_by_crash(self, tmpdir):
+        journal = TransferJournal(str(tmpdir.join("journal.jsonl")))
+        journal.record_upload("some_upload_id", "/big.bin", [10, 1], PART_SIZE)
+        journal.record_part("some_upload_id", 1, "some_etag")
+        journal.record_file("/small.txt", [1, 1])
+        journal.close()
+        with open(journal.path, "a") as f:
+            f.write('{"type": "part", "upload_id": "some_upl')
+
+        loaded = TransferJournal(journal.path).load()
+
+        assert loaded.is_finished("/small.txt", [1, 1])
+        assert not loaded.is_finished("/small.txt", [2, 1])
+        assert loaded.find_upload("/big.bin") == \
+            ("some_upload_id", dict(key="/big.bin", state=[10, 1], part_size=PART_SIZE, parts={1: "some_etag"}))
+
+
+class RangeGetSpy(object):
+    def __init__(self, fail_from=None):
+        self.parts = []
+        self.fail_from = fail_from
+        self._download_range = commands.GetDatasetFilesCommand._download_range
+
+    def __call__(self, session, url, tmp_path, offset, length, etag=None, limiter=None):
+        part = offset // PART_SIZE + 1
+        if self.fail_from and part >= self.fail_from:
+            raise RuntimeError("interrupted")
+
+        self.parts.append(part)
+        return self._download_range(session, url, tmp_path, offset, length, etag, limiter)
+
+
+class RangeIgnoringSession(object):
+    """Session of a storage provider that answers range requests with the whole object"""
+
+    def __init__(self, session):
+        self._session = session
+
+    def get(self, url, headers=None, **kwargs):
+        return self._session.get(url, **kwargs)
+
+
+@mock.patch.object(commands, "DOWNLOAD_RANGE_SIZE", PART_SIZE)
+class TestGetDatasetFilesRanges(object):
+    @pytest.fixture
+    def content(self, server):
+        content = os.urandom(PART_SIZE * 7 + 100)
+        server.store.put("{}/{}/big.bin".format(DATASET_ID, DATASET_VERSION), [content])
+        server.store.put("{}/{}/small.txt".format(DATASET_ID, DATASET_VERSION), [b"some content"])
+        return content
+
+    @staticmethod
+    def get(target_path, spy, **kwargs):
+        with mock.patch.object(commands.GetDatasetFilesCommand, "_download_range", staticmethod(spy)):
+            command = commands.GetDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, ["/"], target_path, **kwargs)
+
+    def test_should_get_large_objects_in_ranges_and_small_ones_in_single_stream(self, content, tmpdir):
+        counter = ConcurrencyCounter()
+        spy = RangeGetSpy()
+
+        self.get(str(tmpdir), counter.wrap(spy), part_concurrency=3)
+
+        assert sorted(spy.parts) == list(range(1, 9))
+        assert counter.max == 3
+        assert tmpdir.join("big.bin").read_binary() == content
+        assert tmpdir.join("small.txt").read_binary() == b"some content"
+        assert sorted(os.listdir(str(tmpdir))) == ["big.bin", "small.txt"]
+
+    def test_should_continue_interrupted_download_from_finished_ranges(self, content, tmpdir, config_dir):
+        with pytest.raises(RuntimeError):
+            self.get(str(tmpdir), RangeGetSpy(fail_from=5), part_concurrency=1)
+        assert not tmpdir.join("big.bin").exists()
+
+        spy = RangeGetSpy()
+        self.get(str(tmpdir), spy, part_concurrency=1)
+
+        assert spy.parts == [5, 6, 7, 8]
+        assert tmpdir.join("big.bin").read_binary() == content
+        assert not tmpdir.join("big.bin.gradient-download").exists()
+        assert os.listdir(os.path.join(config_dir, "transfers")) == []
+
+    def test_should_get_object_in_single_stream_if_ranges_are_ignored(self, content, tmpdir):
+        download_range = commands.GetDatasetFilesCommand._download_range
+        responses = []
+
+        def ignore_range(session, url, *args):
+            r = download_range(RangeIgnoringSession(session), url, *args)
+            responses.append(r)
+            return r
+
+        self.get(str(tmpdir), ignore_range, part_concurrency=1)
+
+        assert [r.status_code for r in responses] == [200]
+        assert not responses[0]._content_consumed
+        assert tmpdir.join("big.bin").read_binary() == content
+        assert sorted(os.listdir(str(tmpdir))) == ["big.bin", "small.txt"]
+
+
+def write_files(root, files):
+    for name, content in files.items():
+        path = os.path.join(root, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+
+@mock.patch.object(commands, "MULTIPART_CHUNK_SIZE", PART_SIZE)
+class TestSyncDatasetFiles(object):
+    def test_should_list_local_files_in_the_order_of_s3_keys(self, tmpdir):
+        write_files(str(tmpdir), {"a/b": b"1", "a-b": b"22", "a.txt": b"333", "a/a/c": b""})
+
+        files = list(commands.BaseDatasetFilesCommand.iter_local_files(str(tmpdir)))
+
+        assert [(key, size) for key, (_, size) in files] == [("a-b", 2), ("a.txt", 3), ("a/a/c", 0), ("a/b", 1)]
+
+    def test_should_put_only_new_and_changed_files_and_delete_missing_ones(self, server, tmpdir):
+        source_path = str(tmpdir.mkdir("source"))
+        write_files(source_path, {
+            "a.txt": b"some content",
+            "dir/b.txt": b"other content",
+            "big.bin": os.urandom(PART_SIZE * 3 + 10),
+        })
+        command = commands.SyncPutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(DATASET_VERSION_ID, source_path, "/data")
+
+        write_files(source_path, {"a.txt": b"changed content", "c.txt": b"new content"})
+        os.remove(os.path.join(source_path, "dir", "b.txt"))
+        put = commands.PutDatasetFilesCommand._put
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put", autospec=True, side_effect=put) as put_spy:
+            command = commands.SyncPutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, source_path, "/data", delete=True)
+
+        assert sorted(os.path.basename(call[0][2]) for call in put_spy.call_args_list) == ["a.txt", "c.txt"]
+        assert server.object_keys("data/") == ["{}/{}/data/{}".format(DATASET_ID, DATASET_VERSION, name)
+                                               for name in ("a.txt", "big.bin", "c.txt")]
+        assert read_object(server, "data/a.txt") == b"changed content"
+
+    def test_should_hash_files_off_the_main_thread(self, server, tmpdir):
+        server.store.put("{}/{}/data/a.txt".format(DATASET_ID, DATASET_VERSION), [b"some content"])
+        target_path = str(tmpdir.mkdir("target"))
+        write_files(target_path, {"a.txt": b"some content"})
+        file_matches_etag = commands.file_matches_etag
+        threads = []
+
+        def file_matches_etag_spy(*args):
+            threads.append(threading.current_thread())
+            return file_matches_etag(*args)
+
+        with mock.patch.object(commands, "file_matches_etag", file_matches_etag_spy):
+            command = commands.SyncGetDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, "/data", target_path)
+
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    def test_should_not_hash_files_uploaded_since_they_last_changed(self, server, tmpdir, config_dir):
+        source_path = str(tmpdir.mkdir("source"))
+        write_files(source_path, {"a.txt": b"some content", "b.txt": b"other content"})
+        command = commands.SyncPutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(DATASET_VERSION_ID, source_path, "/data")
+
+        # sync was interrupted after it uploaded a.txt
+        journal = TransferJournal.for_transfer("put", DATASET_VERSION_ID, "/data/", [os.path.abspath(source_path)])
+        journal.record_file("/data/a.txt", get_file_state(os.path.join(source_path, "a.txt")))
+        journal.close()
+        with mock.patch.object(commands, "file_matches_etag", return_value=True) as file_matches_etag_spy:
+            command = commands.SyncPutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, source_path, "/data", resume=True)
+
+        assert [call[0][0] for call in file_matches_etag_spy.call_args_list] == \
+            [os.path.join(source_path, "b.txt")]
+
+    @mock.patch.object(commands, "SCHEDULE_WINDOW", 2)
+    def test_should_schedule_changed_files_in_windows(self, server, tmpdir):
+        source_path = str(tmpdir.mkdir("source"))
+        write_files(source_path, {"a.txt": b"1", "b.txt": b"22", "c.txt": b"333", "d.txt": b"4444", "e.txt": b"5"})
+        sign_and_put = commands.PutDatasetFilesCommand._sign_and_put
+        batches = []
+
+        def sign_and_put_spy(self, dataset_version_id, pool, results, update_status):
+            batches.append([r["key"] for r in results])
+            return sign_and_put(self, dataset_version_id, pool, results, update_status)
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_sign_and_put", sign_and_put_spy):
+            command = commands.SyncPutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, source_path, "/data")
+
+        assert batches == [["/data/b.txt", "/data/a.txt"], ["/data/d.txt", "/data/c.txt"], ["/data/e.txt"]]
+        assert read_object(server, "data/d.txt") == b"4444"
+
+    def test_should_get_only_new_and_changed_files_and_delete_missing_ones(self, server, tmpdir):
+        for name, content in {"a.txt": b"some content", "dir/b.txt": b"other content", "c.txt": b"new"}.items():
+            server.store.put("{}/{}/data/{}".format(DATASET_ID, DATASET_VERSION, name), [content])
+        target_path = str(tmpdir.mkdir("target"))
+        write_files(target_path, {"a.txt": b"some content", "dir/b.txt": b"old content", "extra.txt": b"extra"})
+
+        get = commands.GetDatasetFilesCommand._get
+        with mock.patch.object(commands.GetDatasetFilesCommand, "_get", autospec=True, side_effect=get) as get_spy:
+            command = commands.SyncGetDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, "/data", target_path, delete=True)
+
+        assert sorted(call[1]["key"] for call in get_spy.call_args_list) == ["data/c.txt", "data/dir/b.txt"]
+        files = commands.BaseDatasetFilesCommand.iter_local_files(target_path)
+        assert [key for key, _ in files] == ["a.txt", "c.txt", "dir/b.txt"]
+        assert tmpdir.join("target", "dir", "b.txt").read_binary() == b"other content"
+
+
+@mock.patch.object(commands, "MULTIPART_CHUNK_SIZE", PART_SIZE)
+class TestDedupDatasetFiles(object):
+    PARENT_VERSION_ID = "{}:bench00".format(DATASET_ID)
+
+    def test_should_copy_unchanged_files_from_parent_version_and_upload_the_rest(self, server, tmpdir):
+        source_path = str(tmpdir.mkdir("source"))
+        write_files(source_path, {
+            "a.txt": b"some content",
+            "dir/b.txt": b"other content",
+            "big.bin": os.urandom(PART_SIZE * 3 + 10),
+        })
+        command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(self.PARENT_VERSION_ID, [source_path + os.path.sep], "/")
+
+        write_files(source_path, {"a.txt": b"changed content", "c.txt": b"new content"})
+        put = commands.PutDatasetFilesCommand._put
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put", autospec=True, side_effect=put) as put_spy:
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [source_path + os.path.sep], "/", dedup_from=self.PARENT_VERSION_ID)
+
+        assert sorted(os.path.basename(call[0][2]) for call in put_spy.call_args_list) == ["a.txt", "c.txt"]
+        for name in ("a.txt", "big.bin", "c.txt", "dir/b.txt"):
+            with open(os.path.join(source_path, *name.split("/")), "rb") as f:
+                assert read_object(server, name) == f.read()
+
+    def test_should_dedup_against_last_committed_version_when_creating_version(self, tmpdir):
+        source_path = str(tmpdir.join("a.txt"))
+        write_files(str(tmpdir), {"a.txt": b"some content"})
+
+        with mock.patch("gradient.api_sdk.clients.DatasetVersionsClient") as client_class, \
+                mock.patch.object(commands.PutDatasetFilesCommand, "execute") as put_execute, \
+                mock.patch.object(commands.CommitDatasetVersionCommand, "execute"):
+            client = client_class.return_value
+            client.list.return_value = [mock.Mock(version="bench00")]
+            client.create.return_value = DATASET_VERSION
+            command = commands.CreateDatasetVersionCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_ID, source_paths=[source_path], dedup=True)
+
+        client.list.assert_called_once_with(dataset_id=DATASET_ID, is_committed=True, limit=1)
+        put_execute.assert_called_once_with(
+            DATASET_VERSION_ID, source_paths=[source_path], target_path="/", dedup_from=self.PARENT_VERSION_ID)
+
+
+class TestPipelinedListing(object):
+    def test_should_keep_only_given_number_of_items_ready_ahead_of_consumer(self):
+        produced = []
+
+        def produce():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        items = commands.prefetch(produce(), size=2)
+        assert next(items) == 0
+        time.sleep(0.1)
+
+        # two items are ready and the producer waits with the next one
+        assert len(produced) == 4
+        assert list(items) == list(range(1, 10))
+
+    def test_should_raise_exception_of_producer_in_consumer(self):
+        def produce():
+            yield 1
+            raise ApplicationError("some error")
+
+        items = commands.prefetch(produce())
+
+        assert next(items) == 1
+        with pytest.raises(ApplicationError, match="some error"):
+            next(items)
+
+    @mock.patch.object(commands, "OBJECT_PRESIGN_BATCH_SIZE", 7)
+    @mock.patch.object(s3_copier, "S3_MAX_KEYS", 20)
+    def test_should_get_and_delete_all_pages_of_objects(self, server, tmpdir):
+        names = ["dir/{:03}.txt".format(i) for i in range(50)]
+        for name in names:
+            server.store.put("{}/{}/{}".format(DATASET_ID, DATASET_VERSION, name), [name.encode("utf-8")])
+
+        command = commands.GetDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(DATASET_VERSION_ID, ["/dir/"], str(tmpdir))
+
+        assert sorted(os.listdir(str(tmpdir))) == [name[len("dir/"):] for name in names]
+        assert tmpdir.join("049.txt").read_binary() == b"dir/049.txt"
+
+        command = commands.DeleteDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(DATASET_VERSION_ID, ["/dir"])
+
+        assert server.object_keys("dir/") == []
+
+
+class TestTransferScheduler(object):
+    def test_should_wait_for_tokens_when_bucket_is_empty(self):
+        limiter = BandwidthLimiter(1000, burst=100)
+
+        started = time.monotonic()
+        limiter.consume(100)
+        assert time.monotonic() - started < 0.05
+
+        limiter.consume(200)
+        assert 0.15 < time.monotonic() - started < 0.5
+
+    def test_should_wait_until_bytes_in_flight_fit_in_budget(self):
+        budget = ByteBudget(100)
+        events = []
+
+        def transfer(name, amount):
+            with budget.reserve(amount):
+                events.append(name + " started")
+                time.sleep(0.1)
+                events.append(name + " finished")
+
+        with budget.reserve(300):
+            # larger than the budget, but nothing else is in flight
+            other = threading.Thread(target=transfer, args=("other", 60))
+            other.start()
+            time.sleep(0.05)
+            events.append("first finished")
+        other.join()
+
+        assert events == ["first finished", "other started", "other finished"]
+
+    @mock.patch.object(commands, "SMALL_FILE_SIZE", 10)
+    @mock.patch.object(commands, "SMALL_FILE_PRESIGN_BATCH_SIZE", 3)
+    def test_should_queue_largest_files_first_and_small_ones_in_larger_batches(self):
+        batches = []
+        results = [dict(key="small", size=1), dict(key="big", size="300"), dict(key="mid", size=20)]
+        results += [dict(key="tiny%d" % i, size=0) for i in range(4)]
+
+        commands.BaseDatasetFilesCommand.schedule(
+            lambda dataset_version_id, pool, batch, update_status: batches.append([r["key"] for r in batch]),
+            DATASET_VERSION_ID, mock.Mock(worker_count=2), results, None)
+
+        assert batches == [["big", "mid"], ["small", "tiny0", "tiny1"], ["tiny2", "tiny3"]]
+
+    def test_should_plan_all_source_paths_before_uploading_largest_files_first(self, server, tmpdir):
+        write_files(str(tmpdir.mkdir("a")), {"small.txt": b"1", "mid.txt": b"22"})
+        write_files(str(tmpdir.mkdir("b")), {"big.txt": b"333"})
+        sign_and_put = commands.PutDatasetFilesCommand._sign_and_put
+        batches = []
+
+        def sign_and_put_spy(self, dataset_version_id, pool, results, update_status):
+            batches.append([r["key"] for r in results])
+            assert self._progress.files_total == 3
+            return sign_and_put(self, dataset_version_id, pool, results, update_status)
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_sign_and_put", sign_and_put_spy):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [str(tmpdir.join("a")), str(tmpdir.join("b"))], "/")
+
+        assert batches == [["/b/big.txt", "/a/mid.txt", "/a/small.txt"]]
+        assert read_object(server, "b/big.txt") == b"333"
+
+    def test_should_cap_upload_bandwidth(self, server, tmpdir):
+        path = str(tmpdir.join("some.bin"))
+        with open(path, "wb") as f:
+            f.write(os.urandom(250000))
+
+        started = time.monotonic()
+        command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(DATASET_VERSION_ID, [path], "/", max_bandwidth=100000)
+
+        # one second of transfer is sent at once, the rest at the rate of the limiter
+        assert time.monotonic() - started > 1.4
+        with open(path, "rb") as f:
+            assert read_object(server, "some.bin") == f.read()
+
+
+class TestTransferProgress(object):
+    def test_should_render_bytes_files_throughput_and_eta(self):
+        progress = TransferProgress("Uploading files")
+        progress.add_file(2500000)
+        progress.add_file(1500)
+        progress.add_bytes(1000000)
+        progress.file_done()
+
+        snapshot = dict(progress.snapshot(), throughput=500000.0, eta=3.003)
+
+        assert progress.render(snapshot) == \
+            "Uploading files (1.0 MB of 2.5 MB, 1 of 2 files, 500.0 kB/s, ETA 0:00:03)"
+
+    def test_should_take_back_bytes_of_failed_attempt(self):
+        progress = TransferProgress("Uploading files")
+        progress.add_bytes(100)
+
+        attempt = Attempt(progress)
+        attempt.consume(50)
+        attempt.cancel()
+        Attempt(progress).consume(70)
+
+        assert progress.snapshot()["bytes_done"] == 170
+
+    @mock.patch.object(commands, "MULTIPART_CHUNK_SIZE", PART_SIZE)
+    def test_should_print_json_progress_of_resumed_upload(self, server, big_file, capsys):
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_part", staticmethod(PartPutSpy(fail_from=5))):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            with pytest.raises(ApplicationError):
+                command.execute(DATASET_VERSION_ID, [big_file], "/")
+        capsys.readouterr()
+
+        command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(DATASET_VERSION_ID, [big_file], "/", resume=True, json_progress=True)
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        # parts uploaded by the interrupted run are counted as done too
+        assert lines[-1]["finished"] is True
+        assert lines[-1]["bytes_done"] == lines[-1]["bytes_total"] == os.path.getsize(big_file)
+        assert (lines[-1]["files_done"], lines[-1]["files_total"], lines[-1]["files_failed"]) == (1, 1, 0)
+
+
+class TestFileSlice(object):
+    def test_should_read_only_its_range_of_file_and_rewind(self, big_file):
+        with open(big_file, "rb") as f:
+            content = f.read()
+            part = FileSlice(f, PART_SIZE, PART_SIZE)
+
+            assert len(part) == PART_SIZE
+            blocks = list(iter(lambda: part.read(100), b""))
+            assert max(len(block) for block in blocks) == 100
+            assert b"".join(blocks) == content[PART_SIZE:PART_SIZE * 2]
+
+            part.seek(0)
+            assert part.tell() == 0
+            assert part.read() == content[PART_SIZE:PART_SIZE * 2]
+
+    def test_should_stream_part_from_file_instead_of_reading_it_into_memory(self, big_file):
+        session = mock.Mock()
+
+        def put(url, data, headers, timeout):
+            assert isinstance(data, FileSlice)
+            assert (data.offset, len(data)) == (PART_SIZE * 7, 100)
+            with open(big_file, "rb") as f:
+                content = f.read()[PART_SIZE * 7:]
+            assert data.read() == content
+            return mock.Mock(ok=True, headers={"ETag": '"{}"'.format(hashlib.md5(content).hexdigest())})
+
+        session.put.side_effect = put
+
+        commands.PutDatasetFilesCommand._put_part(session, "some_url", big_file, PART_SIZE * 7, 100, {})
+
+        assert session.put.called
+
+
+class CorruptingSession(object):
+    def __init__(self, session):
+        """Flips a byte of the first body sent, like an error of the network the checksums of TCP miss"""
+        self.session = session
+        self.corrupted = False
+
+    def put(self, url, data, **kwargs):
+        body = data.read()
+        if not self.corrupted:
+            self.corrupted = True
+            body = bytes([body[0] ^ 0xff]) + body[1:]
+        return self.session.put(url, data=body, **kwargs)
+
+
+class TestTransferVerification(object):
+    def test_should_hash_content_in_any_chunks_like_storage_provider(self):
+        content = os.urandom(PART_SIZE * 3 + 10)
+        md5s = [hashlib.md5(content[i:i + PART_SIZE]).hexdigest() for i in range(0, len(content), PART_SIZE)]
+
+        hasher = commands.ETagHasher(PART_SIZE)
+        for i in range(0, len(content), 700):
+            hasher.update(content[i:i + 700])
+
+        assert hasher.hexdigest() == commands.composite_etag(md5s)
+        assert commands.parse_etag('"{}"'.format(hasher.hexdigest())) == (hasher.hexdigest()[:32], 4)
+
+    @mock.patch.object(commands, "MULTIPART_CHUNK_SIZE", PART_SIZE)
+    @mock.patch.object(commands, "DOWNLOAD_RANGE_SIZE", PART_SIZE)
+    def test_should_send_corrupted_part_again_and_verify_ranges_of_download(self, server, big_file, tmpdir):
+        put_part = commands.PutDatasetFilesCommand._put_part
+        sessions = {}
+
+        def corrupting_put_part(session, *args):
+            session = sessions.setdefault("session", CorruptingSession(session))
+            return put_part(session, *args)
+
+        with mock.patch.object(commands.PutDatasetFilesCommand, "_put_part", staticmethod(corrupting_put_part)):
+            command = commands.PutDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, [big_file], "/", part_concurrency=1)
+
+        with open(big_file, "rb") as f:
+            content = f.read()
+        assert read_object(server, "big.bin") == content
+        assert commands.file_matches_etag(
+            big_file, len(content), server.store.etag("{}/{}/big.bin".format(DATASET_ID, DATASET_VERSION)))
+
+        # ranges are the parts of the upload, so their MD5s are checked against its ETag
+        target_path = str(tmpdir.join("target"))
+        spy = RangeGetSpy()
+        with mock.patch.object(commands.GetDatasetFilesCommand, "_download_range", staticmethod(spy)):
+            command = commands.GetDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            command.execute(DATASET_VERSION_ID, ["/"], target_path)
+
+        assert sorted(spy.parts) == list(range(1, 9))
+        with open(os.path.join(target_path, "big.bin"), "rb") as f:
+            assert f.read() == content
+
+    @mock.patch.object(commands, "DOWNLOAD_RANGE_SIZE", PART_SIZE)
+    def test_should_download_again_object_not_matching_its_etag(self, server, tmpdir):
+        server.store.put("{}/{}/big.bin".format(DATASET_ID, DATASET_VERSION), [os.urandom(PART_SIZE * 3)],
+                         etag=hashlib.md5(b"other content").hexdigest())
+        spy = RangeGetSpy()
+
+        with mock.patch.object(commands.GetDatasetFilesCommand, "_download_range", staticmethod(spy)):
+            command = commands.GetDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+            with pytest.raises(ApplicationError):
+                command.execute(DATASET_VERSION_ID, ["/"], str(tmpdir))
+
+            assert len(spy.parts) == 3 * commands.VERIFY_MAX_ATTEMPTS
+            assert not tmpdir.join("big.bin").exists()
+
+            with mock.patch.object(config, "VERIFY_TRANSFERS", False):
+                command.execute(DATASET_VERSION_ID, ["/"], str(tmpdir))
+
+        assert tmpdir.join("big.bin").exists()
+
+
+class TestCopyDatasetFiles(object):
+    SOURCE_VERSION_ID = "{}:bench00".format(DATASET_ID)
+
+    @pytest.mark.parametrize("source_path,target_path,key,expected", [
+        ("/", "/", "dir/a.txt", "/dir/a.txt"),
+        ("/dir", "/copied", "dir/sub/a.txt", "/copied/sub/a.txt"),
+        ("/dir/", "/copied/", "dir/a.txt", "/copied/a.txt"),
+        ("/dir/a.txt", "/copied/", "dir/a.txt", "/copied/a.txt"),
+        ("/dir/a.txt", "/b.txt", "dir/a.txt", "/b.txt"),
+    ])
+    def test_should_map_source_keys_to_target_path(self, source_path, target_path, key, expected):
+        assert s3_copier.S3DatasetVersionCopier.get_target_key(source_path, target_path, key) == expected
+
+    @mock.patch.object(s3_copier, "MAX_COPY_SIZE", PART_SIZE * 2)
+    @mock.patch.object(s3_copier, "COPY_PART_SIZE", PART_SIZE)
+    def test_should_copy_objects_on_storage_provider_without_downloading_them(self, server):
+        files = {
+            "dir/a.txt": b"some content",
+            "dir/sub/b.txt": b"other content",
+            "dir/big.bin": os.urandom(PART_SIZE * 3 + 10),
+            "other.txt": b"not copied",
+        }
+        for name, content in files.items():
+            server.store.put("{}/bench00/{}".format(DATASET_ID, name), [content])
+        server.pop_stats()
+
+        command = commands.CopyDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        command.execute(self.SOURCE_VERSION_ID, DATASET_VERSION_ID, "/dir", "/copied/")
+
+        assert server.object_keys() == ["{}/{}/copied/{}".format(DATASET_ID, DATASET_VERSION, name)
+                                        for name in ("a.txt", "big.bin", "sub/b.txt")]
+        for name in ("a.txt", "big.bin", "sub/b.txt"):
+            assert read_object(server, "copied/" + name) == files["dir/" + name]
+        assert server.store.upload_ids() == []
+
+        s3_stats = [stats for stats in server.pop_stats() if stats.kind == "s3"]
+        # big object is copied in 4 parts
+        assert len([stats for stats in s3_stats if stats.method == "PUT"]) == 6
+        assert sum(stats.bytes_received for stats in s3_stats) == 0
+        # only listings and results of copies are sent
+        assert sum(stats.bytes_sent for stats in s3_stats) < len(files["dir/big.bin"])
+
+    @mock.patch.object(s3_copier, "MAX_COPY_SIZE", PART_SIZE * 2)
+    @mock.patch.object(s3_copier, "COPY_PART_SIZE", PART_SIZE)
+    @mock.patch.object(s3_copier, "PART_PRESIGN_BATCH_SIZE", 1)
+    def test_should_stop_signing_parts_after_a_part_failed(self, server):
+        server.store.put("{}/bench00/big.bin".format(DATASET_ID), [os.urandom(PART_SIZE * 5)])
+        copy_object = s3_copier.S3DatasetVersionCopier.copy_object
+        sign = DatasetVersionsClient.generate_pre_signed_s3_urls
+        signed = []
+
+        def fail_second_part(copier, session, pre_signed, key):
+            if len(signed) > 1:
+                raise s3_copier.sdk_exceptions.S3RequestFailedError("some error")
+            return copy_object(copier, session, pre_signed, key)
+
+        def sign_spy(client, dataset_version_id, calls):
+            signed.extend(call["params"]["PartNumber"] for call in calls if call["method"] == "uploadPartCopy")
+            return sign(client, dataset_version_id, calls)
+
+        command = commands.CopyDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+        with mock.patch.object(s3_copier.S3DatasetVersionCopier, "copy_object", fail_second_part), \
+                mock.patch.object(DatasetVersionsClient, "generate_pre_signed_s3_urls", sign_spy):
+            with pytest.raises(GradientSdkError):
+                command.execute(self.SOURCE_VERSION_ID, DATASET_VERSION_ID, "/", "/copied/", part_concurrency=1)
+
+        # parts are signed a batch ahead of the part that is copied
+        assert signed in ([1, 2], [1, 2, 3])
+        assert server.store.upload_ids() == []
+
+    @mock.patch.object(s3_copier, "MAX_COPY_SIZE", PART_SIZE * 2)
+    @mock.patch.object(s3_copier, "COPY_PART_SIZE", PART_SIZE)
+    def test_should_raise_error_of_copy_if_abort_failed(self, server):
+        server.store.put("{}/bench00/big.bin".format(DATASET_ID), [os.urandom(PART_SIZE * 3)])
+        logger = mock.Mock()
+        client = DatasetVersionsClient(api_key="some_key", logger=logger)
+
+        with mock.patch.object(s3_copier.S3DatasetVersionCopier, "copy_object",
+                               side_effect=s3_copier.sdk_exceptions.S3RequestFailedError("copy error")), \
+                mock.patch("requests.Session.delete", side_effect=RuntimeError("abort error")):
+            with pytest.raises(GradientSdkError, match="copy error"):
+                client.copy_files(self.SOURCE_VERSION_ID, DATASET_VERSION_ID, "/big.bin", "/big.bin")
+
+        logger.warning.assert_called_once_with("Failed to abort copy of /big.bin: abort error")
+
+    def test_should_fail_if_source_has_no_files(self, server):
+        command = commands.CopyDatasetFilesCommand(api_key="some_key", logger=MuteLogger())
+
+        with pytest.raises(ApplicationError, match="No files found at /missing"):
+            command.execute(self.SOURCE_VERSION_ID, DATASET_VERSION_ID, "/missing", "/copied/")
+
+    def test_should_copy_files_with_sdk_client(self, server):
+        server.store.put("{}/bench00/dir/a.txt".format(DATASET_ID), [b"some content"])
+        client = DatasetVersionsClient(api_key="some_key")
+
+        count = client.copy_files(self.SOURCE_VERSION_ID, DATASET_VERSION_ID, "/dir/a.txt", "/b.txt")
+
+        assert count == 1
+        assert read_object(server, "b.txt") == b"some content"
+
+
+class TestBatchDeleteDatasetFiles(object):
+    @mock.patch.object(commands, "DELETE_BATCH_SIZE", 10)
+    def test_should_delete_objects_in_batches_and_report_keys_that_failed(self, server):
+        names = ["dir/{:03}.txt".format(i) for i in range(25)]
+        for name in names:
+            server.store.put("{}/{}/{}".format(DATASET_ID, DATASET_VERSION, name), [name.encode("utf-8")])
+        server.undeletable_keys.add("{}/{}/dir/007.txt".format(DATASET_ID, DATASET_VERSION))
+        server.pop_stats()
+        logger = mock.Mock()
+
+        command = commands.DeleteDatasetFilesCommand(api_key="some_key", logger=logger)
+        summary = command.execute(DATASET_VERSION_ID, ["/dir/"])
+
+        assert summary == dict(deleted=24, failed=1)
+        assert server.object_keys() == ["{}/{}/dir/007.txt".format(DATASET_ID, DATASET_VERSION)]
+        assert [stats.method for stats in server.pop_stats() if stats.kind == "s3"] == ["GET", "POST", "POST", "POST"]
+        logger.error.assert_called_once_with("Failed to delete dir/007.txt: AccessDenied Access Denied")
@@ -0,0 +1,114 @@
+import mock
+
+from gradient.api_sdk.clients import http_client
+from gradient.api_sdk.logger import MuteLogger
+from tests import MockResponse
+
+
+class TestSessionPool(object):
+    def test_should_return_same_session_for_same_host(self):
+        pool = http_client.SessionPool()
+
+        first = pool.get_session("https://api.paperspace.io/projects")
+        second = pool.get_session("https://API.paperspace.io/machines/getMachines")
+
+        assert first is second
+
+    def test_should_return_separate_sessions_for_different_hosts(self):
+        pool = http_client.SessionPool()
+
+        api_session = pool.get_session("https://api.paperspace.io")
+        s3_session = pool.get_session("https://some-bucket.s3.amazonaws.com/key")
+
+        assert api_session is not s3_session
+
+    def test_should_mount_adapter_with_configured_pool_size_and_timeouts(self):
+        pool = http_client.SessionPool(pool_size=4, connect_timeout=3, read_timeout=30)
+
+        session = pool.get_session("https://api.paperspace.io")
+        adapter = session.get_adapter("https://api.paperspace.io")
+
+        assert isinstance(adapter, http_client.TimeoutHTTPAdapter)
+        assert adapter.timeout == (3, 30)
+        assert adapter._pool_maxsize == 4
+
+    def test_should_create_new_sessions_after_pool_was_closed(self):
+        pool = http_client.SessionPool()
+        session = pool.get_session("https://api.paperspace.io")
+
+        pool.close()
+
+        assert pool.get_session("https://api.paperspace.io") is not session
+
+
+class TestAPI(object):
+    def test_should_use_shared_session_pool_by_default(self):
+        api = http_client.API("https://api.paperspace.io")
+
+        assert api.session_pool is http_client.default_session_pool
+        assert api.session is http_client.default_session_pool.get_session("https://api.paperspace.io")
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_send_request_through_pooled_session(self, get_patched):
+        pool = http_client.SessionPool()
+        api = http_client.API("https://api.paperspace.io", api_key="some_key", session_pool=pool)
+
+        api.get("/projects", params={"limit": 1})
+
+        get_patched.assert_called_once_with(
+            "https://api.paperspace.io/projects",
+            params={"limit": 1},
+            headers=api.headers,
+            json=None,
+        )
+
+
+class TestAPILogging(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_not_build_log_messages_when_logger_is_muted(self, get_patched):
+        get_patched.return_value = MockResponse({"ok": True})
+        api = http_client.API("https://api.paperspace.io", logger=MuteLogger())
+
+        with mock.patch.object(api, "_log_request") as log_request_patched, \
+                mock.patch.object(api, "_log_response") as log_response_patched:
+            api.get("/projects")
+
+        log_request_patched.assert_not_called()
+        log_response_patched.assert_not_called()
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    def test_should_log_request_and_response_when_debug_is_enabled(self, post_patched):
+        post_patched.return_value = MockResponse({"ok": True}, content=b"ok")
+        logger = mock.MagicMock()
+        logger.is_debug_enabled.return_value = True
+        api = http_client.API("https://api.paperspace.io", logger=logger)
+
+        api.post("/projects", json={"name": "some_name"})
+
+        messages = [call[0][0] for call in logger.debug.call_args_list]
+        assert messages[0].startswith("POST request sent to: https://api.paperspace.io/projects")
+        assert "json: {'name': 'some_name'}" in messages[0]
+        assert messages[1:] == ["Response status code: 200", "Response content: b'ok'"]
+
+
+class TestRequestRecorder(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_pass_request_record_to_listeners(self, get_patched):
+        get_patched.return_value = MockResponse({"ok": True}, content=b"12345")
+        records = []
+        api = http_client.API("https://api.paperspace.io")
+
+        http_client.request_recorder.add_listener(records.append)
+        try:
+            api.get("/projects")
+        finally:
+            http_client.request_recorder.remove_listener(records.append)
+        api.get("/projects")
+
+        assert len(records) == 1
+        record = records[0]
+        assert record.method == "GET"
+        assert record.url == "https://api.paperspace.io/projects"
+        assert record.status_code == 200
+        assert record.bytes_received == 5
+        assert record.elapsed >= 0
@@ -0,0 +1,52 @@
+import mock
+import pytest
+
+from gradient.api_sdk import json_stream
+from gradient.api_sdk.clients import ModelsClient
+from tests import MockResponse, example_responses
+
+
+def _chunked(text, chunk_size):
+    data = text.encode("utf-8")
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+class TestIterJsonItems(object):
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+    def test_should_yield_items_of_list_in_object_regardless_of_chunk_size(self, chunk_size):
+        text = u'{"total": 12345, "modelList": [{"id": "a", "name": "\\u017c\u00f3\u0142w"}, 123, null, [1, 2]], ' \
+               u'"other": {"modelList": []}}'
+
+        items = list(json_stream.iter_json_items(_chunked(text, chunk_size), "modelList"))
+
+        assert items == [{"id": "a", "name": u"\u017c\u00f3\u0142w"}, 123, None, [1, 2]]
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+    def test_should_yield_items_of_top_level_list(self, chunk_size):
+        items = list(json_stream.iter_json_items(_chunked(' [ 1 , 22.5 , "x" ] ', chunk_size)))
+
+        assert items == [1, 22.5, "x"]
+
+    def test_should_yield_nothing_when_response_is_empty_or_null(self):
+        assert list(json_stream.iter_json_items([])) == []
+        assert list(json_stream.iter_json_items([b"null"])) == []
+        assert list(json_stream.iter_json_items([b"[]"])) == []
+        assert list(json_stream.iter_json_items([b'{"modelList": []}'], "modelList")) == []
+
+    def test_should_raise_value_error_when_stream_is_truncated(self):
+        items = json_stream.iter_json_items(_chunked('{"modelList": [{"id": "a"}, {"id"', 4), "modelList")
+
+        assert next(items) == {"id": "a"}
+        with pytest.raises(ValueError):
+            next(items)
+
+
+class TestModelsClientIter(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_yield_models_from_streamed_response(self, get_patched):
+        get_patched.return_value = MockResponse(example_responses.LIST_MODELS_RESPONSE_JSON)
+
+        models = list(ModelsClient(api_key="some_key").iter())
+
+        assert [model.id for model in models] == ["mosu30xm7q8vb0p"]
+        assert get_patched.call_args[1]["stream"] is True
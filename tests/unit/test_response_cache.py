@@ -0,0 +1,118 @@
+import os
+
+import mock
+import pytest
+
+from gradient.api_sdk.config import config
+from gradient.api_sdk.repositories.clusters import ListClusters
+from gradient.api_sdk.repositories.models import DeleteModel
+from gradient.api_sdk.response_cache import ResponseCache
+from tests import MockResponse
+
+URL = "https://api.paperspace.io/clusters/getClusters"
+CLUSTERS_JSON = [{"id": "cl1", "name": "some_cluster", "type": "Kubernetes Processing Site"}]
+
+
+@pytest.fixture
+def cache_enabled(tmpdir):
+    with mock.patch.object(config, "HTTP_CACHE", True), mock.patch.object(config, "CONFIG_DIR_PATH", str(tmpdir)):
+        yield str(tmpdir)
+
+
+class TestResponseCache(object):
+    def test_should_keep_responses_of_api_keys_separately(self, tmpdir):
+        cache = ResponseCache(str(tmpdir))
+
+        cache.set("some_key", URL, MockResponse(content=b"[1]", headers={"ETag": "abc"}))
+
+        assert cache.get("some_key", URL).response.content == b"[1]"
+        assert cache.get("some_key", URL).etag == "abc"
+        assert cache.get("other_key", URL) is None
+
+    def test_should_evict_least_recently_used_responses(self, tmpdir):
+        cache = ResponseCache(str(tmpdir))
+        for i in range(3):
+            entry_path = cache._get_entry_path("some_key", URL, {"page": i}, None)
+            cache.set("some_key", URL, MockResponse(content=b"x" * 100, headers={}), params={"page": i})
+            os.utime(entry_path, (i, i))
+
+        # room for three responses
+        cache.max_size = 3 * os.path.getsize(entry_path) + 50
+
+        cache.get("some_key", URL, params={"page": 0})
+        cache.set("some_key", URL, MockResponse(content=b"x" * 100, headers={}), params={"page": 3})
+
+        assert cache.get("some_key", URL, params={"page": 0}) is not None
+        assert cache.get("some_key", URL, params={"page": 1}) is None
+        assert cache.get("some_key", URL, params={"page": 3}) is not None
+
+    def test_should_clear_responses_of_api_key(self, tmpdir):
+        cache = ResponseCache(str(tmpdir))
+        cache.set("some_key", URL, MockResponse(content=b"[]", headers={}))
+        cache.set("other_key", URL, MockResponse(content=b"[]", headers={}))
+
+        cache.clear("some_key")
+
+        assert cache.get("some_key", URL) is None
+        assert cache.get("other_key", URL) is not None
+
+    def test_should_clear_responses_of_urls_with_prefix(self, tmpdir):
+        cache = ResponseCache(str(tmpdir))
+        models_url = "https://api.paperspace.io/mlModels/getModelList/"
+        cache.set("some_key", URL, MockResponse(content=b"[]", headers={}))
+        cache.set("some_key", models_url, MockResponse(content=b"[]", headers={}))
+
+        cache.clear("some_key", prefix="https://api.paperspace.io/mlModels")
+
+        assert cache.get("some_key", models_url) is None
+        assert cache.get("some_key", URL) is not None
+
+
+class TestCachedRepository(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_not_send_request_when_cached_response_is_fresh(self, get_patched, cache_enabled):
+        get_patched.return_value = MockResponse(CLUSTERS_JSON, content=b"[]", headers={"ETag": "abc"})
+        repository = ListClusters(api_key="some_key", logger=mock.MagicMock())
+
+        repository.list()
+        repository.list()
+
+        get_patched.assert_called_once()
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_revalidate_stale_response_with_etag(self, get_patched, cache_enabled):
+        get_patched.return_value = MockResponse(content=b'[{"id": "cl1", "name": "some_cluster"}]',
+                                                headers={"ETag": "abc"})
+        repository = ListClusters(api_key="some_key", logger=mock.MagicMock())
+        repository.list()
+
+        get_patched.return_value = MockResponse(status_code=304, headers={})
+        with mock.patch.object(ListClusters, "CACHE_TTL", 1e-9):
+            clusters = repository.list()
+
+        assert clusters[0].id == "cl1"
+        assert get_patched.call_args[1]["headers"]["If-None-Match"] == "abc"
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_send_request_every_time_when_cache_is_disabled(self, get_patched):
+        get_patched.return_value = MockResponse(CLUSTERS_JSON)
+        repository = ListClusters(api_key="some_key", logger=mock.MagicMock())
+
+        repository.list()
+        repository.list()
+
+        assert get_patched.call_count == 2
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    def test_should_drop_cached_responses_of_changed_resource_only(self, post_patched, cache_enabled):
+        post_patched.return_value = MockResponse({})
+        repository = DeleteModel(api_key="some_key", logger=mock.MagicMock())
+        models_url = repository._get_api_url() + "/mlModels/getModelList/"
+        cache = ResponseCache(os.path.join(cache_enabled, "cache"))
+        cache.set("some_key", URL, MockResponse(content=b"[]", headers={}))
+        cache.set("some_key", models_url, MockResponse(content=b"[]", headers={}))
+
+        repository.delete("some_model_id")
+
+        assert cache.get("some_key", models_url) is None
+        assert cache.get("some_key", URL) is not None
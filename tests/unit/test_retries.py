@@ -0,0 +1,182 @@
+import mock
+import pytest
+import requests
+
+from gradient.api_sdk.clients import http_client
+from gradient.api_sdk.clients.dataset_version_client import DatasetVersionsClient
+from gradient.api_sdk.retries import RetryBudget, RetryPolicy
+from gradient.api_sdk.sdk_exceptions import ResourceFetchingError
+from tests import MockResponse
+
+
+def get_policy(**kwargs):
+    kwargs.setdefault("max_retries", 3)
+    return RetryPolicy(sleep=mock.MagicMock(), **kwargs)
+
+
+class TestRetryPolicy(object):
+    def test_should_retry_idempotent_request_until_it_succeeds(self):
+        policy = get_policy()
+        send = mock.MagicMock(side_effect=[MockResponse(status_code=502), MockResponse(status_code=503),
+                                           MockResponse(status_code=200)])
+
+        response = policy.call("GET", send, "https://api.paperspace.io", params={"a": 1})
+
+        assert response.status_code == 200
+        assert send.call_count == 3
+        send.assert_called_with("https://api.paperspace.io", params={"a": 1})
+        assert policy.sleep.call_count == 2
+
+    def test_should_not_retry_post_requests_by_default(self):
+        policy = get_policy()
+        send = mock.MagicMock(return_value=MockResponse(status_code=502))
+
+        response = policy.call("POST", send)
+
+        assert response.status_code == 502
+        send.assert_called_once_with()
+
+    def test_should_retry_post_request_marked_as_idempotent(self):
+        policy = get_policy()
+        send = mock.MagicMock(side_effect=[MockResponse(status_code=504), MockResponse(status_code=200)])
+
+        response = policy.call("POST", send, idempotent=True)
+
+        assert response.status_code == 200
+        assert send.call_count == 2
+
+    def test_should_not_retry_client_errors(self):
+        policy = get_policy()
+        send = mock.MagicMock(return_value=MockResponse(status_code=400))
+
+        policy.call("GET", send)
+
+        send.assert_called_once_with()
+
+    def test_should_return_last_response_when_retries_were_exhausted(self):
+        policy = get_policy(max_retries=2)
+        send = mock.MagicMock(return_value=MockResponse(status_code=503))
+
+        response = policy.call("GET", send)
+
+        assert response.status_code == 503
+        assert send.call_count == 3
+
+    def test_should_close_responses_of_retried_requests(self):
+        policy = get_policy()
+        responses = [MockResponse(status_code=503), MockResponse(status_code=200)]
+        send = mock.MagicMock(side_effect=responses)
+
+        response = policy.call("GET", send)
+
+        assert responses[0].closed
+        assert not response.closed
+
+    def test_should_retry_connection_errors_and_raise_the_last_one(self):
+        policy = get_policy(max_retries=1)
+        send = mock.MagicMock(side_effect=requests.exceptions.ConnectionError("refused"))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            policy.call("GET", send)
+
+        assert send.call_count == 2
+
+    def test_should_wait_as_long_as_retry_after_header_says(self):
+        policy = get_policy()
+        send = mock.MagicMock(side_effect=[MockResponse(status_code=429, headers={"Retry-After": "7"}),
+                                           MockResponse(status_code=200)])
+
+        policy.call("GET", send)
+
+        policy.sleep.assert_called_once_with(7.0)
+
+    def test_should_give_up_when_retry_after_is_longer_than_allowed(self):
+        policy = get_policy(max_retry_after=60)
+        send = mock.MagicMock(return_value=MockResponse(status_code=503, headers={"Retry-After": "3600"}))
+
+        response = policy.call("GET", send)
+
+        assert response.status_code == 503
+        send.assert_called_once_with()
+
+    def test_should_keep_backoff_with_jitter_under_exponential_limit(self):
+        policy = get_policy(backoff_factor=0.5, max_backoff=3)
+
+        for attempt, limit in ((0, 0.5), (1, 1), (2, 2), (3, 3), (10, 3)):
+            for _ in range(20):
+                assert 0 <= policy.get_backoff(attempt) <= limit
+
+    def test_should_stop_retrying_when_budget_is_spent(self):
+        policy = get_policy(budget=RetryBudget(ratio=0, min_retries=1))
+        send = mock.MagicMock(return_value=MockResponse(status_code=503))
+
+        policy.call("GET", send)
+        policy.call("GET", send)
+
+        assert send.call_count == 3
+
+    def test_copy_should_share_retry_budget(self):
+        policy = get_policy()
+
+        copy = policy.copy(max_retries=8)
+
+        assert copy.max_retries == 8
+        assert copy.budget is policy.budget
+
+
+class TestRetryBudget(object):
+    def test_should_refill_with_every_request_up_to_the_limit(self):
+        budget = RetryBudget(ratio=0.5, min_retries=0, max_tokens=1)
+
+        assert not budget.withdraw()
+        budget.deposit()
+        budget.deposit()
+        budget.deposit()
+
+        assert budget.tokens == 1
+        assert budget.withdraw()
+        assert not budget.withdraw()
+
+
+class TestAPIRetries(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    def test_should_not_retry_post_with_streamed_body_even_if_marked_as_idempotent(self, post_patched):
+        post_patched.return_value = MockResponse(status_code=503)
+        data = mock.MagicMock(content_type="multipart/form-data")
+        api = http_client.API("https://api.paperspace.io", retry_policy=get_policy())
+
+        api.post("/upload", data=data, idempotent=True)
+
+        assert post_patched.call_count == 1
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_retry_get_requests(self, get_patched):
+        get_patched.side_effect = [MockResponse(status_code=502), MockResponse({"ok": True})]
+        api = http_client.API("https://api.paperspace.io", retry_policy=get_policy())
+
+        response = api.get("/projects")
+
+        assert response.json() == {"ok": True}
+        assert get_patched.call_count == 2
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    def test_should_retry_generating_pre_signed_urls(self, post_patched):
+        post_patched.side_effect = [MockResponse(status_code=502),
+                                    MockResponse([{"url": "https://s3/key", "method": "GET"}])]
+        client = DatasetVersionsClient(api_key="some_key", retry_policy=get_policy())
+
+        result = client.generate_pre_signed_s3_url("dsttn2y7j1ux882:abc123", "getObject", {"Key": "key"})
+
+        assert result.url == "https://s3/key"
+        assert post_patched.call_count == 2
+
+    @pytest.mark.parametrize("method", ["createMultipartUpload", "completeMultipartUpload"])
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.post")
+    def test_should_not_retry_calls_the_api_runs_itself(self, post_patched, method):
+        post_patched.return_value = MockResponse(status_code=502)
+        client = DatasetVersionsClient(api_key="some_key", retry_policy=get_policy())
+
+        with pytest.raises(ResourceFetchingError):
+            client.generate_pre_signed_s3_url("dsttn2y7j1ux882:abc123", method, {"Key": "key"})
+
+        assert post_patched.call_count == 1
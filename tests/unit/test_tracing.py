@@ -0,0 +1,115 @@
+import json
+import threading
+
+import mock
+import pytest
+from click.testing import CliRunner
+
+from gradient.api_sdk import tracing
+from gradient.api_sdk.clients import ModelsClient
+from gradient.api_sdk.config import config
+from gradient.cli import cli
+from gradient.commands.common import BaseCommand
+from tests import MockResponse, example_responses
+
+
+@pytest.fixture
+def trace_file(tmpdir):
+    path = str(tmpdir.join("trace.jsonl"))
+    with mock.patch.object(config, "TRACE_FILE", path):
+        yield path
+    tracing.tracer.close()
+
+
+def read_spans(path):
+    tracing.tracer.close()
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTracer(object):
+    def test_should_not_record_anything_when_trace_file_is_not_set(self):
+        with mock.patch.object(config, "TRACE_FILE", None):
+            span = tracing.tracer.span("some.span")
+
+        assert span is tracing.NOOP_SPAN
+
+    def test_should_write_nested_spans_as_json_lines(self, trace_file):
+        with tracing.tracer.span("parent", some_attribute="some_value") as parent:
+            with tracing.tracer.span("child") as child:
+                child.add_bytes(sent=10, received=20)
+
+        spans = read_spans(trace_file)
+
+        assert [span["name"] for span in spans] == ["child", "parent"]
+        assert spans[0]["parent_id"] == parent.span_id
+        assert spans[0]["trace_id"] == spans[1]["trace_id"]
+        assert spans[0]["bytes_sent"] == 10
+        assert spans[0]["bytes_received"] == 20
+        assert spans[1]["parent_id"] is None
+        assert spans[1]["attributes"] == {"some_attribute": "some_value"}
+        assert spans[1]["duration"] >= spans[0]["duration"]
+
+    def test_should_record_error_and_link_spans_of_other_threads_to_given_parent(self, trace_file):
+        with tracing.tracer.span("parent") as parent:
+            def work():
+                with pytest.raises(ValueError):
+                    with tracing.tracer.span("task", parent=parent):
+                        raise ValueError("some error")
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        task = read_spans(trace_file)[0]
+
+        assert task["parent_id"] == parent.span_id
+        assert task["error"] == "ValueError: some error"
+
+
+class TestTracedCode(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_trace_request_and_parsing_in_repository(self, get_patched, trace_file):
+        get_patched.return_value = MockResponse(
+            example_responses.LIST_MODELS_RESPONSE_JSON, headers={"Content-Length": "123"})
+
+        ModelsClient(api_key="some_key").list()
+
+        spans = {span["name"]: span for span in read_spans(trace_file)}
+        assert spans["http.request"]["attributes"]["status_code"] == 200
+        assert spans["http.request"]["bytes_received"] == 123
+        assert spans["http.request"]["parent_id"] == spans["repository.get"]["span_id"]
+        assert spans["serializer.get_instance"]["attributes"]["schema"] == "Model"
+
+    def test_should_trace_execute_of_commands_including_generators(self, trace_file):
+        class SomeCommand(BaseCommand):
+            def _get_client(self, api_key, logger):
+                return None
+
+            def execute(self):
+                yield 1
+                yield 2
+
+        class OtherCommand(SomeCommand):
+            pass
+
+        assert list(OtherCommand(api_key="some_key").execute()) == [1, 2]
+
+        spans = read_spans(trace_file)
+        assert [(span["name"], span["attributes"]) for span in spans] == \
+            [("command.execute", {"command": "OtherCommand"})]
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.Session.get")
+    def test_should_enable_tracing_with_global_option(self, get_patched, tmpdir):
+        path = str(tmpdir.join("trace.jsonl"))
+        get_patched.return_value = MockResponse(example_responses.LIST_MODELS_RESPONSE_JSON)
+
+        with mock.patch.object(config, "TRACE_FILE", None):
+            result = CliRunner().invoke(cli.cli, ["--trace", path, "models", "list", "--apiKey", "some_key"])
+            spans = read_spans(path)
+
+        assert result.exit_code == 0, result.exc_info
+        root = spans[-1]
+        assert root["name"] == "cli.invoke"
+        assert root["attributes"] == {"command": "models list"}
+        assert {"command.execute", "repository.get", "http.request", "table.render"} <= {s["name"] for s in spans}